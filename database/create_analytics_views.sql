@@ -17,6 +17,9 @@ DROP VIEW IF EXISTS vw_enrollment_trends;
 -- ============================================================================
 -- Student Summary View
 -- Complete student profile with current academic status
+-- Enrolments and attendance are aggregated per (student_id, academic_year)
+-- before the join, so each student-year joins to one row of each instead of
+-- the enrolment x attendance cross product
 -- ============================================================================
 
 CREATE VIEW vw_student_summary AS
@@ -31,53 +34,74 @@ SELECT
     cs.prog_yr AS current_level,
     cs.stud_yr AS years_enrolled,
     cs.aims_start AS start_date,
-    COUNT(DISTINCT ce.course_code) AS courses_enrolled,
-    AVG(a.attendance_percentage) AS avg_attendance,
+    COALESCE(ce.courses_enrolled, 0) AS courses_enrolled,
+    a.attendance_total * 1.0 / a.attendance_records AS avg_attendance,
     dc.final_gpa,
     dc.degree_classification,
     dc.graduation_status
 FROM current_students cs
-LEFT JOIN course_enrolments ce 
+LEFT JOIN (
+    -- Covered by unique_enrolment (student_id, course_code, academic_year, semester)
+    SELECT student_id, academic_year, COUNT(DISTINCT course_code) AS courses_enrolled
+    FROM course_enrolments
+    GROUP BY student_id, academic_year
+) ce 
     ON cs.student_id = ce.student_id 
     AND cs.academic_year = ce.academic_year
-LEFT JOIN attendance a 
+LEFT JOIN (
+    -- Covered by idx_student_year (student_id, academic_year, attendance_percentage)
+    SELECT student_id, academic_year,
+           SUM(attendance_percentage) AS attendance_total,
+           COUNT(*) AS attendance_records
+    FROM attendance
+    GROUP BY student_id, academic_year
+) a 
     ON cs.student_id = a.student_id 
     AND cs.academic_year = a.academic_year
 LEFT JOIN degree_classifications dc 
     ON cs.student_id = dc.student_id
-GROUP BY cs.student_id, cs.academic_year
 ORDER BY cs.student_id, cs.academic_year DESC;
 
 -- ============================================================================
 -- Programme Performance View
 -- Programme-level analytics and key metrics
+-- Attendance is aggregated per (student_id, academic_year) before the join,
+-- so every student-year is one row: counts need no DISTINCT
+-- (unique_student_year) and avg_final_gpa weights each student once
 -- ============================================================================
 
 CREATE VIEW vw_programme_performance AS
 SELECT 
     cs.programme_name,
     cs.academic_year,
-    COUNT(DISTINCT cs.student_id) AS total_students,
-    AVG(a.attendance_percentage) AS avg_attendance,
-    COUNT(DISTINCT CASE 
+    COUNT(*) AS total_students,
+    SUM(a.attendance_total) * 1.0 / NULLIF(SUM(a.attendance_records), 0) AS avg_attendance,
+    COUNT(CASE 
         WHEN dc.graduation_status = 'Graduated' 
-        THEN dc.student_id 
+        THEN 1 
     END) AS graduates,
     AVG(dc.final_gpa) AS avg_final_gpa,
-    COUNT(DISTINCT CASE 
+    COUNT(CASE 
         WHEN dc.degree_classification LIKE '%First%' 
-        THEN dc.student_id 
+        THEN 1 
     END) AS first_class_count,
-    COUNT(DISTINCT CASE 
+    COUNT(CASE 
         WHEN dc.degree_classification LIKE '%Upper Second%' 
-        THEN dc.student_id 
+        THEN 1 
     END) AS upper_second_count,
-    ROUND(COUNT(DISTINCT CASE 
+    ROUND(COUNT(CASE 
         WHEN dc.graduation_status = 'Graduated' 
-        THEN dc.student_id 
-    END) * 100.0 / NULLIF(COUNT(DISTINCT cs.student_id), 0), 2) AS graduation_rate
+        THEN 1 
+    END) * 100.0 / NULLIF(COUNT(*), 0), 2) AS graduation_rate
 FROM current_students cs
-LEFT JOIN attendance a 
+LEFT JOIN (
+    -- Covered by idx_student_year (student_id, academic_year, attendance_percentage)
+    SELECT student_id, academic_year,
+           SUM(attendance_percentage) AS attendance_total,
+           COUNT(*) AS attendance_records
+    FROM attendance
+    GROUP BY student_id, academic_year
+) a 
     ON cs.student_id = a.student_id 
     AND cs.academic_year = a.academic_year
 LEFT JOIN degree_classifications dc 
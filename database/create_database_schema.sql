@@ -139,6 +139,8 @@ CREATE TABLE attendance (
     INDEX idx_student_id (student_id),
     INDEX idx_course_code (course_code),
     INDEX idx_academic_year (academic_year),
+    -- Covering index for the per-student-year attendance aggregates in the views
+    INDEX idx_student_year (student_id, academic_year, attendance_percentage),
     UNIQUE KEY unique_attendance (student_id, course_code, academic_year, semester)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
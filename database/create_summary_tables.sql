@@ -0,0 +1,198 @@
+-- ============================================================================
+-- Student Performance Analytics Database - Summary Tables
+-- ============================================================================
+-- Purpose: Materialized copies of vw_student_summary and
+--          vw_programme_performance, refreshed one academic year at a time
+-- Database: MySQL 8.0+
+-- Note: Run after create_analytics_views.sql. After importing rows for an
+--       academic year, CALL refresh_summary_tables('2024/25'); to rebuild
+--       that year's summary rows. A new degree classification changes every
+--       year its student was enrolled, so refresh each of those years.
+-- ============================================================================
+
+USE student_performance_db;
+
+DROP PROCEDURE IF EXISTS refresh_summary_tables;
+DROP TABLE IF EXISTS mv_student_summary;
+DROP TABLE IF EXISTS mv_programme_performance;
+
+-- ============================================================================
+-- Student Summary (one row per student per academic year)
+-- ============================================================================
+
+CREATE TABLE mv_student_summary (
+    student_id VARCHAR(8) NOT NULL,
+    forename VARCHAR(100),
+    surname VARCHAR(100),
+    gender CHAR(1),
+    nationality VARCHAR(100),
+    programme_name VARCHAR(100),
+    current_year VARCHAR(7) NOT NULL,
+    current_level INT,
+    years_enrolled INT,
+    start_date DATE,
+    courses_enrolled INT NOT NULL,
+    avg_attendance DECIMAL(9,4),
+    final_gpa DECIMAL(5,2),
+    degree_classification VARCHAR(50),
+    graduation_status VARCHAR(20),
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (student_id, current_year),
+    INDEX idx_current_year (current_year)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- ============================================================================
+-- Programme Performance (one row per programme per academic year)
+-- ============================================================================
+
+CREATE TABLE mv_programme_performance (
+    programme_name VARCHAR(100) NOT NULL,
+    academic_year VARCHAR(7) NOT NULL,
+    total_students INT NOT NULL,
+    avg_attendance DECIMAL(9,4),
+    graduates INT NOT NULL,
+    avg_final_gpa DECIMAL(9,4),
+    first_class_count INT NOT NULL,
+    upper_second_count INT NOT NULL,
+    graduation_rate DECIMAL(5,2),
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (programme_name, academic_year),
+    INDEX idx_academic_year (academic_year)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- ============================================================================
+-- Incremental refresh: replace one academic year's rows
+-- The SELECTs repeat the view bodies with the year filter applied inside the
+-- per-student-year aggregates, so only that year's students, enrolments and
+-- attendance are read
+-- ============================================================================
+
+DELIMITER //
+
+CREATE PROCEDURE refresh_summary_tables(IN p_academic_year VARCHAR(7))
+BEGIN
+    START TRANSACTION;
+
+    DELETE FROM mv_student_summary WHERE current_year = p_academic_year;
+    INSERT INTO mv_student_summary (
+        student_id, forename, surname, gender, nationality, programme_name,
+        current_year, current_level, years_enrolled, start_date,
+        courses_enrolled, avg_attendance, final_gpa, degree_classification,
+        graduation_status)
+    SELECT
+        cs.student_id,
+        cs.forename,
+        cs.surname,
+        cs.gender,
+        cs.nationality,
+        cs.programme_name,
+        cs.academic_year,
+        cs.prog_yr,
+        cs.stud_yr,
+        cs.aims_start,
+        COALESCE(ce.courses_enrolled, 0),
+        a.attendance_total * 1.0 / a.attendance_records,
+        dc.final_gpa,
+        dc.degree_classification,
+        dc.graduation_status
+    FROM current_students cs
+    LEFT JOIN (
+        SELECT student_id, academic_year, COUNT(DISTINCT course_code) AS courses_enrolled
+        FROM course_enrolments
+        WHERE academic_year = p_academic_year
+        GROUP BY student_id, academic_year
+    ) ce
+        ON cs.student_id = ce.student_id
+        AND cs.academic_year = ce.academic_year
+    LEFT JOIN (
+        SELECT student_id, academic_year,
+               SUM(attendance_percentage) AS attendance_total,
+               COUNT(*) AS attendance_records
+        FROM attendance
+        WHERE academic_year = p_academic_year
+        GROUP BY student_id, academic_year
+    ) a
+        ON cs.student_id = a.student_id
+        AND cs.academic_year = a.academic_year
+    LEFT JOIN degree_classifications dc
+        ON cs.student_id = dc.student_id
+    WHERE cs.academic_year = p_academic_year;
+
+    DELETE FROM mv_programme_performance WHERE academic_year = p_academic_year;
+    INSERT INTO mv_programme_performance (
+        programme_name, academic_year, total_students, avg_attendance,
+        graduates, avg_final_gpa, first_class_count, upper_second_count,
+        graduation_rate)
+    SELECT
+        cs.programme_name,
+        cs.academic_year,
+        COUNT(*),
+        SUM(a.attendance_total) * 1.0 / NULLIF(SUM(a.attendance_records), 0),
+        COUNT(CASE
+            WHEN dc.graduation_status = 'Graduated'
+            THEN 1
+        END),
+        AVG(dc.final_gpa),
+        COUNT(CASE
+            WHEN dc.degree_classification LIKE '%First%'
+            THEN 1
+        END),
+        COUNT(CASE
+            WHEN dc.degree_classification LIKE '%Upper Second%'
+            THEN 1
+        END),
+        ROUND(COUNT(CASE
+            WHEN dc.graduation_status = 'Graduated'
+            THEN 1
+        END) * 100.0 / NULLIF(COUNT(*), 0), 2)
+    FROM current_students cs
+    LEFT JOIN (
+        SELECT student_id, academic_year,
+               SUM(attendance_percentage) AS attendance_total,
+               COUNT(*) AS attendance_records
+        FROM attendance
+        WHERE academic_year = p_academic_year
+        GROUP BY student_id, academic_year
+    ) a
+        ON cs.student_id = a.student_id
+        AND cs.academic_year = a.academic_year
+    LEFT JOIN degree_classifications dc
+        ON cs.student_id = dc.student_id
+    WHERE cs.academic_year = p_academic_year
+    GROUP BY cs.programme_name, cs.academic_year;
+
+    COMMIT;
+END //
+
+DELIMITER ;
+
+-- ============================================================================
+-- Initial population: every academic year present in current_students
+-- ============================================================================
+
+INSERT INTO mv_student_summary (
+    student_id, forename, surname, gender, nationality, programme_name,
+    current_year, current_level, years_enrolled, start_date,
+    courses_enrolled, avg_attendance, final_gpa, degree_classification,
+    graduation_status)
+SELECT
+    student_id, forename, surname, gender, nationality, programme_name,
+    current_year, current_level, years_enrolled, start_date,
+    courses_enrolled, avg_attendance, final_gpa, degree_classification,
+    graduation_status
+FROM vw_student_summary;
+
+INSERT INTO mv_programme_performance (
+    programme_name, academic_year, total_students, avg_attendance,
+    graduates, avg_final_gpa, first_class_count, upper_second_count,
+    graduation_rate)
+SELECT
+    programme_name, academic_year, total_students, avg_attendance,
+    graduates, avg_final_gpa, first_class_count, upper_second_count,
+    graduation_rate
+FROM vw_programme_performance;
+
+-- Verify summary row counts
+SELECT 'mv_student_summary' AS Table_Name, COUNT(*) AS Records FROM mv_student_summary
+UNION ALL
+SELECT 'mv_programme_performance', COUNT(*) FROM mv_programme_performance;
@@ -3,7 +3,9 @@
 -- ============================================================================
 -- Purpose: Load CSV data into database tables
 -- Database: MySQL 8.0+
--- Note: Update file paths to match your local directory structure
+-- Note: Update file paths to match your local directory structure.
+--       Superseded by scripts/import_data.py, which loads per academic year in
+--       parallel, upserts on the unique keys and resumes from a checkpoint
 -- ============================================================================
 
 USE student_performance_db;
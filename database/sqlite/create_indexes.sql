@@ -0,0 +1,51 @@
+-- ============================================================================
+-- Student Performance Analytics Database - Indexes (SQLite)
+-- ============================================================================
+-- Purpose: The indexes and unique keys declared inline in
+--          ../create_database_schema.sql
+-- Database: SQLite 3.35+
+-- Note: SQLite index names are database-wide, so the per-table MySQL names
+--       (idx_student_id, ...) are prefixed with the table name. The unique
+--       keys keep their MySQL names.
+-- ============================================================================
+
+-- Programmes
+CREATE INDEX programmes_idx_programme_code ON programmes (programme_code);
+CREATE INDEX programmes_idx_programme_name ON programmes (programme_name);
+
+-- Courses
+CREATE INDEX courses_idx_course_code ON courses (course_code);
+CREATE INDEX courses_idx_prog_year ON courses (prog_year);
+
+-- Current Students
+CREATE INDEX current_students_idx_student_id ON current_students (student_id);
+CREATE INDEX current_students_idx_academic_year ON current_students (academic_year);
+CREATE INDEX current_students_idx_programme_name ON current_students (programme_name);
+CREATE UNIQUE INDEX unique_student_year ON current_students (student_id, academic_year);
+
+-- Course Enrolments
+CREATE INDEX course_enrolments_idx_student_id ON course_enrolments (student_id);
+CREATE INDEX course_enrolments_idx_course_code ON course_enrolments (course_code);
+CREATE INDEX course_enrolments_idx_academic_year ON course_enrolments (academic_year);
+CREATE UNIQUE INDEX unique_enrolment ON course_enrolments (student_id, course_code, academic_year, semester);
+
+-- Course Results
+CREATE INDEX course_results_idx_student_id ON course_results (student_id);
+CREATE INDEX course_results_idx_course_code ON course_results (course_code);
+CREATE INDEX course_results_idx_academic_year ON course_results (academic_year);
+CREATE UNIQUE INDEX unique_result ON course_results (student_id, course_code, academic_year, semester);
+
+-- Attendance
+CREATE INDEX attendance_idx_student_id ON attendance (student_id);
+CREATE INDEX attendance_idx_course_code ON attendance (course_code);
+CREATE INDEX attendance_idx_academic_year ON attendance (academic_year);
+CREATE INDEX attendance_idx_student_year ON attendance (student_id, academic_year, attendance_percentage);
+CREATE UNIQUE INDEX unique_attendance ON attendance (student_id, course_code, academic_year, semester);
+
+-- Degree Classifications
+CREATE INDEX degree_classifications_idx_student_id ON degree_classifications (student_id);
+CREATE INDEX degree_classifications_idx_programme ON degree_classifications (programme);
+CREATE INDEX degree_classifications_idx_final_gpa ON degree_classifications (final_gpa);
+
+-- Refresh planner statistics after the bulk load
+ANALYZE;
@@ -0,0 +1,60 @@
+-- ============================================================================
+-- Student Performance Analytics Database - Summary Tables (SQLite)
+-- ============================================================================
+-- Purpose: SQLite mirror of ../create_summary_tables.sql
+-- Database: SQLite 3.35+
+-- Note: SQLite has no stored procedures; refresh_summary_tables.sql holds the
+--       per-year refresh and scripts/sqlite_backend.py runs it
+--       (`python scripts/sqlite_backend.py refresh [YEAR ...]`). Averages
+--       are REAL so integral values are not stored as INTEGER by DECIMAL's
+--       NUMERIC affinity and read back exactly as the views return them
+-- ============================================================================
+
+DROP TABLE IF EXISTS mv_student_summary;
+DROP TABLE IF EXISTS mv_programme_performance;
+
+-- ============================================================================
+-- Student Summary (one row per student per academic year)
+-- ============================================================================
+
+CREATE TABLE mv_student_summary (
+    student_id VARCHAR(8) NOT NULL,
+    forename VARCHAR(100),
+    surname VARCHAR(100),
+    gender CHAR(1),
+    nationality VARCHAR(100),
+    programme_name VARCHAR(100),
+    current_year VARCHAR(7) NOT NULL,
+    current_level INT,
+    years_enrolled INT,
+    start_date DATE,
+    courses_enrolled INT NOT NULL,
+    avg_attendance REAL,
+    final_gpa DECIMAL(5,2),
+    degree_classification VARCHAR(50),
+    graduation_status VARCHAR(20),
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (student_id, current_year)
+);
+
+CREATE INDEX mv_student_summary_idx_current_year ON mv_student_summary (current_year);
+
+-- ============================================================================
+-- Programme Performance (one row per programme per academic year)
+-- ============================================================================
+
+CREATE TABLE mv_programme_performance (
+    programme_name VARCHAR(100) NOT NULL,
+    academic_year VARCHAR(7) NOT NULL,
+    total_students INT NOT NULL,
+    avg_attendance REAL,
+    graduates INT NOT NULL,
+    avg_final_gpa REAL,
+    first_class_count INT NOT NULL,
+    upper_second_count INT NOT NULL,
+    graduation_rate REAL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (programme_name, academic_year)
+);
+
+CREATE INDEX mv_programme_performance_idx_academic_year ON mv_programme_performance (academic_year);
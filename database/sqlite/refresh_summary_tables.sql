@@ -0,0 +1,97 @@
+-- ============================================================================
+-- Student Performance Analytics Database - Summary Refresh (SQLite)
+-- ============================================================================
+-- Purpose: Replace one academic year's rows in the summary tables; the body
+--          of refresh_summary_tables() in ../create_summary_tables.sql
+-- Database: SQLite 3.35+
+-- Note: Bound with :academic_year by scripts/sqlite_backend.py, inside the
+--       caller's transaction
+-- ============================================================================
+
+DELETE FROM mv_student_summary WHERE current_year = :academic_year;
+INSERT INTO mv_student_summary (
+    student_id, forename, surname, gender, nationality, programme_name,
+    current_year, current_level, years_enrolled, start_date,
+    courses_enrolled, avg_attendance, final_gpa, degree_classification,
+    graduation_status)
+SELECT
+    cs.student_id,
+    cs.forename,
+    cs.surname,
+    cs.gender,
+    cs.nationality,
+    cs.programme_name,
+    cs.academic_year,
+    cs.prog_yr,
+    cs.stud_yr,
+    cs.aims_start,
+    COALESCE(ce.courses_enrolled, 0),
+    a.attendance_total * 1.0 / a.attendance_records,
+    dc.final_gpa,
+    dc.degree_classification,
+    dc.graduation_status
+FROM current_students cs
+LEFT JOIN (
+    SELECT student_id, academic_year, COUNT(DISTINCT course_code) AS courses_enrolled
+    FROM course_enrolments
+    WHERE academic_year = :academic_year
+    GROUP BY student_id, academic_year
+) ce
+    ON cs.student_id = ce.student_id
+    AND cs.academic_year = ce.academic_year
+LEFT JOIN (
+    SELECT student_id, academic_year,
+           SUM(attendance_percentage) AS attendance_total,
+           COUNT(*) AS attendance_records
+    FROM attendance
+    WHERE academic_year = :academic_year
+    GROUP BY student_id, academic_year
+) a
+    ON cs.student_id = a.student_id
+    AND cs.academic_year = a.academic_year
+LEFT JOIN degree_classifications dc
+    ON cs.student_id = dc.student_id
+WHERE cs.academic_year = :academic_year;
+
+DELETE FROM mv_programme_performance WHERE academic_year = :academic_year;
+INSERT INTO mv_programme_performance (
+    programme_name, academic_year, total_students, avg_attendance,
+    graduates, avg_final_gpa, first_class_count, upper_second_count,
+    graduation_rate)
+SELECT
+    cs.programme_name,
+    cs.academic_year,
+    COUNT(*),
+    SUM(a.attendance_total) * 1.0 / NULLIF(SUM(a.attendance_records), 0),
+    COUNT(CASE
+        WHEN dc.graduation_status = 'Graduated'
+        THEN 1
+    END),
+    AVG(dc.final_gpa),
+    COUNT(CASE
+        WHEN dc.degree_classification LIKE '%First%'
+        THEN 1
+    END),
+    COUNT(CASE
+        WHEN dc.degree_classification LIKE '%Upper Second%'
+        THEN 1
+    END),
+    ROUND(COUNT(CASE
+        WHEN dc.graduation_status = 'Graduated'
+        THEN 1
+    END) * 100.0 / NULLIF(COUNT(*), 0), 2)
+FROM current_students cs
+LEFT JOIN (
+    SELECT student_id, academic_year,
+           SUM(attendance_percentage) AS attendance_total,
+           COUNT(*) AS attendance_records
+    FROM attendance
+    WHERE academic_year = :academic_year
+    GROUP BY student_id, academic_year
+) a
+    ON cs.student_id = a.student_id
+    AND cs.academic_year = a.academic_year
+LEFT JOIN degree_classifications dc
+    ON cs.student_id = dc.student_id
+WHERE cs.academic_year = :academic_year
+GROUP BY cs.programme_name, cs.academic_year;
@@ -11,72 +11,35 @@ Chart.defaults.plugins.legend.labels.font = { size: 10 };
 const ChartsManager = {
     charts: {},
 
+    // Charts per dashboard view: the Management Overview panel and each tab
+    sections: {
+        overview: ['RecruitmentSource', 'RecruitmentEffectiveness', 'OfferFunnel', 'ClassificationByProg',
+                   'AttendanceRisk', 'EducationPerformance', 'NewReturning', 'Sankey'],
+        enrollment: ['EnrollmentTrend', 'EnrollmentBySchool', 'EnrollmentByProgramme'],
+        performance: ['GPADistribution', 'PassFailSchool', 'AvgGPAByProgramme', 'GradeDistribution',
+                      'CoursePassRate', 'Sunburst'],
+        comparison: ['CompletionRates', 'PerformanceMatrix', 'ProgrammeComparison'],
+        retention: ['RetentionRate', 'CohortCompletion'],
+        demographics: ['GenderDist', 'Nationality', 'AgeDist', 'Proficiency']
+    },
+
     // Create all charts (called once)
     initializeCharts() {
-        // Management Overview
-        this.createRecruitmentSourceChart();
-        this.createRecruitmentEffectivenessChart();
-        this.createOfferFunnelChart();
-        this.createClassificationByProgChart();
-        this.createAttendanceRiskChart();
-        this.createEducationPerformanceChart();
-        this.createNewReturningChart();
-        // Tab charts
-        this.createEnrollmentTrendChart();
-        this.createEnrollmentBySchoolChart();
-        this.createEnrollmentByProgrammeChart();
-        this.createGPADistributionChart();
-        this.createPassFailSchoolChart();
-        this.createAvgGPAByProgrammeChart();
-        this.createGradeDistributionChart();
-        this.createCompletionRatesChart();
-        this.createPerformanceMatrixChart();
-        this.createRetentionRateChart();
-        this.createCohortCompletionChart();
-        this.createGenderDistChart();
-        this.createNationalityChart();
-        this.createAgeDistChart();
-        this.createProficiencyChart();
-        // Plotly charts
-        this.createSankeyChart();
-        this.createSunburstChart();
-        // Additional Chart.js
-        this.createProgrammeComparisonChart();
-        this.createCoursePassRateChart();
+        for (const section of Object.keys(this.sections)) this.initializeSection(section);
+    },
+
+    // Create one view's charts (called once per view)
+    initializeSection(section) {
+        for (const name of this.sections[section] || []) this[`create${name}Chart`]();
     },
 
     // Update all charts with current DataStore data
     updateAllCharts() {
-        // Management Overview
-        this.updateRecruitmentSourceChart();
-        this.updateRecruitmentEffectivenessChart();
-        this.updateOfferFunnelChart();
-        this.updateClassificationByProgChart();
-        this.updateAttendanceRiskChart();
-        this.updateEducationPerformanceChart();
-        this.updateNewReturningChart();
-        // Tab charts
-        this.updateEnrollmentTrendChart();
-        this.updateEnrollmentBySchoolChart();
-        this.updateEnrollmentByProgrammeChart();
-        this.updateGPADistributionChart();
-        this.updatePassFailSchoolChart();
-        this.updateAvgGPAByProgrammeChart();
-        this.updateGradeDistributionChart();
-        this.updateCompletionRatesChart();
-        this.updatePerformanceMatrixChart();
-        this.updateRetentionRateChart();
-        this.updateCohortCompletionChart();
-        this.updateGenderDistChart();
-        this.updateNationalityChart();
-        this.updateAgeDistChart();
-        this.updateProficiencyChart();
-        // Plotly charts
-        this.updateSankeyChart();
-        this.updateSunburstChart();
-        // Additional Chart.js
-        this.updateProgrammeComparisonChart();
-        this.updateCoursePassRateChart();
+        for (const section of Object.keys(this.sections)) this.updateSection(section);
+    },
+
+    updateSection(section) {
+        for (const name of this.sections[section] || []) this[`update${name}Chart`]();
     },
 
     getCtx(id) {
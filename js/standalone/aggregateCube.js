@@ -0,0 +1,69 @@
+// Aggregate Cube — serves precomputed DataStore metrics in the standalone build
+// build_standalone.py embeds EMBEDDED_AGGREGATE_CUBE (see scripts/aggregates.py).
+// Filters the cube covers (year, school, programme, gender) are answered from it;
+// any other filter, or imported CSV data, falls back to the raw-row methods.
+const AggregateCube = {
+    cube: null,
+    enabled: false,
+    key: null,   // cube key of the active filters, null when not covered
+
+    // Filters that the cube does not pre-aggregate
+    uncoveredFilters: ['nationality', 'attendanceStatus', 'classification', 'entryLevel', 'gpaMin', 'gpaMax', 'search'],
+
+    install(cube) {
+        this.cube = cube;
+        this.enabled = true;
+        this.key = this.keyFor({});
+
+        // Wrap each pre-aggregated method; arguments or a cube miss use the original
+        for (const name of cube.methods) {
+            const original = DataStore[name];
+            DataStore[name] = function (...args) {
+                const cached = args.length === 0 ? AggregateCube.lookup(name) : undefined;
+                return cached !== undefined ? cached : original.apply(this, args);
+            };
+        }
+
+        // Track the active filter combination
+        const applyFilters = DataStore.applyFilters;
+        DataStore.applyFilters = function (filters) {
+            AggregateCube.key = AggregateCube.keyFor(filters || {});
+            return applyFilters.call(this, filters);
+        };
+        const resetFilters = DataStore.resetFilters;
+        DataStore.resetFilters = function () {
+            AggregateCube.key = AggregateCube.keyFor({});
+            return resetFilters.call(this);
+        };
+
+        // The cube describes the embedded data only — disable it for imported files
+        const loadAllData = DataLoader.loadAllData;
+        DataLoader.loadAllData = async function (...args) {
+            const loaded = await loadAllData.apply(this, args);
+            AggregateCube.enabled = true;
+            return loaded;
+        };
+        const loadAllDataFromFiles = DataLoader.loadAllDataFromFiles;
+        DataLoader.loadAllDataFromFiles = async function (...args) {
+            AggregateCube.enabled = false;
+            return loadAllDataFromFiles.apply(this, args);
+        };
+    },
+
+    // Cube key for a filters object, or null if it uses an uncovered filter
+    keyFor(filters) {
+        if (this.uncoveredFilters.some(f => filters[f] != null && filters[f] !== '')) return null;
+        return [filters.year, filters.school, filters.programme, filters.gender]
+            .map(v => v || '')
+            .join('|');
+    },
+
+    // Cached result for the active filters (a copy, callers may mutate it)
+    lookup(name) {
+        if (!this.enabled || this.key === null) return undefined;
+        const cell = this.cube.index[this.key];
+        if (cell === undefined) return undefined;
+        const value = this.cube.cells[cell][name];
+        return value === undefined ? undefined : structuredClone(value);
+    }
+};
@@ -0,0 +1,59 @@
+// Dashboard Worker — DataLoader and DataStore off the page's main thread
+// build_standalone.py --worker packages this file after config.js, dataLoader.js,
+// dataStore.js and packedData.js as the source of the worker started by
+// workerClient.js. The page sends the decoded packed columns once (transferred,
+// not copied); each filter change is answered with the filtered row positions of
+// every table and the results of the DataStore calls the page's views make.
+const DashboardWorker = {
+    positions: {},   // table → Map of row object → position in DataLoader[table]
+
+    async init(tables) {
+        const rows = {};
+        for (const [key, table] of Object.entries(tables)) rows[key] = PackedData.toRows(table, table.arrays);
+        DataLoader.loadCSV = function (path) {
+            const key = Object.keys(CONFIG.csvPaths).find(k => CONFIG.csvPaths[k] === path);
+            return Promise.resolve(rows[key]);
+        };
+        await DataLoader.loadAllData();
+        DataStore.initialize();
+        for (const table of Object.keys(DataStore.filtered)) {
+            this.positions[table] = new Map(DataLoader[table].map((row, i) => [row, i]));
+        }
+    },
+
+    // calls: [key, method, args] triples; a call that throws is left to the page
+    query(filters, calls) {
+        DataStore.applyFilters(filters);
+        const values = {};
+        for (const [key, name, args] of calls) {
+            try {
+                values[key] = DataStore[name](...args);
+            } catch (err) {
+                console.warn(`DataStore.${name} failed in the worker:`, err);
+            }
+        }
+        const positions = {};
+        for (const [table, rows] of Object.entries(DataStore.filtered)) {
+            const index = this.positions[table];
+            const out = new Uint32Array(rows.length);
+            for (let i = 0; i < rows.length; i++) out[i] = index.get(rows[i]);
+            positions[table] = out;
+        }
+        return { positions, values };
+    }
+};
+
+self.onmessage = async ({ data: message }) => {
+    try {
+        if (message.type === 'init') {
+            await DashboardWorker.init(message.tables);
+            self.postMessage({ type: 'ready' });
+        } else if (message.type === 'query') {
+            const { positions, values } = DashboardWorker.query(message.filters, message.calls);
+            self.postMessage({ type: 'result', id: message.id, positions, values },
+                Object.values(positions).map(p => p.buffer));
+        }
+    } catch (err) {
+        self.postMessage({ type: 'error', id: message.id, message: err.message });
+    }
+};
@@ -0,0 +1,205 @@
+// Filter Index — bitset filtering for DataStore.applyFilters in the standalone build
+// build_standalone.py embeds EMBEDDED_FILTER_INDEX (see scripts/filter_index.py).
+// A filter change becomes an AND of per-value bitsets over DataLoader.students
+// positions, and the related tables are sliced from precomputed per-student row
+// ranges instead of being re-scanned. Imported CSV data uses the original path.
+const FilterIndex = {
+    index: null,
+    enabled: false,
+    bitsets: {},     // dimension → value → Uint32Array, decoded on first use
+    words: 0,        // Uint32 words per bitset
+
+    // Filters matched on a student field (entryLevel is parsed first, as applyFilters does)
+    studentDimensions: ['school', 'programme', 'gender', 'nationality', 'entryLevel'],
+    // Filters matched through a related table's rows
+    relatedDimensions: ['year', 'classification', 'attendanceStatus'],
+    relatedTables: ['currentStudents', 'enrollments', 'courseResults', 'attendance', 'classifications'],
+
+    install(index) {
+        this.index = index;
+        this.enabled = true;
+        this.words = Math.ceil(index.students / 32);
+        this.keys = this.typedArray(index.keys.type, index.keys.data);
+        this.gpaValues = this.typedArray(index.gpa.values.type, index.gpa.values.data);
+        this.gpaPositions = this.typedArray(index.gpa.positions.type, index.gpa.positions.data);
+        this.related = {};
+        this.keyCount = 0;
+        for (const [table, spec] of Object.entries(index.related)) {
+            this.related[table] = {
+                rows: spec.rows,
+                order: this.typedArray(spec.order.type, spec.order.data),
+                offsets: this.typedArray(spec.offsets.type, spec.offsets.data)
+            };
+            this.keyCount = this.related[table].offsets.length - 1;
+        }
+        this.rowKeys = {};   // table → row position → Student_ID key (-1 if none), built on first use
+
+        // Use the index only while the loaded rows are the ones it was built from
+        const applyFilters = DataStore.applyFilters;
+        DataStore.applyFilters = function (filters) {
+            if (!FilterIndex.matchesData()) return applyFilters.call(this, filters);
+            this.filtered = FilterIndex.apply(filters || {});
+            return this.filtered;
+        };
+
+        const loadAllData = DataLoader.loadAllData;
+        DataLoader.loadAllData = async function (...args) {
+            const loaded = await loadAllData.apply(this, args);
+            FilterIndex.enabled = true;
+            return loaded;
+        };
+        const loadAllDataFromFiles = DataLoader.loadAllDataFromFiles;
+        DataLoader.loadAllDataFromFiles = async function (...args) {
+            FilterIndex.enabled = false;
+            return loadAllDataFromFiles.apply(this, args);
+        };
+    },
+
+    // Decode a base64 little-endian typed array (the embedded data may be CSV, without PackedData)
+    typedArray(type, base64) {
+        const binary = atob(base64);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+        return new globalThis[type + 'Array'](bytes.buffer);
+    },
+
+    // Related tables may also be empty: not loaded yet in the split build (see lazyBundles.js)
+    matchesData() {
+        if (!this.enabled || DataLoader.students.length !== this.index.students) return false;
+        return this.relatedTables.every(t => DataLoader[t].length === this.related[t].rows || !DataLoader[t].length);
+    },
+
+    bitset(dimension, value) {
+        const column = this.index.bitsets[dimension];
+        if (!Object.hasOwn(column, value)) return null;
+        const cache = this.bitsets[dimension] || (this.bitsets[dimension] = {});
+        return cache[value] || (cache[value] = this.typedArray(column[value].type, column[value].data));
+    },
+
+    // Same result as DataStore.applyFilters for the embedded data
+    apply(filters) {
+        const n = this.index.students;
+        const words = new Uint32Array(this.words).fill(0xFFFFFFFF);
+        if (n % 32) words[this.words - 1] = (2 ** (n % 32)) - 1;
+
+        for (const dimension of [...this.studentDimensions, ...this.relatedDimensions]) {
+            if (!filters[dimension]) continue;
+            const value = dimension === 'entryLevel' ? String(parseInt(filters[dimension])) : filters[dimension];
+            const bits = this.bitset(dimension, value);
+            if (!bits) {
+                words.fill(0);
+                break;
+            }
+            for (let w = 0; w < words.length; w++) words[w] &= bits[w];
+        }
+
+        // GPA range — two binary searches over the sorted Final_GPAs
+        if (filters.gpaMin != null || filters.gpaMax != null) {
+            const min = filters.gpaMin != null ? parseFloat(filters.gpaMin) : 0;
+            const max = filters.gpaMax != null ? parseFloat(filters.gpaMax) : 22;
+            const inRange = new Uint32Array(this.words);
+            if (!Number.isNaN(min) && !Number.isNaN(max)) {
+                const end = this.firstAbove(max, false);
+                for (let i = this.firstAbove(min, true); i < end; i++) {
+                    const p = this.gpaPositions[i];
+                    inRange[p >>> 5] |= 1 << (p & 31);
+                }
+            }
+            for (let w = 0; w < words.length; w++) words[w] &= inRange[w];
+        }
+
+        // Set bits → student positions, in DataLoader order
+        const all = DataLoader.students;
+        let positions = [];
+        for (let w = 0; w < words.length; w++) {
+            let word = words[w];
+            while (word) {
+                const low = word & -word;
+                positions.push(w * 32 + 31 - Math.clz32(low));
+                word ^= low;
+            }
+        }
+
+        // Text search (name or ID)
+        if (filters.search) {
+            const q = filters.search.toLowerCase();
+            positions = positions.filter(p => {
+                const s = all[p];
+                return s.student_id.toLowerCase().includes(q) ||
+                    s.first_name.toLowerCase().includes(q) ||
+                    s.last_name.toLowerCase().includes(q) ||
+                    (s.first_name + ' ' + s.last_name).toLowerCase().includes(q);
+            });
+        }
+
+        // Distinct Student_IDs of the selection (duplicated IDs share a key)
+        const chosen = new Uint8Array(this.keyCount);
+        const keys = [];
+        for (const p of positions) {
+            const key = this.keys[p];
+            if (!chosen[key]) {
+                chosen[key] = 1;
+                keys.push(key);
+            }
+        }
+
+        const filtered = { students: positions.map(p => all[p]) };
+        for (const table of this.relatedTables) {
+            filtered[table] = this.gather(table, keys, chosen);
+        }
+        return filtered;
+    },
+
+    // Rows of the given Student_ID keys, in the table's original order
+    gather(table, keys, chosen) {
+        const { rows, order, offsets } = this.related[table];
+        const source = DataLoader[table];
+        if (!source.length) return [];
+        let total = 0;
+        for (const key of keys) total += offsets[key + 1] - offsets[key];
+        const out = new Array(total);
+
+        // Broad selections: one pass over the table's keys beats copying and sorting ranges
+        if (total * 16 > rows) {
+            const rowKeys = this.tableRowKeys(table);
+            let at = 0;
+            for (let i = 0; i < rows; i++) {
+                const key = rowKeys[i];
+                if (key >= 0 && chosen[key]) out[at++] = source[i];
+            }
+            return out;
+        }
+
+        const positions = new Int32Array(total);
+        let at = 0;
+        for (const key of keys) {
+            for (let i = offsets[key]; i < offsets[key + 1]; i++) positions[at++] = order[i];
+        }
+        positions.sort();
+        for (let i = 0; i < total; i++) out[i] = source[positions[i]];
+        return out;
+    },
+
+    tableRowKeys(table) {
+        if (this.rowKeys[table]) return this.rowKeys[table];
+        const { rows, order, offsets } = this.related[table];
+        const rowKeys = new Int32Array(rows).fill(-1);
+        for (let key = 0; key < this.keyCount; key++) {
+            for (let i = offsets[key]; i < offsets[key + 1]; i++) rowKeys[order[i]] = key;
+        }
+        return (this.rowKeys[table] = rowKeys);
+    },
+
+    // Index of the first sorted GPA >= value (inclusive) or > value
+    firstAbove(value, inclusive) {
+        const values = this.gpaValues;
+        let lo = 0;
+        let hi = values.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >>> 1;
+            if (inclusive ? values[mid] < value : values[mid] <= value) lo = mid + 1;
+            else hi = mid;
+        }
+        return lo;
+    }
+};
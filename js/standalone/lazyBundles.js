@@ -0,0 +1,277 @@
+// Lazy Bundles — per-dataset data bundles for the split standalone build
+// build_standalone.py --bundles inlines only the datasets the first screen reads
+// (the Management Overview and the initial tab) and writes every other dataset to
+// its own script in dashboard_lazy_bundles/. A bundle is added as a <script>
+// element, which also works from file://, when a tab, a filter or the assistant
+// first needs it. Tabs are drawn when first shown, and redrawn there if a filter
+// change happened while they were hidden. Imported CSV data uses the original path.
+const LazyBundles = {
+    manifest: null,
+    enabled: false,
+    fetched: new Set(),   // deferred datasets whose bundle script has run
+    loaded: new Set(),    // datasets processed into DataLoader
+    pending: new Map(),   // dataset → Promise of its load
+    drawn: new Set(),     // views whose charts and table exist
+    stale: new Set(),     // drawn views that missed an update while hidden
+    filters: null,        // active DataStore filters, re-applied when a dataset arrives
+    active: 'enrollment',
+
+    // Tables applyFilters cross-references for each filter
+    filterDatasets: {
+        year: ['currentStudents'],
+        attendanceStatus: ['attendance'],
+        classification: ['classifications'],
+        gpaMin: ['classifications'],
+        gpaMax: ['classifications']
+    },
+
+    // QueryPanel control ids for every filter, used to read the filters before they are applied
+    filterInputs: {
+        year: 'filterYear', school: 'filterSchool', programme: 'filterProgramme', gender: 'filterGender',
+        nationality: 'filterNationality', attendanceStatus: 'filterAttendance',
+        classification: 'filterClassification', entryLevel: 'filterEntryLevel'
+    },
+
+    install(manifest) {
+        this.manifest = manifest;
+        this.enabled = true;
+        this.active = document.querySelector('.tab.active')?.dataset?.tab || this.active;
+
+        // Deferred datasets start empty; the rest load as before
+        const loadAllData = DataLoader.loadAllData;
+        DataLoader.loadAllData = async function (...args) {
+            const deferred = new Set(LazyBundles.deferredKeys().map(key => CONFIG.csvPaths[key]));
+            const loadCSV = this.loadCSV;
+            this.loadCSV = path => deferred.has(path) ? Promise.resolve([]) : loadCSV.call(this, path);
+            try {
+                await loadAllData.apply(this, args);
+            } finally {
+                this.loadCSV = loadCSV;
+            }
+            LazyBundles.enabled = true;
+            LazyBundles.loaded = new Set(Object.keys(CONFIG.csvPaths).filter(key => !deferred.has(CONFIG.csvPaths[key])));
+            return true;
+        };
+        const loadAllDataFromFiles = DataLoader.loadAllDataFromFiles;
+        DataLoader.loadAllDataFromFiles = async function (...args) {
+            LazyBundles.enabled = false;
+            const loaded = await loadAllDataFromFiles.apply(this, args);
+            // Imported data is drawn everywhere by the original methods
+            LazyBundles.loaded = new Set(Object.keys(CONFIG.csvPaths));
+            LazyBundles.drawn = new Set([...Object.keys(ChartsManager.sections), 'insights']);
+            LazyBundles.stale.clear();
+            return loaded;
+        };
+
+        // Dropdown values of datasets that are not loaded yet come from the build
+        const values = manifest.values;
+        const fromBuild = {
+            getAcademicYears: ['currentStudents', () => [...values.academicYears].sort()],
+            getAttendanceStatuses: ['attendance', () => [...values.attendanceStatuses].sort()],
+            getClassifications: ['classifications', () => CONFIG.classificationOrder.filter(c => values.classifications.includes(c))]
+        };
+        for (const [name, [key, precomputed]] of Object.entries(fromBuild)) {
+            const original = DataStore[name];
+            DataStore[name] = function (...args) {
+                return LazyBundles.enabled && !LazyBundles.loaded.has(key) ? precomputed() : original.apply(this, args);
+            };
+        }
+
+        // Track the active filters
+        const applyFilters = DataStore.applyFilters;
+        DataStore.applyFilters = function (filters) {
+            LazyBundles.filters = filters || {};
+            return applyFilters.call(this, filters);
+        };
+        const resetFilters = DataStore.resetFilters;
+        DataStore.resetFilters = function () {
+            LazyBundles.filters = null;
+            return resetFilters.call(this);
+        };
+
+        // Draw only what is on screen; hidden views are drawn when shown
+        const initializeCharts = ChartsManager.initializeCharts;
+        ChartsManager.initializeCharts = function (...args) {
+            if (!LazyBundles.enabled) return initializeCharts.apply(this, args);
+            LazyBundles.drawn.clear();
+            LazyBundles.stale.clear();
+            for (const view of Object.keys(this.sections)) {
+                if (LazyBundles.onScreen(view)) LazyBundles.draw(view);
+            }
+        };
+        const updateAllCharts = ChartsManager.updateAllCharts;
+        ChartsManager.updateAllCharts = function (...args) {
+            if (!LazyBundles.enabled) return updateAllCharts.apply(this, args);
+            for (const view of Object.keys(this.sections)) LazyBundles.refresh(view, () => this.updateSection(view));
+        };
+        const renderAllTables = TablesManager.renderAllTables;
+        TablesManager.renderAllTables = function (...args) {
+            if (!LazyBundles.enabled) return renderAllTables.apply(this, args);
+            for (const view of Object.keys(this.sections)) LazyBundles.refresh(view, () => this.renderSection(view));
+        };
+        this.generateInsights = InsightsGenerator.generateAllInsights;
+        InsightsGenerator.generateAllInsights = function (...args) {
+            if (!LazyBundles.enabled) return LazyBundles.generateInsights.apply(this, args);
+            LazyBundles.refresh('insights', () => LazyBundles.generateInsights.call(this));
+        };
+
+        const switchTab = QueryPanel.switchTab;
+        QueryPanel.switchTab = function (tabName) {
+            switchTab.call(this, tabName);
+            LazyBundles.active = tabName;
+            if (LazyBundles.enabled) LazyBundles.show(tabName);
+        };
+
+        // Load what a filter change needs before the panel applies it
+        const panelApply = QueryPanel.applyFilters;
+        QueryPanel.applyFilters = async function (...args) {
+            if (LazyBundles.enabled) await LazyBundles.ensure(LazyBundles.filterNeeds(LazyBundles.panelFilters()), false);
+            return panelApply.apply(this, args);
+        };
+        const panelReset = QueryPanel.resetFilters;
+        QueryPanel.resetFilters = async function (...args) {
+            if (LazyBundles.enabled) await LazyBundles.ensure(LazyBundles.filterNeeds({}), false);
+            return panelReset.apply(this, args);
+        };
+
+        if (typeof Assistant !== 'undefined') {
+            const send = Assistant._handleSend;
+            Assistant._handleSend = async function (...args) {
+                if (LazyBundles.enabled) await LazyBundles.ensure(LazyBundles.datasetsFor('assistant'));
+                return send.apply(this, args);
+            };
+        }
+    },
+
+    // Deferred datasets whose bundle has not run yet
+    deferredKeys() {
+        return Object.keys(this.manifest.bundles).filter(key => !this.fetched.has(key));
+    },
+
+    // Datasets a view reads under the active filters
+    datasetsFor(view, filters = this.filters || {}) {
+        const deps = this.manifest.views[view];
+        if (!deps) return [];
+        const cubeCovers = typeof AggregateCube !== 'undefined' && AggregateCube.enabled &&
+            AggregateCube.keyFor(filters) !== null;
+        return (cubeCovers && deps.cube) || deps.rows;
+    },
+
+    onScreen(view) {
+        return view === 'overview' || view === this.active;
+    },
+
+    ready(view) {
+        return this.datasetsFor(view).every(key => this.loaded.has(key));
+    },
+
+    // Datasets needed to apply filters and redraw what is on screen
+    filterNeeds(filters) {
+        const needs = new Set();
+        for (const [name, keys] of Object.entries(this.filterDatasets)) {
+            if (filters[name] != null && filters[name] !== '') keys.forEach(key => needs.add(key));
+        }
+        for (const view of ['overview', this.active]) {
+            this.datasetsFor(view, filters).forEach(key => needs.add(key));
+        }
+        return [...needs];
+    },
+
+    panelFilters() {
+        const filters = {};
+        for (const [name, id] of Object.entries(this.filterInputs)) filters[name] = QueryPanel.val(id);
+        filters.search = (document.getElementById('searchInput')?.value || '').trim() || null;
+        return filters;
+    },
+
+    // Run a drawn view's update now if it is on screen, otherwise when it is next shown
+    refresh(view, update) {
+        if (!this.drawn.has(view)) {
+            if (this.onScreen(view)) this.show(view);
+            return;
+        }
+        if (this.onScreen(view) && this.ready(view)) update();
+        else if (this.onScreen(view)) this.show(view);
+        else this.stale.add(view);
+    },
+
+    async show(view) {
+        const missing = this.datasetsFor(view).filter(key => !this.loaded.has(key));
+        if (missing.length) {
+            QueryPanel.showNotification(`Loading ${missing.join(', ')}...`);
+            await this.ensure(missing);
+        }
+        if (this.onScreen(view)) this.draw(view);
+    },
+
+    // Create (first time) or update a view's charts, table and insights
+    draw(view) {
+        if (!this.ready(view) || (this.drawn.has(view) && !this.stale.has(view))) return;
+        if (this.drawn.has(view)) ChartsManager.updateSection(view);
+        else ChartsManager.initializeSection(view);
+        TablesManager.renderSection(view);
+        if (view === 'insights') this.generateInsights.call(InsightsGenerator);
+        this.drawn.add(view);
+        this.stale.delete(view);
+    },
+
+    // Load datasets; with refresh, re-apply the filters and redraw the views that read them
+    async ensure(keys, refresh = true) {
+        const missing = keys.filter(key => !this.loaded.has(key));
+        if (!missing.length) return;
+        try {
+            await Promise.all(missing.map(key => this.load(key)));
+        } catch (err) {
+            console.error(err);
+            QueryPanel.showNotification(`${err.message} — open ${this.manifest.fallback} instead.`);
+            return;
+        }
+        if (!refresh) return;
+        if (this.filters) DataStore.applyFilters(this.filters);
+        else DataStore.resetFilters();
+        QueryPanel.updateHeaderStats();
+        QueryPanel.updateFilterCount();
+        for (const view of this.drawn) {
+            if (this.datasetsFor(view).some(key => missing.includes(key))) this.stale.add(view);
+        }
+        for (const view of this.drawn) {
+            if (this.onScreen(view)) this.draw(view);
+        }
+    },
+
+    load(key) {
+        if (!this.pending.has(key)) {
+            this.pending.set(key, this.fetch(key)
+                .then(() => DataLoader.loadCSV(CONFIG.csvPaths[key]))
+                .then(rows => this.ingest(key, rows))
+                .finally(() => this.pending.delete(key)));
+        }
+        return this.pending.get(key);
+    },
+
+    fetch(key) {
+        if (this.fetched.has(key)) return Promise.resolve();
+        return new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = this.manifest.bundles[key];
+            script.onload = () => {
+                this.fetched.add(key);
+                resolve();
+            };
+            script.onerror = () => reject(new Error(`Could not load ${this.manifest.bundles[key]}`));
+            document.head.appendChild(script);
+        });
+    },
+
+    // Process one dataset into DataLoader, as loadAllData does
+    ingest(key, rows) {
+        if (key === 'admissions') {
+            DataLoader.allApplicants = DataLoader.processAdmissionsData(rows, false);
+            DataLoader.students = DataLoader.processAdmissionsData(rows, true);
+        } else {
+            DataLoader[key] = DataLoader[`process${key[0].toUpperCase()}${key.slice(1)}Data`](rows);
+        }
+        DataLoader.buildIndexes();
+        this.loaded.add(key);
+    }
+};
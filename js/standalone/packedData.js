@@ -0,0 +1,60 @@
+// Packed Data — decodes the column payload written by scripts/packed_data.py
+// Each table is { rows, columns: [{ name, kind, type, data, ... }] } where data is a
+// base64 little-endian typed array. Rows come back as the same string-valued
+// objects Papa.parse produces, so the DataLoader processors run unchanged.
+const PackedData = {
+    typedArray(type, base64) {
+        const binary = atob(base64);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+        return new globalThis[type + 'Array'](bytes.buffer);
+    },
+
+    // Decoded typed array of each column (transferable to a worker, see workerClient.js)
+    columnArrays(table) {
+        return table.columns.map(c => this.typedArray(c.type, c.data));
+    },
+
+    // Decode one column into an array of strings
+    decodeColumn(col, data = this.typedArray(col.type, col.data)) {
+        const out = new Array(data.length);
+
+        if (col.kind === 'dict') {
+            const values = col.values;
+            for (let i = 0; i < data.length; i++) out[i] = values[data[i]];
+            return out;
+        }
+
+        // number: (offset + value) / scale, printed the way the CSV wrote it
+        const isFloat = col.type === 'Float64';
+        const sentinel = isFloat ? null : 2 ** (data.BYTES_PER_ELEMENT * 8) - 1;
+        const offset = col.offset || 0;
+        const reprStyle = col.format === 'repr';
+        for (let i = 0; i < data.length; i++) {
+            const raw = data[i];
+            if (col.token !== undefined && (isFloat ? Number.isNaN(raw) : raw === sentinel)) {
+                out[i] = col.token;
+                continue;
+            }
+            const v = col.scale === 1 ? raw + offset : (raw + offset) / col.scale;
+            out[i] = (reprStyle && Number.isInteger(v)) ? v.toFixed(1) : String(v);
+        }
+        return out;
+    },
+
+    // Decode a packed table into row objects keyed by CSV header
+    toRows(table, arrays = this.columnArrays(table)) {
+        const names = table.columns.map(c => c.name);
+        const columns = table.columns.map((c, j) => this.decodeColumn(c, arrays[j]));
+        const rows = new Array(table.rows);
+        for (let i = 0; i < table.rows; i++) {
+            const row = {};
+            for (let j = 0; j < names.length; j++) {
+                const v = columns[j][i];
+                if (v !== null) row[names[j]] = v;
+            }
+            rows[i] = row;
+        }
+        return rows;
+    }
+};
@@ -0,0 +1,132 @@
+// Query Client — thin dashboard build backed by scripts/query_service.py
+// build_standalone.py --api URL embeds no data: the CSVs are fetched from the
+// service, and the cube methods (year/school/programme/gender filters) are
+// answered from its cached /api/metrics results. Any other filter, or imported
+// CSV data, falls back to the raw-row methods, as with AggregateCube.
+// Every request carries the token of the service run the page was built for.
+const QueryClient = {
+    baseUrl: null,
+    token: null,
+    methods: [],
+    cells: new Map(),   // cube key → method results
+    enabled: false,
+    key: null,          // cube key of the active filters, null when not covered
+
+    // Filters that the service does not aggregate (same as AggregateCube)
+    uncoveredFilters: ['nationality', 'attendanceStatus', 'classification', 'entryLevel', 'gpaMin', 'gpaMax', 'search'],
+
+    // QueryPanel control ids for every filter, used to read the filters before they are applied
+    filterInputs: {
+        year: 'filterYear', school: 'filterSchool', programme: 'filterProgramme', gender: 'filterGender',
+        nationality: 'filterNationality', attendanceStatus: 'filterAttendance',
+        classification: 'filterClassification', entryLevel: 'filterEntryLevel'
+    },
+
+    install(baseUrl, token, methods) {
+        this.baseUrl = baseUrl.replace(/\/+$/, '');
+        this.token = token;
+        this.methods = methods;
+        this.key = this.keyFor({});
+
+        // Datasets come from the service instead of data/
+        DataLoader._originalLoadCSV = DataLoader.loadCSV;
+        DataLoader.loadCSV = function (path) {
+            for (const [key, csvPath] of Object.entries(CONFIG.csvPaths)) {
+                if (csvPath === path) return this._originalLoadCSV(QueryClient.url(`/api/csv/${key}`));
+            }
+            return this._originalLoadCSV(path);
+        };
+
+        // Wrap each served method; arguments or a missing result use the original
+        for (const name of methods) {
+            const original = DataStore[name];
+            DataStore[name] = function (...args) {
+                const cached = args.length === 0 ? QueryClient.lookup(name) : undefined;
+                return cached !== undefined ? cached : original.apply(this, args);
+            };
+        }
+
+        const applyFilters = DataStore.applyFilters;
+        DataStore.applyFilters = function (filters) {
+            QueryClient.key = QueryClient.keyFor(filters || {});
+            return applyFilters.call(this, filters);
+        };
+        const resetFilters = DataStore.resetFilters;
+        DataStore.resetFilters = function () {
+            QueryClient.key = QueryClient.keyFor({});
+            return resetFilters.call(this);
+        };
+
+        // Fetch the results for the new filters before the panel redraws
+        const panelApply = QueryPanel.applyFilters;
+        QueryPanel.applyFilters = async function (...args) {
+            await QueryClient.prefetch(QueryClient.keyFor(QueryClient.panelFilters()));
+            return panelApply.apply(this, args);
+        };
+        const panelReset = QueryPanel.resetFilters;
+        QueryPanel.resetFilters = async function (...args) {
+            await QueryClient.prefetch(QueryClient.keyFor({}));
+            return panelReset.apply(this, args);
+        };
+
+        // Unfiltered results are needed for the first render
+        const loadAllData = DataLoader.loadAllData;
+        DataLoader.loadAllData = async function (...args) {
+            const [loaded] = await Promise.all([
+                loadAllData.apply(this, args),
+                QueryClient.prefetch(QueryClient.keyFor({}))
+            ]);
+            QueryClient.enabled = true;
+            return loaded;
+        };
+        const loadAllDataFromFiles = DataLoader.loadAllDataFromFiles;
+        DataLoader.loadAllDataFromFiles = async function (...args) {
+            QueryClient.enabled = false;
+            return loadAllDataFromFiles.apply(this, args);
+        };
+    },
+
+    panelFilters() {
+        const filters = {};
+        for (const [name, id] of Object.entries(this.filterInputs)) filters[name] = QueryPanel.val(id);
+        filters.search = (document.getElementById('searchInput')?.value || '').trim() || null;
+        return filters;
+    },
+
+    // Cube key for a filters object, or null if it uses an uncovered filter
+    keyFor(filters) {
+        if (this.uncoveredFilters.some(f => filters[f] != null && filters[f] !== '')) return null;
+        return [filters.year, filters.school, filters.programme, filters.gender]
+            .map(v => v || '')
+            .join('|');
+    },
+
+    // Load the results for a cube key; on failure the raw-row methods answer instead
+    async prefetch(key) {
+        if (key === null || this.cells.has(key)) return;
+        const [year, school, programme, gender] = key.split('|');
+        const params = new URLSearchParams({ year, school, programme, gender });
+        try {
+            const response = await fetch(this.url(`/api/metrics?${params}`));
+            if (response.status === 401) throw new Error('token rejected; rebuild this page for the running service');
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            this.cells.set(key, (await response.json()).results);
+        } catch (err) {
+            console.warn(`Query service unavailable for ${key}: ${err.message}`);
+        }
+    },
+
+    // Service URL with this build's token (a query parameter, so Papa.parse downloads carry it too)
+    url(path) {
+        const separator = path.includes('?') ? '&' : '?';
+        return `${this.baseUrl}${path}${separator}token=${encodeURIComponent(this.token)}`;
+    },
+
+    // Result for the active filters (a copy, callers may mutate it)
+    lookup(name) {
+        if (!this.enabled || this.key === null) return undefined;
+        const cell = this.cells.get(this.key);
+        if (!cell || cell[name] === undefined) return undefined;
+        return structuredClone(cell[name]);
+    }
+};
@@ -0,0 +1,206 @@
+// Worker Client — filtering and aggregation in a Web Worker for the standalone build
+// build_standalone.py --worker embeds the worker's source (dataWorker.js with DataLoader,
+// DataStore and PackedData), started from a Blob URL so it also runs from file://.
+// After the first render, the decoded packed columns are transferred to the worker.
+// A filter change the aggregate cube does not cover is then computed there while the
+// page stays responsive: the worker sends back the filtered row positions and the
+// results of every DataStore call the views have made, and QueryPanel redraws from
+// those. New calls, worker errors and imported CSV data use the page's DataStore.
+const WorkerClient = {
+    worker: null,
+    enabled: false,
+    ready: false,
+    sent: false,         // the embedded data has been transferred to the worker
+    served: false,       // DataStore methods are wrapped (see serveMethods)
+    tables: {},          // dataset → packed table with decoded column arrays, until sent
+    calls: new Map(),    // call key → [method, args] of each DataStore call made by the views
+    result: null,        // worker result for the filters being applied, or null
+    requests: new Map(), // message id → resolve
+    nextId: 0,
+    latest: 0,           // newest filter change; an older one still waiting is dropped
+    depth: 0,            // nesting of served calls computed on this thread
+
+    // DataStore getters answered from the full data (cheap, filter-independent)
+    localMethods: ['getData', 'getAcademicYears', 'getSchools', 'getProgrammes', 'getGenders',
+        'getNationalities', 'getAttendanceStatuses', 'getClassifications', 'getEntryLevels'],
+
+    // QueryPanel control ids for every filter, used to read the filters before they are applied
+    filterInputs: {
+        year: 'filterYear', school: 'filterSchool', programme: 'filterProgramme', gender: 'filterGender',
+        nationality: 'filterNationality', attendanceStatus: 'filterAttendance',
+        classification: 'filterClassification', entryLevel: 'filterEntryLevel'
+    },
+
+    install(source) {
+        try {
+            this.worker = new Worker(URL.createObjectURL(new Blob([source], { type: 'text/javascript' })));
+        } catch (err) {
+            console.warn(`Web Worker unavailable, filtering on the main thread: ${err.message}`);
+            return;
+        }
+        this.worker.onmessage = ({ data }) => this.receive(data);
+        this.worker.onerror = event => this.fail(event.message);
+
+        // Keep the decoded columns of each embedded dataset for the worker
+        const loadCSV = DataLoader.loadCSV;
+        DataLoader.loadCSV = function (path) {
+            for (const [key, csvPath] of Object.entries(CONFIG.csvPaths)) {
+                const table = EMBEDDED_PACKED_DATA[key];
+                if (csvPath === path && table && !WorkerClient.sent) {
+                    const arrays = PackedData.columnArrays(table);
+                    WorkerClient.tables[key] = {
+                        rows: table.rows, columns: table.columns.map(({ data, ...meta }) => meta), arrays
+                    };
+                    return Promise.resolve(PackedData.toRows(table, arrays));
+                }
+            }
+            return loadCSV.call(this, path);
+        };
+
+        const loadAllData = DataLoader.loadAllData;
+        DataLoader.loadAllData = async function (...args) {
+            const loaded = await loadAllData.apply(this, args);
+            WorkerClient.serveMethods();
+            WorkerClient.enabled = true;
+            WorkerClient.result = null;
+            // After the first render, which the worker's own decoding would slow down
+            if (!WorkerClient.sent) setTimeout(() => WorkerClient.start(), 0);
+            return loaded;
+        };
+        const loadAllDataFromFiles = DataLoader.loadAllDataFromFiles;
+        DataLoader.loadAllDataFromFiles = async function (...args) {
+            WorkerClient.enabled = false;
+            WorkerClient.result = null;
+            return loadAllDataFromFiles.apply(this, args);
+        };
+
+        // Filtered rows from the worker's positions instead of re-scanning the tables
+        const applyFilters = DataStore.applyFilters;
+        DataStore.applyFilters = function (filters) {
+            if (!WorkerClient.result) return applyFilters.call(this, filters);
+            this.filtered = WorkerClient.gather(WorkerClient.result.positions);
+            return this.filtered;
+        };
+
+        // Compute in the worker before the panel redraws
+        const panelApply = QueryPanel.applyFilters;
+        QueryPanel.applyFilters = async function (...args) {
+            if (await WorkerClient.prepare(WorkerClient.panelFilters())) return panelApply.apply(this, args);
+        };
+        const panelReset = QueryPanel.resetFilters;
+        QueryPanel.resetFilters = async function (...args) {
+            if (await WorkerClient.prepare({})) return panelReset.apply(this, args);
+        };
+    },
+
+    // Served methods: the worker's result for the filters being applied, or the original.
+    // Wrapped on the first load, after the cube has wrapped its methods, so the views'
+    // calls are recorded even while the cube answers them.
+    serveMethods() {
+        if (this.served) return;
+        this.served = true;
+        for (const name of Object.keys(DataStore)) {
+            if (typeof DataStore[name] !== 'function' || !/^(get|calculate)/.test(name) ||
+                this.localMethods.includes(name)) continue;
+            const original = DataStore[name];
+            DataStore[name] = function (...args) {
+                const key = WorkerClient.callKey(name, args);
+                const cached = WorkerClient.lookup(key);
+                if (cached !== undefined) return cached;
+                // Remember the views' own calls, not the ones a method makes internally
+                if (WorkerClient.enabled && WorkerClient.depth === 0) WorkerClient.calls.set(key, [name, args]);
+                WorkerClient.depth++;
+                try {
+                    return original.apply(this, args);
+                } finally {
+                    WorkerClient.depth--;
+                }
+            };
+        }
+    },
+
+    // Transfer the decoded columns; the page no longer needs them once its rows are built
+    start() {
+        if (!this.worker || this.sent) return;
+        const buffers = Object.values(this.tables).flatMap(table => table.arrays.map(a => a.buffer));
+        this.worker.postMessage({ type: 'init', tables: this.tables }, buffers);
+        this.tables = {};
+        this.sent = true;
+    },
+
+    receive(message) {
+        if (message.type === 'ready') {
+            this.ready = true;
+            return;
+        }
+        const resolve = this.requests.get(message.id);
+        this.requests.delete(message.id);
+        if (message.type === 'error') {
+            console.warn(`Worker: ${message.message}`);
+            if (message.id === undefined) this.fail(message.message);
+        }
+        if (resolve) resolve(message.type === 'result' ? message : null);
+    },
+
+    // Stop using the worker; the page's DataStore answers everything
+    fail(reason) {
+        console.warn(`Worker stopped, filtering on the main thread: ${reason}`);
+        this.ready = false;
+        this.worker = null;
+        for (const resolve of this.requests.values()) resolve(null);
+        this.requests.clear();
+    },
+
+    // Fetch the worker's result for filters; false if a newer filter change superseded it
+    async prepare(filters) {
+        const id = ++this.latest;
+        this.result = null;
+        if (!this.enabled || !this.ready || this.covered(filters)) return true;
+        const result = await this.query(filters);
+        if (id !== this.latest) return false;
+        this.result = result;
+        return true;
+    },
+
+    query(filters) {
+        const id = ++this.nextId;
+        const calls = [...this.calls].map(([key, [name, args]]) => [key, name, args]);
+        return new Promise(resolve => {
+            this.requests.set(id, resolve);
+            this.worker.postMessage({ type: 'query', id, filters, calls });
+        });
+    },
+
+    // Filters the aggregate cube answers on this thread without scanning
+    covered(filters) {
+        return typeof AggregateCube !== 'undefined' && AggregateCube.enabled && AggregateCube.keyFor(filters) !== null;
+    },
+
+    panelFilters() {
+        const filters = {};
+        for (const [name, id] of Object.entries(this.filterInputs)) filters[name] = QueryPanel.val(id);
+        filters.search = (document.getElementById('searchInput')?.value || '').trim() || null;
+        return filters;
+    },
+
+    callKey(name, args) {
+        return `${name}(${args.map(a => a === undefined ? 'undefined' : JSON.stringify(a)).join(',')})`;
+    },
+
+    // Result of a call for the filters being applied (a copy, callers may mutate it)
+    lookup(key) {
+        if (!this.enabled || !this.result || !Object.hasOwn(this.result.values, key)) return undefined;
+        return structuredClone(this.result.values[key]);
+    },
+
+    gather(positions) {
+        const filtered = {};
+        for (const [table, list] of Object.entries(positions)) {
+            const rows = DataLoader[table];
+            const out = new Array(list.length);
+            for (let i = 0; i < list.length; i++) out[i] = rows[list[i]];
+            filtered[table] = out;
+        }
+        return filtered;
+    }
+};
@@ -2,14 +2,24 @@
 const TablesManager = {
     sortState: {},  // tableId → { col, asc }
 
+    // Table per dashboard view (see ChartsManager.sections)
+    sections: {
+        overview: 'renderRecruitmentTable',
+        enrollment: 'renderEnrollmentTable',
+        performance: 'renderPerformanceTable',
+        comparison: 'renderComparisonTable',
+        retention: 'renderRetentionTable',
+        demographics: 'renderDemographicsTable'
+    },
+
     // Render all tables
     renderAllTables() {
-        this.renderRecruitmentTable();
-        this.renderEnrollmentTable();
-        this.renderPerformanceTable();
-        this.renderComparisonTable();
-        this.renderRetentionTable();
-        this.renderDemographicsTable();
+        for (const section of Object.keys(this.sections)) this.renderSection(section);
+    },
+
+    renderSection(section) {
+        const render = this.sections[section];
+        if (render) this[render]();
     },
 
     // Generic table builder
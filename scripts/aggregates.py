@@ -0,0 +1,789 @@
+#!/usr/bin/env python3
+"""
+Build-time dashboard aggregates.
+
+Mirrors the row processing in js/dataLoader.js and the DataStore metric
+methods in js/dataStore.js so the standalone build can ship precomputed
+results instead of recomputing them in the browser on every load.
+
+The aggregate cube holds one cell per year x school x programme x gender
+filter combination (empty string = "All"). Cells that select the same set of
+students are stored once. Values are JSON-ready and match what the JS methods
+return, including the strings produced by Number.toFixed().
+
+Usage:
+  python scripts/aggregates.py            # print cube size summary
+"""
+
+import csv
+import json
+import re
+from decimal import Decimal, ROUND_HALF_UP
+
+from datasets import DATASETS, csv_path
+
+# Raw CSV text is parsed here rather than through load_dataset(): the
+# processors below mirror DataLoader's string handling exactly
+CSV_FILES = {name: csv_path(name) for name in DATASETS}
+
+# ============================================================================
+# Mirrors of js/config.js — keep in sync
+# ============================================================================
+
+PROGRAMME_TO_SCHOOL = {
+    'Accountancy & Finance':                          'Business',
+    'Business Management':                            'Business',
+    'Business Management and Information Systems':    'Natural & Computing Sciences',
+    'Business Management and International Relations': 'Social Science',
+    'Computing Science':                              'Natural & Computing Sciences',
+    'Legal Studies':                                  'Legal Studies',
+    'Politics and International Relations':           'Social Science',
+}
+
+PROGRAMME_ABBREVIATIONS = {
+    'Accountancy & Finance':                          'AF',
+    'Business Management':                            'BM',
+    'Business Management and Information Systems':    'BM-IS',
+    'Business Management and International Relations': 'BM-IR',
+    'Computing Science':                              'CS',
+    'Legal Studies':                                  'LS',
+    'Politics and International Relations':           'PIR',
+}
+
+PASS_GRADES = {
+    'A1', 'A2', 'A3', 'A4', 'A5', 'B1', 'B2', 'B3',
+    'C1', 'C2', 'C3', 'D1', 'D2', 'D3',
+}
+
+IELTS_BANDS = [
+    ('Advanced', 7.5, 9.0),
+    ('Proficient', 6.5, 7.4),
+    ('Intermediate', 5.5, 6.4),
+    ('Beginner', 0, 5.4),
+]
+
+EXCLUDED_STATUSES = ['Rejected', 'Not Interested']
+
+REFERRAL_JUNK_VALUES = ['6.5', '7', '6', 'Chemistry']
+
+REFERRAL_MERGE = {
+    'Facebook':                    'Social Media',
+    'Instagram':                   'Social Media',
+    'LinkedIn':                    'Social Media',
+    'Social Media':                'Social Media',
+    'Website':                     'Website & Search',
+    'Search Engine: Google':       'Website & Search',
+    'University Fair':             'Outreach Events',
+    'Outreach Activity: Open Day': 'Outreach Events',
+    'School Visit':                'Outreach Events',
+}
+
+# DataStore.getClassificationByProgramme band map
+CLASSIFICATION_BANDS = {
+    'First Class Honours': 'First',
+    'Borderline 2.1/1st': 'First',
+    'Upper Second Class Honours': 'Upper Second',
+    'Borderline 2.2/2.1': 'Upper Second',
+    'Lower Second Class Honours': 'Lower Second',
+    'Borderline 3rd/2.2': 'Lower Second',
+    'Third Class Honours': 'Third',
+    'Borderline Fail/3rd': 'Third',
+    'Fail': 'Fail',
+}
+
+# DataStore.getGradeBandByProgramme band definitions
+GRADE_BANDS = {
+    'A (Excellent)': ['A1', 'A2', 'A3', 'A4', 'A5'],
+    'B (Very Good)': ['B1', 'B2', 'B3'],
+    'C (Good)': ['C1', 'C2', 'C3'],
+    'D (Pass)': ['D1', 'D2', 'D3'],
+    'E-F (Marginal Fail)': ['E1', 'E2', 'E3', 'F1', 'F2', 'F3'],
+    'G (Clear Fail)': ['G1', 'G2', 'G3'],
+}
+
+PROFICIENCY_ORDER = ['Advanced', 'Proficient', 'Intermediate', 'Basic', 'Beginner']
+
+# DataStore methods served from the cube (zero-argument, filter-dependent)
+CUBE_METHODS = [
+    'calculateAverageGPA',
+    'calculateAverageAttendance',
+    'calculatePassRate',
+    'calculateCompletionRate',
+    'getEnrollmentByYear',
+    'getUniqueRegisteredStudents',
+    'getNewVsReturningByYear',
+    'getRecruitmentBySource',
+    'getRecruitmentEffectiveness',
+    'getOfferFunnel',
+    'getClassificationByProgramme',
+    'getAttendanceRiskOverview',
+    'getEducationSystemPerformance',
+    'getSankeyData',
+    'getSunburstData',
+    'getProgrammeComparison',
+    'getPassRateByCourse',
+    'getGradeBandByProgramme',
+    'getProficiencyByProgramme',
+    'getRetentionAttritionCounts',
+]
+
+# ============================================================================
+# JavaScript number semantics
+# ============================================================================
+
+_INT_PREFIX = re.compile(r'\s*([+-]?\d+)')
+_FLOAT_PREFIX = re.compile(r'\s*([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+
+
+def js_parse_int(value):
+    """parseInt(value): leading integer, or None for NaN"""
+    match = _INT_PREFIX.match(value or '')
+    return int(match.group(1)) if match else None
+
+
+def js_parse_float(value):
+    """parseFloat(value): leading decimal, or None for NaN"""
+    match = _FLOAT_PREFIX.match(value or '')
+    return float(match.group(1)) if match else None
+
+
+def to_fixed(value, digits):
+    """Number.prototype.toFixed: rounds the exact binary value half up"""
+    quantum = Decimal(1).scaleb(-digits)
+    return str(Decimal(value).quantize(quantum, rounding=ROUND_HALF_UP))
+
+
+def _field(row, *names):
+    """First non-empty column value, like `row['a '] || row['a'] || ''`"""
+    for name in names:
+        value = row.get(name)
+        if value:
+            return value
+    return ''
+
+
+# ============================================================================
+# DataLoader processors
+# ============================================================================
+
+def read_csv_rows(path):
+    """Parse a CSV the way DataLoader.loadCSV does (header row, skip empty lines)"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+
+def get_school(programme):
+    return PROGRAMME_TO_SCHOOL.get(programme, 'Other')
+
+
+def get_proficiency(ielts):
+    if ielts is None:
+        return 'Not Specified'
+    try:
+        float(ielts)
+    except ValueError:
+        return 'Not Specified'
+    score = js_parse_float(ielts)
+    if score is None:
+        return 'Not Specified'
+    for label, low, high in IELTS_BANDS:
+        if low <= score <= high:
+            return label
+    return 'Not Specified'
+
+
+def map_student_status(status):
+    if not status:
+        return 'Active'
+    if 'Graduated' in status:
+        return 'Graduated'
+    if 'Dropped' in status:
+        return 'Dropped'
+    if 'Suspended' in status:
+        return 'Suspended'
+    if status == 'Attending':
+        return 'Active'
+    if status in ('Rejected', 'Not Interested'):
+        return status
+    return 'Active'
+
+
+def process_admissions(rows, exclude_rejected=True):
+    results = []
+    for row in rows:
+        status = _field(row, 'Student Status').strip()
+        if exclude_rejected and status in EXCLUDED_STATUSES:
+            continue
+        programme = _field(row, 'Course/Degree').strip()
+        referral = _field(row, 'How did you hear about us ?', 'How did you hear about us?').strip()
+        offer_type = _field(row, 'Conditional/ Unconditional ', 'Conditional/ Unconditional').strip()
+        results.append({
+            'student_id': _field(row, 'Student_ID').strip(),
+            'gender': _field(row, 'Gender ', 'Gender').strip() or 'Unknown',
+            'nationality': _field(row, 'Nationality').strip(),
+            'entry_year': _field(row, 'Academic Year ', 'Academic Year').strip(),
+            'status': map_student_status(status),
+            'school': get_school(programme),
+            'programme': programme,
+            'entry_level': js_parse_int(row.get('Preferred Entry Level')) or 1,
+            'english_proficiency': get_proficiency(row.get('IELTS')),
+            'education_system': _field(row, 'Recent Education System').strip(),
+            'referral_source': referral if referral and referral not in REFERRAL_JUNK_VALUES else None,
+            'offer_type': offer_type or None,
+        })
+    return results
+
+
+def process_current_students(rows):
+    return [{
+        'student_id': _field(row, 'Student_ID').strip(),
+        'academic_year': _field(row, 'Academic_Year').strip(),
+        'prog_yr': js_parse_int(row.get('Prog_Yr')) or 0,
+        'programme': _field(row, 'Programme_Name').strip(),
+    } for row in rows]
+
+
+def process_course_results(rows):
+    results = []
+    for row in rows:
+        grade = _field(row, 'Overall_Grade').strip()
+        results.append({
+            'student_id': _field(row, 'Student_ID').strip(),
+            'academic_year': _field(row, 'Academic_Year').strip(),
+            'course_code': _field(row, 'Course_Code').strip(),
+            'overall_grade': grade,
+            'is_passed': grade in PASS_GRADES,
+        })
+    return results
+
+
+def process_attendance(rows):
+    return [{
+        'student_id': _field(row, 'Student_ID').strip(),
+        'academic_year': _field(row, 'Academic_Year').strip(),
+        'semester': _field(row, 'Semester').strip(),
+        'attendance_percentage': js_parse_float(row.get('Attendance_Percentage')) or 0,
+        'attendance_status': _field(row, 'Attendance_Status').strip(),
+    } for row in rows]
+
+
+def process_classifications(rows):
+    return [{
+        'student_id': _field(row, 'Student_ID').strip(),
+        'programme': _field(row, 'Programme').strip(),
+        'final_gpa': js_parse_float(row.get('Final_GPA')) or 0,
+        'classification': _field(row, 'Degree_Classification').strip(),
+        'graduation_status': _field(row, 'Graduation_Status').strip(),
+    } for row in rows]
+
+
+def load_tables(csv_files=CSV_FILES):
+    """Load and process the CSVs into DataLoader-shaped row lists"""
+    admissions = read_csv_rows(csv_files['admissions'])
+    tables = {
+        'allApplicants': process_admissions(admissions, False),
+        'students': process_admissions(admissions, True),
+        'currentStudents': process_current_students(read_csv_rows(csv_files['currentStudents'])),
+        'courseResults': process_course_results(read_csv_rows(csv_files['courseResults'])),
+        'attendance': process_attendance(read_csv_rows(csv_files['attendance'])),
+        'classifications': process_classifications(read_csv_rows(csv_files['classifications'])),
+    }
+    index = {s['student_id']: s for s in tables['students']}
+    tables['studentIndex'] = index
+    # Per-row admissions programme (DataLoader.studentIndex lookup), None if not admitted
+    for name in ('courseResults', 'attendance'):
+        for row in tables[name]:
+            student = index.get(row['student_id'])
+            row['student_programme'] = student['programme'] if student else None
+    tables['registeredIds'] = {cs['student_id'] for cs in tables['currentStudents']}
+    tables['graduatedIds'] = {c['student_id'] for c in tables['classifications']}
+    return tables
+
+
+# ============================================================================
+# DataStore
+# ============================================================================
+
+class DashboardAggregates:
+    """
+    Python port of the DataStore metric methods
+
+    `tables` holds the full DataLoader arrays; `filtered` the subset selected
+    by the active filters (DataStore.filtered).
+    """
+
+    def __init__(self, tables, filtered=None):
+        self.tables = tables
+        self.filtered = filtered or tables
+
+    # --- Filtering ---
+
+    @staticmethod
+    def filter_students(tables, year='', school='', programme='', gender=''):
+        """Student selection of DataStore.applyFilters for year/school/programme/gender"""
+        students = tables['students']
+        if year:
+            ids_in_year = {cs['student_id'] for cs in tables['currentStudents']
+                           if cs['academic_year'] == year}
+            students = [s for s in students if s['student_id'] in ids_in_year]
+        if school:
+            students = [s for s in students if s['school'] == school]
+        if programme:
+            students = [s for s in students if s['programme'] == programme]
+        if gender:
+            students = [s for s in students if s['gender'] == gender]
+        return students
+
+    @staticmethod
+    def filter_related(tables, students):
+        """Restrict the related datasets to the selected students"""
+        ids = {s['student_id'] for s in students}
+        filtered = {'students': students}
+        for name in ('currentStudents', 'courseResults', 'attendance', 'classifications'):
+            filtered[name] = [r for r in tables[name] if r['student_id'] in ids]
+        return filtered
+
+    # --- Dropdown values (always from the full data) ---
+
+    def academic_years(self):
+        return sorted({cs['academic_year'] for cs in self.tables['currentStudents'] if cs['academic_year']})
+
+    def schools(self):
+        return sorted({s['school'] for s in self.tables['students'] if s['school']})
+
+    def programmes(self, school=None):
+        return sorted({s['programme'] for s in self.tables['students']
+                       if s['programme'] and not (school and s['school'] != school)})
+
+    def genders(self):
+        return sorted({s['gender'] for s in self.tables['students'] if s['gender']})
+
+    def attendance_statuses(self):
+        return sorted({a['attendance_status'] for a in self.tables['attendance'] if a['attendance_status']})
+
+    def classification_values(self):
+        """Distinct classifications; getClassifications() orders them by CONFIG.classificationOrder"""
+        return sorted({c['classification'] for c in self.tables['classifications'] if c['classification']})
+
+    # --- Metrics ---
+
+    def calculateAverageGPA(self):
+        grads = [c['final_gpa'] for c in self.filtered['classifications'] if c['final_gpa'] > 0]
+        if not grads:
+            return 0
+        return to_fixed(sum(grads) / len(grads), 1)
+
+    def calculateAverageAttendance(self):
+        attendance = self.filtered['attendance']
+        if not attendance:
+            return 0
+        total = sum(a['attendance_percentage'] for a in attendance)
+        return to_fixed(total / len(attendance), 1)
+
+    def calculatePassRate(self):
+        results = self.filtered['courseResults']
+        if not results:
+            return 0
+        passed = sum(1 for g in results if g['is_passed'])
+        return to_fixed((passed / len(results)) * 100, 1)
+
+    def _eligible_start_year(self):
+        years = self.academic_years()
+        if len(years) < 4:
+            return None
+        return js_parse_int(years[-1].split('/')[0])
+
+    def calculateCompletionRate(self):
+        latest_start = self._eligible_start_year()
+        if latest_start is None:
+            return 0
+        eligible_ids = set()
+        eligible = 0
+        for s in self.filtered['students']:
+            entry_start = js_parse_int((s['entry_year'] or '').split('/')[0])
+            if entry_start is not None and latest_start - entry_start >= 4:
+                eligible += 1
+                eligible_ids.add(s['student_id'])
+        if eligible == 0:
+            return 0
+        completed = sum(1 for c in self.filtered['classifications'] if c['student_id'] in eligible_ids)
+        return to_fixed((completed / eligible) * 100, 1)
+
+    def getEnrollmentByYear(self):
+        year_ids = {}
+        for cs in self.filtered['currentStudents']:
+            year_ids.setdefault(cs['academic_year'], set()).add(cs['student_id'])
+        return {year: len(ids) for year, ids in year_ids.items()}
+
+    def getUniqueRegisteredStudents(self):
+        return len({cs['student_id'] for cs in self.filtered['currentStudents']})
+
+    def getNewVsReturningByYear(self):
+        current = self.filtered['currentStudents']
+        years = sorted({cs['academic_year'] for cs in current})
+        by_year = {year: set() for year in years}
+        for cs in current:
+            by_year[cs['academic_year']].add(cs['student_id'])
+
+        result = []
+        seen = set()
+        for year in years:
+            ids = by_year[year]
+            new = len(ids - seen)
+            result.append({'year': year, 'total': len(ids), 'new': new, 'returning': len(ids) - new})
+            seen |= ids
+        return result
+
+    def _management_applicants(self):
+        students = self.filtered['students']
+        if not len(students) < len(self.tables['students']):
+            return self.tables['allApplicants']
+        schools = {s['school'] for s in students}
+        programmes = {s['programme'] for s in students}
+        return [a for a in self.tables['allApplicants']
+                if a['school'] in schools and a['programme'] in programmes]
+
+    def _registered_and_graduated_ids(self):
+        return self.tables['registeredIds'], self.tables['graduatedIds']
+
+    def getRecruitmentBySource(self):
+        counts = {}
+        for a in self._management_applicants():
+            if not a['referral_source']:
+                continue
+            merged = REFERRAL_MERGE.get(a['referral_source'], a['referral_source'])
+            counts[merged] = counts.get(merged, 0) + 1
+        ranked = sorted(counts.items(), key=lambda item: -item[1])
+        return [{'source': source, 'count': count} for source, count in ranked]
+
+    def getRecruitmentEffectiveness(self):
+        registered_ids, class_ids = self._registered_and_graduated_ids()
+        stats = {}
+        for a in self._management_applicants():
+            if not a['referral_source']:
+                continue
+            merged = REFERRAL_MERGE.get(a['referral_source'], a['referral_source'])
+            s = stats.setdefault(merged, {'total': 0, 'registered': 0, 'graduated': 0,
+                                          'dropped': 0, 'rejected': 0, 'notInterested': 0})
+            s['total'] += 1
+            if a['status'] == 'Rejected':
+                s['rejected'] += 1
+            elif a['status'] == 'Not Interested':
+                s['notInterested'] += 1
+            else:
+                if a['student_id'] in registered_ids:
+                    s['registered'] += 1
+                if a['student_id'] in class_ids:
+                    s['graduated'] += 1
+                elif a['status'] == 'Dropped':
+                    s['dropped'] += 1
+        ranked = sorted(stats.items(), key=lambda item: -item[1]['total'])
+        return [{'source': source, **data} for source, data in ranked]
+
+    def getOfferFunnel(self):
+        registered_ids, class_ids = self._registered_and_graduated_ids()
+        f = dict.fromkeys(['total', 'rejected', 'notInterested', 'conditional', 'unconditional',
+                           'registered', 'graduated', 'dropped'], 0)
+        for a in self._management_applicants():
+            f['total'] += 1
+            if a['status'] == 'Rejected':
+                f['rejected'] += 1
+                continue
+            if a['status'] == 'Not Interested':
+                f['notInterested'] += 1
+                continue
+            if a['offer_type'] == 'Conditional':
+                f['conditional'] += 1
+            if a['offer_type'] == 'Unconditional':
+                f['unconditional'] += 1
+            if a['student_id'] in registered_ids:
+                f['registered'] += 1
+            if a['student_id'] in class_ids:
+                f['graduated'] += 1
+            elif a['status'] == 'Dropped':
+                f['dropped'] += 1
+        return {
+            'total': f['total'],
+            'rejected': f['rejected'],
+            'notInterested': f['notInterested'],
+            'offersGiven': f['conditional'] + f['unconditional'],
+            'conditional': f['conditional'],
+            'unconditional': f['unconditional'],
+            'registered': f['registered'],
+            'graduated': f['graduated'],
+            'dropped': f['dropped'],
+        }
+
+    def getClassificationByProgramme(self):
+        bands = ['First', 'Upper Second', 'Lower Second', 'Third', 'Fail']
+        prog_counts = {}
+        for c in self.filtered['classifications']:
+            band = CLASSIFICATION_BANDS.get(c['classification'], 'Other')
+            counts = prog_counts.setdefault(c['programme'], dict.fromkeys(bands, 0))
+            counts[band] = counts.get(band, 0) + 1
+        return {'programmes': sorted(prog_counts), 'bands': bands, 'data': prog_counts}
+
+    def getAttendanceRiskOverview(self):
+        latest = {}
+        for a in self.filtered['attendance']:
+            existing = latest.get(a['student_id'])
+            if (existing is None or a['academic_year'] > existing['academic_year'] or
+                    (a['academic_year'] == existing['academic_year'] and a['semester'] > existing['semester'])):
+                latest[a['student_id']] = a
+        counts = {}
+        for a in latest.values():
+            status = a['attendance_status'] or 'Unknown'
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def getEducationSystemPerformance(self):
+        systems = {}
+        for s in self.filtered['students']:
+            if s['education_system']:
+                systems[s['education_system']] = systems.get(s['education_system'], 0) + 1
+        ranked = sorted(systems.items(), key=lambda item: -item[1])
+        return [{'system': system, 'count': count} for system, count in ranked]
+
+    def getSankeyData(self):
+        _, class_ids = self._registered_and_graduated_ids()
+        rejected = not_interested = registered = graduated = dropped = active = 0
+        for a in self._management_applicants():
+            if a['status'] == 'Rejected':
+                rejected += 1
+                continue
+            if a['status'] == 'Not Interested':
+                not_interested += 1
+                continue
+            registered += 1
+            if a['student_id'] in class_ids:
+                graduated += 1
+            elif a['status'] == 'Dropped':
+                dropped += 1
+            else:
+                active += 1
+        return {
+            'nodes': ['Applicants', 'Rejected', 'Not Interested', 'Registered', 'Graduated', 'Dropped', 'Active'],
+            'links': {
+                'source': [0, 0, 0, 3, 3, 3],
+                'target': [1, 2, 3, 4, 5, 6],
+                'value': [rejected, not_interested, registered, graduated, dropped, active],
+            },
+        }
+
+    def getSunburstData(self):
+        index = self.tables['studentIndex']
+        tree = {}
+        grand_total = 0
+        for c in self.filtered['classifications']:
+            if c['graduation_status'] != 'Graduated':
+                continue
+            student = index.get(c['student_id'])
+            if student is None:
+                continue
+            school = student['school'] or 'Unknown'
+            prog = student['programme'] or 'Unknown'
+            cls = c['classification'] or 'Unknown'
+            counts = tree.setdefault(school, {}).setdefault(prog, {})
+            counts[cls] = counts.get(cls, 0) + 1
+            grand_total += 1
+
+        out = {'ids': [], 'labels': [], 'parents': [], 'values': []}
+        if grand_total == 0:
+            return out
+
+        def add(node_id, label, parent, value):
+            out['ids'].append(node_id)
+            out['labels'].append(label)
+            out['parents'].append(parent)
+            out['values'].append(value)
+
+        add('root', 'All Graduates', '', grand_total)
+        for school in sorted(tree):
+            school_id = 'S_' + school
+            add(school_id, school, 'root', sum(sum(p.values()) for p in tree[school].values()))
+            for prog in sorted(tree[school]):
+                prog_id = school_id + '_P_' + prog
+                add(prog_id, PROGRAMME_ABBREVIATIONS.get(prog) or prog, school_id,
+                    sum(tree[school][prog].values()))
+                for cls in sorted(tree[school][prog]):
+                    add(prog_id + '_C_' + cls, cls, prog_id, tree[school][prog][cls])
+        return out
+
+    def getProgrammeComparison(self):
+        latest_start = self._eligible_start_year()
+        stats = {}
+
+        def entry(prog):
+            s = stats.get(prog)
+            if s is None:
+                s = stats[prog] = {'gpaSum': 0, 'gpaCount': 0, 'passed': 0, 'totalResults': 0,
+                                   'eligible': 0, 'completed': 0, 'attSum': 0, 'attCount': 0}
+            return s
+
+        for c in self.filtered['classifications']:
+            s = entry(c['programme'])
+            s['gpaSum'] += c['final_gpa']
+            s['gpaCount'] += 1
+
+        for g in self.filtered['courseResults']:
+            prog = g['student_programme']
+            if prog is None:
+                continue
+            s = entry(prog)
+            s['totalResults'] += 1
+            if g['is_passed']:
+                s['passed'] += 1
+
+        if latest_start:
+            eligible_ids = set()
+            for st in self.filtered['students']:
+                entry_start = js_parse_int((st['entry_year'] or '').split('/')[0])
+                if entry_start is None or latest_start - entry_start < 4:
+                    continue
+                entry(st['programme'])['eligible'] += 1
+                eligible_ids.add(st['student_id'])
+            for c in self.filtered['classifications']:
+                if c['programme'] in stats and c['student_id'] in eligible_ids:
+                    stats[c['programme']]['completed'] += 1
+
+        for a in self.filtered['attendance']:
+            s = stats.get(a['student_programme'])
+            if s is None:
+                continue
+            s['attSum'] += a['attendance_percentage']
+            s['attCount'] += 1
+
+        def ratio(num, den, scale=1):
+            return float(to_fixed((num / den) * scale, 1)) if den > 0 else 0
+
+        programmes = sorted(stats)
+        return {
+            'programmes': programmes,
+            'avgGPA': [ratio(stats[p]['gpaSum'], stats[p]['gpaCount']) for p in programmes],
+            'passRate': [ratio(stats[p]['passed'], stats[p]['totalResults'], 100) for p in programmes],
+            'completionRate': [ratio(stats[p]['completed'], stats[p]['eligible'], 100) for p in programmes],
+            'avgAttendance': [ratio(stats[p]['attSum'], stats[p]['attCount']) for p in programmes],
+        }
+
+    def getPassRateByCourse(self):
+        stats = {}
+        for g in self.filtered['courseResults']:
+            s = stats.get(g['course_code'])
+            if s is None:
+                s = stats[g['course_code']] = {'passed': 0, 'failed': 0, 'total': 0}
+            s['total'] += 1
+            if g['is_passed']:
+                s['passed'] += 1
+            else:
+                s['failed'] += 1
+        rows = [{
+            'course': course,
+            'passed': s['passed'],
+            'failed': s['failed'],
+            'total': s['total'],
+            'passRate': float(to_fixed((s['passed'] / s['total']) * 100, 1)) if s['total'] > 0 else 0,
+        } for course, s in stats.items()]
+        return sorted(rows, key=lambda r: r['passRate'])
+
+    def getGradeBandByProgramme(self):
+        bands = list(GRADE_BANDS)
+        grade_band = {grade: band for band, grades in GRADE_BANDS.items() for grade in grades}
+        prog_counts = {}
+        for g in self.filtered['courseResults']:
+            prog = g['student_programme']
+            if prog is None:
+                continue
+            counts = prog_counts.get(prog)
+            if counts is None:
+                counts = prog_counts[prog] = dict.fromkeys(bands, 0)
+            band = grade_band.get(g['overall_grade'])
+            if band:
+                counts[band] += 1
+        return {'programmes': sorted(prog_counts), 'bands': bands, 'data': prog_counts}
+
+    def getProficiencyByProgramme(self):
+        prog_prof = {}
+        levels = []
+        for s in self.filtered['students']:
+            level = s['english_proficiency']
+            if level and level not in levels:
+                levels.append(level)
+            if not level:
+                continue
+            counts = prog_prof.setdefault(s['programme'], {})
+            counts[level] = counts.get(level, 0) + 1
+        order = {level: i for i, level in enumerate(PROFICIENCY_ORDER)}
+        levels.sort(key=lambda level: order.get(level, 99))
+        return {'programmes': sorted(prog_prof), 'levels': levels, 'data': prog_prof}
+
+    def getRetentionAttritionCounts(self):
+        class_ids = {c['student_id'] for c in self.filtered['classifications']}
+        result = {p: {'retained': 0, 'dropped': 0, 'active': 0, 'total': 0} for p in self.programmes()}
+        for s in self.filtered['students']:
+            counts = result.get(s['programme'])
+            if counts is None:
+                continue
+            counts['total'] += 1
+            if s['status'] == 'Dropped':
+                counts['dropped'] += 1
+            elif s['student_id'] in class_ids:
+                counts['retained'] += 1
+            else:
+                counts['active'] += 1
+        return result
+
+    def compute(self, methods=CUBE_METHODS):
+        return {name: getattr(self, name)() for name in methods}
+
+
+# ============================================================================
+# Aggregate cube
+# ============================================================================
+
+def cube_key(year='', school='', programme='', gender=''):
+    """Cell key used by js/standalone/aggregateCube.js"""
+    return '|'.join([year, school, programme, gender])
+
+
+def build_cube(tables=None):
+    """
+    Precompute CUBE_METHODS for every year x school x programme x gender cell
+
+    Returns:
+        dict: {"methods": [...], "index": {key: cell}, "cells": [results]}
+    """
+    tables = tables or load_tables()
+    base = DashboardAggregates(tables)
+
+    index = {}
+    cells = []
+    cell_by_students = {}
+    for year in [''] + base.academic_years():
+        for school in [''] + base.schools():
+            # The programme dropdown lists every programme until a school is picked
+            for programme in [''] + base.programmes(school or None):
+                for gender in [''] + base.genders():
+                    students = DashboardAggregates.filter_students(tables, year, school, programme, gender)
+                    # Cells selecting the same students have identical results
+                    ids = tuple(s['student_id'] for s in students)
+                    if ids not in cell_by_students:
+                        cell_by_students[ids] = len(cells)
+                        filtered = DashboardAggregates.filter_related(tables, students)
+                        cells.append(DashboardAggregates(tables, filtered).compute())
+                    index[cube_key(year, school, programme, gender)] = cell_by_students[ids]
+
+    return {'methods': CUBE_METHODS, 'index': index, 'cells': cells}
+
+
+def main():
+    import time
+    start = time.perf_counter()
+    cube = build_cube()
+    elapsed = time.perf_counter() - start
+    payload = json.dumps(cube, separators=(',', ':'))
+    print(f"Cube: {len(cube['index'])} filter combinations, {len(cube['cells'])} distinct cells, "
+          f"{len(payload) / 1024:.0f} KB JSON, built in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Per-course attendance statistics for every academic year.
+
+By default the attendance file is loaded whole. With --chunk-size it is
+streamed that many rows at a time instead, and each chunk's partial
+aggregates (record and session counts, percentage sums, minimum, maximum
+and status counts) are merged into a running total, so memory is bounded by
+the chunk size and the number of courses rather than by the file size.
+Percentages are summed as integer hundredths, which makes the merge exact:
+both modes write identical output.
+
+Usage:
+  python scripts/attendance_stats.py [--chunk-size ROWS] [--output PATH]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+from datasets import iter_chunks, load_dataset
+
+KEYS = ["Academic_Year", "Course_Code"]
+COLUMNS = KEYS + ["Total_Sessions", "Sessions_Attended", "Attendance_Percentage", "Attendance_Status"]
+# Attendance_Status values written by data_generator.py
+STATUSES = ["Good", "Warning", "Concern"]
+
+# How each partial aggregate column is merged
+MERGE = {
+    "records": "sum",
+    "total_sessions": "sum",
+    "sessions_attended": "sum",
+    "percentage_hundredths": "sum",
+    "min_percentage": "min",
+    "max_percentage": "max",
+    **{f"{status.lower()}_count": "sum" for status in STATUSES},
+}
+
+
+def partial_stats(df):
+    """Mergeable per-course aggregates of some attendance rows"""
+    frame = pd.DataFrame({
+        "Academic_Year": df["Academic_Year"].astype(str).to_numpy(),
+        "Course_Code": df["Course_Code"].astype(str).to_numpy(),
+        "records": 1,
+        "total_sessions": df["Total_Sessions"].to_numpy(np.int64),
+        "sessions_attended": df["Sessions_Attended"].to_numpy(np.int64),
+        "percentage_hundredths": np.rint(df["Attendance_Percentage"].to_numpy() * 100).astype(np.int64),
+        "min_percentage": df["Attendance_Percentage"].to_numpy(),
+        "max_percentage": df["Attendance_Percentage"].to_numpy(),
+    })
+    status = df["Attendance_Status"].astype(str).to_numpy()
+    for name in STATUSES:
+        frame[f"{name.lower()}_count"] = (status == name).astype(np.int64)
+    return frame.groupby(KEYS, sort=False).agg(MERGE)
+
+
+def merge_stats(*partials):
+    return pd.concat(partials).groupby(level=KEYS, sort=False).agg(MERGE)
+
+
+def finish_stats(stats):
+    """Derive averages and rates from merged aggregates, sorted by year and course"""
+    stats = stats.sort_index()
+    out = pd.DataFrame(index=stats.index)
+    out["records"] = stats["records"]
+    out["avg_attendance"] = (stats["percentage_hundredths"] / stats["records"] / 100).round(2)
+    out["min_attendance"] = stats["min_percentage"]
+    out["max_attendance"] = stats["max_percentage"]
+    out["session_rate"] = (stats["sessions_attended"] * 100 / stats["total_sessions"]).round(2)
+    for name in STATUSES:
+        out[f"{name.lower()}_count"] = stats[f"{name.lower()}_count"]
+    return out.reset_index()
+
+
+def course_attendance_stats(chunksize=None):
+    """
+    Per academic year and course attendance statistics
+
+    Returns:
+        DataFrame: one row per (Academic_Year, Course_Code)
+    """
+    if chunksize is None:
+        with instrumentation.stage("load_attendance") as load:
+            df = load_dataset("attendance")
+            load.add_rows(len(df))
+        with instrumentation.stage("aggregate") as stage:
+            stats = partial_stats(df)
+            stage.add_rows(len(df))
+        return finish_stats(stats)
+
+    stats = None
+    read = instrumentation.Stage("read_chunks", chunksize=chunksize)
+    merge = instrumentation.Stage("aggregate")
+    for chunk in read.iter(iter_chunks("attendance", chunksize, COLUMNS)):
+        with merge:
+            partial = partial_stats(chunk)
+            stats = partial if stats is None else merge_stats(stats, partial)
+        read.add_rows(len(chunk))
+        merge.add_rows(len(chunk))
+    read.emit()
+    merge.emit()
+    return finish_stats(stats)
+
+
+def print_stats(stats):
+    print("=" * 92)
+    print("Attendance by course")
+    print("=" * 92)
+    print(f"{'Year':<9}{'Course':<9}{'Records':>9}{'Avg %':>8}{'Min %':>8}{'Max %':>8}"
+          f"{'Sessions %':>12}{'Good':>8}{'Warning':>9}{'Concern':>9}")
+    for row in stats.itertuples(index=False):
+        print(f"{row.Academic_Year:<9}{row.Course_Code:<9}{row.records:>9,}{row.avg_attendance:>8.2f}"
+              f"{row.min_attendance:>8.1f}{row.max_attendance:>8.1f}{row.session_rate:>12.2f}"
+              f"{row.good_count:>8,}{row.warning_count:>9,}{row.concern_count:>9,}")
+    print("=" * 92)
+    print(f"{len(stats)} year/course groups, {stats['records'].sum():,} attendance records")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, metavar="ROWS",
+                        help="stream the attendance file ROWS rows at a time")
+    parser.add_argument("--output", metavar="PATH",
+                        help="write the statistics as CSV to PATH instead of printing them")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumentation.session("attendance_stats", args):
+        stats = course_attendance_stats(args.chunk_size)
+        if args.output:
+            stats.to_csv(args.output, index=False)
+            print(f"Wrote {len(stats)} rows to {args.output}")
+        else:
+            print_stats(stats)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Peak memory of the in-memory vs chunked (--chunk-size) paths of
+verify_gpa.py --all and attendance_stats.py as the data grows.
+
+Each scale runs in a temporary copy of scripts/ with every data/*.csv
+replicated under offset Student_IDs (see benchmark_pipeline.py). Both paths
+must produce the same output; the chunked path's peak RSS should stay
+roughly flat while the in-memory path's grows with the file size.
+
+Usage:
+  python scripts/benchmark_chunked.py [--scales 1 10 50] [--chunk-size 100000]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmark_pipeline import DATA_FILES, PROJECT_ROOT, id_span, scale_csv
+from benchmark_utils import python_script, run_measured
+
+# Name -> (script and arguments, dataset whose rows are reported)
+JOBS = {
+    "verify_gpa": (["verify_gpa.py", "--all"], "courseResults"),
+    "attendance_stats": (["attendance_stats.py"], "attendance"),
+}
+
+
+def comparable(stdout):
+    """Output with the timing line dropped"""
+    return [line for line in stdout.splitlines() if not line.startswith("Time:")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    span = id_span()
+    results = []
+    for factor in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            shutil.copytree(PROJECT_ROOT / "scripts", root / "scripts",
+                            ignore=shutil.ignore_patterns("__pycache__"))
+            rows = {key: scale_csv(PROJECT_ROOT / "data" / file, root / "data" / file, factor, span)
+                    for key, file in DATA_FILES.items()}
+            for job, (command, dataset) in JOBS.items():
+                script, *job_args = command
+                runs = {}
+                for mode, extra in (("in-memory", []), ("chunked", ["--chunk-size", args.chunk_size])):
+                    runs[mode] = run_measured(
+                        python_script(root / "scripts" / script, *job_args, *extra),
+                        cwd=root, capture=True)
+                    if runs[mode]["returncode"] not in (0, 1):
+                        sys.exit(f"{job} ({mode}) failed at {factor}x")
+                if comparable(runs["in-memory"]["stdout"]) != comparable(runs["chunked"]["stdout"]):
+                    sys.exit(f"{job}: chunked output differs from in-memory at {factor}x")
+                results.append((factor, job, rows[dataset], runs["in-memory"], runs["chunked"]))
+
+    print("=" * 86)
+    print(f"In-memory vs chunked processing (chunk size {args.chunk_size:,} rows)")
+    print("=" * 86)
+    print(f"{'Scale':>5}  {'Job':<18}{'Rows':>11}{'In-memory MB':>14}{'Chunked MB':>12}"
+          f"{'In-memory s':>13}{'Chunked s':>11}")
+    for factor, job, n, full, chunked in results:
+        print(f"{factor:>4}x  {job:<18}{n:>11,}{full['peak_rss_mb']:>14.1f}{chunked['peak_rss_mb']:>12.1f}"
+              f"{full['wall_s']:>13.2f}{chunked['wall_s']:>11.2f}")
+    print("=" * 86)
+    print("Outputs identical at every scale.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Load-time and memory benchmark: pd.read_csv vs the Parquet columnar store.
+
+Each load runs in a fresh child process. Peak RSS is reported above a
+baseline child that only imports pandas and pyarrow. Run
+`python scripts/datasets.py convert` first.
+
+Usage:
+  python scripts/benchmark_columnar.py [--repeat 3] [dataset ...]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from benchmark_utils import python_script, run_measured
+
+SCRIPT = Path(__file__).resolve()
+
+
+def child(mode, name):
+    """Load one dataset in this process and print the timing as JSON."""
+    import pandas as pd
+    import datasets
+
+    start = time.perf_counter()
+    if mode == "csv":
+        df = pd.read_csv(datasets.csv_path(name))
+    elif mode == "columnar":
+        df = pd.read_parquet(datasets.columnar_path(name))
+    else:  # baseline: imports only
+        df = pd.DataFrame()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"load_s": elapsed, "rows": len(df),
+                      "frame_mb": df.memory_usage(deep=True).sum() / (1024 * 1024)}))
+
+
+def measure(mode, name, repeat):
+    runs = []
+    for _ in range(repeat):
+        r = run_measured(python_script(SCRIPT, "--child", mode, name), capture=True)
+        if r["returncode"] != 0:
+            sys.exit(f"{mode} load of {name} failed (exit {r['returncode']})")
+        runs.append(dict(json.loads(r["stdout"]), peak_rss_mb=r["peak_rss_mb"]))
+    return {
+        "load_s": statistics.median(x["load_s"] for x in runs),
+        "peak_rss_mb": statistics.median(x["peak_rss_mb"] for x in runs),
+        "frame_mb": runs[0]["frame_mb"],
+        "rows": runs[0]["rows"],
+    }
+
+
+def main():
+    import datasets
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("datasets", nargs="*", metavar="dataset")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "DATASET"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    names = args.datasets or list(datasets.DATASETS)
+    missing = [n for n in names if not datasets.columnar_is_fresh(n)]
+    if missing:
+        sys.exit(f"Columnar copies missing or stale for: {', '.join(missing)}\n"
+                 f"Run: python scripts/datasets.py convert")
+
+    baseline = measure("baseline", names[0], args.repeat)["peak_rss_mb"]
+
+    print("=" * 96)
+    print(f"Columnar vs CSV load (median of {args.repeat}, RSS above {baseline:.0f} MB import baseline)")
+    print("=" * 96)
+    print(f"{'Dataset':<16}{'Rows':>8}{'CSV s':>9}{'Parquet s':>11}{'Speedup':>9}"
+          f"{'CSV RSS':>10}{'PQ RSS':>9}{'CSV frame':>11}{'PQ frame':>10}")
+    for name in names:
+        c = measure("csv", name, args.repeat)
+        p = measure("columnar", name, args.repeat)
+        print(f"{name:<16}{c['rows']:>8,}{c['load_s']:>9.3f}{p['load_s']:>11.3f}"
+              f"{c['load_s'] / p['load_s']:>8.1f}x"
+              f"{c['peak_rss_mb'] - baseline:>9.1f}M{p['peak_rss_mb'] - baseline:>8.1f}M"
+              f"{c['frame_mb']:>10.1f}M{p['frame_mb']:>9.1f}M")
+    print("=" * 96)
+
+
+if __name__ == "__main__":
+    main()
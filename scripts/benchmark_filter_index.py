@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Check the build-time filter index against the scanning applyFilters path.
+
+Every single-filter value, a seeded sample of multi-filter combinations,
+search strings and GPA ranges is applied twice: through the index
+(filter_index.apply_index, the Python rendering of js/standalone/filterIndex.js)
+and through filter_index.apply_brute_force (a port of the scanning
+DataStore.applyFilters). The selected row positions must be identical in
+students and every related table. The timing of both paths is reported.
+
+Usage:
+  python scripts/benchmark_filter_index.py [--combinations 200] [--seed 42]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from filter_index import (RELATED_DIMENSIONS, RELATED_TABLES, STUDENT_DIMENSIONS, apply_brute_force,
+                          apply_index, build_filter_index, load_index_tables)
+
+
+def filter_cases(index, tables, combinations, seed):
+    """Single filters, random combinations, searches and GPA ranges"""
+    values = {dimension: list(index["bitsets"][dimension])
+              for dimension in [*STUDENT_DIMENSIONS, *RELATED_DIMENSIONS]}
+    cases = [{}]
+    for dimension, options in values.items():
+        cases += [{dimension: value} for value in options]
+    cases += [{"entryLevel": "9"}, {"year": "1999/00"}, {"school": "Nowhere"}]
+
+    rng = random.Random(seed)
+    for _ in range(combinations):
+        picked = rng.sample(list(values), rng.randint(2, 4))
+        cases.append({dimension: rng.choice(values[dimension]) for dimension in picked})
+    ids = [s["student_id"] for s in tables["students"]]
+    cases += [{"search": rng.choice(ids)[-4:]} for _ in range(5)]
+    cases += [{"search": "zzz-no-match"}, {"search": "1", "year": rng.choice(values["year"])}]
+    cases += [{"gpaMin": 15, "gpaMax": 22}, {"gpaMin": 0, "gpaMax": 9.99}, {"gpaMin": "17.5"},
+              {"gpaMax": 12}, {"gpaMin": 18, "gpaMax": 10}, {"gpaMin": "abc"},
+              {"gpaMin": 12, "gpaMax": 18, "school": rng.choice(values["school"])}]
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--combinations", type=int, default=200,
+                        help="random multi-filter combinations to check (default 200)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    tables = load_index_tables()
+    start = time.perf_counter()
+    index = build_filter_index(tables)
+    build_s = time.perf_counter() - start
+    cases = filter_cases(index, tables, args.combinations, args.seed)
+
+    timings = {"index": 0.0, "brute force": 0.0}
+    mismatches = []
+    for filters in cases:
+        start = time.perf_counter()
+        fast = apply_index(index, tables, filters)
+        timings["index"] += time.perf_counter() - start
+        start = time.perf_counter()
+        slow = apply_brute_force(tables, filters)
+        timings["brute force"] += time.perf_counter() - start
+        for table in ["students", *RELATED_TABLES]:
+            if fast[table].tolist() != slow[table].tolist():
+                mismatches.append((filters, table, len(fast[table]), len(slow[table])))
+
+    print("=" * 72)
+    print(f"Filter index vs brute-force applyFilters ({len(cases)} filter sets)")
+    print("=" * 72)
+    print(f"Index built in {build_s:.2f}s over {index['students']:,} students")
+    for path, seconds in timings.items():
+        print(f"{path:<12} {seconds:>8.3f}s total  {seconds / len(cases) * 1000:>8.2f} ms per filter set")
+    print(f"Speed-up: {timings['brute force'] / timings['index']:.1f}x")
+    print("=" * 72)
+    for filters, table, fast_rows, slow_rows in mismatches[:10]:
+        print(f"MISMATCH {filters} {table}: index {fast_rows:,} rows, brute force {slow_rows:,}")
+    if mismatches:
+        print(f"{len(mismatches)} mismatches")
+        return 1
+    print("All filter sets select identical rows in every table.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Peak-memory benchmark for data_generator.py streaming output.
+
+Runs the generator at 1x, 10x and 100x the current cohort in separate child
+processes and checks that peak RSS in --stream mode stays flat as the cohort
+grows. Exits non-zero if the largest run exceeds the 1x peak by more than the
+allowed ratio, or, with --buffered, if a stream run takes more than the allowed
+multiple of the buffered run's wall time at the same scale.
+
+Usage:
+  python scripts/benchmark_generator_memory.py [--scales 1 10 100] [--buffered]
+                                               [--max-wall-ratio 2.0]
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmark_utils import python_script, run_measured
+
+SCRIPTS = Path(__file__).resolve().parent
+GENERATOR = SCRIPTS / "data_generator.py"
+
+
+def measure(scale, stream, workdir, extra_args):
+    args = ["--scale", scale, "--output-dir", Path(workdir) / f"x{scale}", *extra_args]
+    if stream:
+        args.append("--stream")
+    result = run_measured(python_script(GENERATOR, *args))
+    if result["returncode"] != 0:
+        sys.exit(f"data_generator.py failed at scale {scale} (exit {result['returncode']})")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--max-ratio", type=float, default=1.5,
+                        help="allowed peak RSS growth from smallest to largest scale")
+    parser.add_argument("--buffered", action="store_true",
+                        help="also measure the default (non-streaming) mode for comparison")
+    parser.add_argument("--max-wall-ratio", type=float, default=2.0,
+                        help="allowed stream / buffered wall time at each scale (with --buffered)")
+    parser.add_argument("--engine", choices=["vectorized", "legacy"], default="vectorized")
+    args = parser.parse_args()
+
+    modes = [("stream", True)] + ([("buffered", False)] if args.buffered else [])
+    extra = ["--engine", args.engine]
+
+    print("=" * 80)
+    print(f"Generator peak memory ({args.engine} engine)")
+    print("=" * 80)
+    print(f"{'Mode':<10}{'Scale':>8}{'Wall (s)':>12}{'s per 1x':>10}{'Peak RSS (MB)':>16}")
+
+    peaks = {}
+    walls = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode, stream in modes:
+            for scale in args.scales:
+                r = measure(scale, stream, workdir, extra)
+                peaks[(mode, scale)] = r["peak_rss_mb"]
+                walls[(mode, scale)] = r["wall_s"]
+                print(f"{mode:<10}{scale:>7}x{r['wall_s']:>12.2f}{r['wall_s'] / scale:>10.2f}"
+                      f"{r['peak_rss_mb']:>16.1f}")
+
+    smallest, largest = min(args.scales), max(args.scales)
+    ratio = peaks[("stream", largest)] / peaks[("stream", smallest)]
+    print("=" * 80)
+    print(f"Stream peak RSS {largest}x / {smallest}x: {ratio:.2f} (limit {args.max_ratio:.2f})")
+    ok = ratio <= args.max_ratio
+    if args.buffered:
+        for scale in args.scales:
+            wall_ratio = walls[("stream", scale)] / walls[("buffered", scale)]
+            print(f"Stream / buffered wall at {scale}x: {wall_ratio:.2f} (limit {args.max_wall_ratio:.2f})")
+            ok = ok and wall_ratio <= args.max_wall_ratio
+    print("✓ PASS" if ok else "✗ FAIL")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
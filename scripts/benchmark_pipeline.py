@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the data pipeline at 1x/10x/100x data volume.
+
+For each scale a throwaway copy of the project is created in a temporary
+directory, with every data/*.csv and generated_data/ report replicated under
+offset Student_IDs. Each stage then runs there in a fresh child process:
+
+  generate      data_generator.py --scale N --stream
+  combine       combine_course_results.py
+  verify_gpa    verify_gpa.py --all
+  verify_prog   verify_programme_courses.py --all
+  build         build_standalone.py --force (build_standalone.build())
+  sqlite_load   sqlite_backend.py load
+  sql_queries   sqlite_backend.py query (every dashboard query, views included)
+
+Wall time, peak RSS and rows per second are appended as one JSON line per
+stage and scale to the history file, together with the git commit, and each
+result is compared with the previous entry for the same stage and scale.
+
+Usage:
+  python scripts/benchmark_pipeline.py [--scales 1 10 100] [--stages build sql_queries]
+                                       [--history PATH] [--threshold 0.2] [--fail-on-regression]
+"""
+
+import argparse
+import csv
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmark_utils import python_script, run_measured
+from datasets import DATASETS
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HISTORY_FILE = PROJECT_ROOT / "benchmarks" / "pipeline_history.jsonl"
+
+# Copied into each scaled project; data/ and generated_data/ are written scaled
+PROJECT_FILES = ["scripts", "js", "css", "database", "index.html"]
+
+DATA_FILES = {name: spec["file"] for name, spec in DATASETS.items()}
+
+# Stage -> (script and arguments, datasets whose rows measure its throughput)
+# verify_* exit 1 when they find mismatches, which is a result, not a failure
+STAGES = {
+    "generate": (["data_generator.py", "--stream", "--output-dir", "Generated_Data"], ["enrollments"]),
+    "combine": (["combine_course_results.py"], ["courseResults"]),
+    "verify_gpa": (["verify_gpa.py", "--all"], ["courseResults", "enrollments"]),
+    "verify_prog": (["verify_programme_courses.py", "--all"], ["enrollments"]),
+    "build": (["build_standalone.py", "--force"], list(DATA_FILES)),
+    "sqlite_load": (["sqlite_backend.py", "load"], [k for k in DATA_FILES if k != "admissions"]),
+    "sql_queries": (["sqlite_backend.py", "query", "--repeat", "1"], [k for k in DATA_FILES if k != "admissions"]),
+}
+ALLOWED_EXIT = {"verify_gpa": {0, 1}, "verify_prog": {0, 1}}
+
+# Stages whose output another stage reads; run untimed when not selected
+PREREQUISITES = {"sql_queries": "sqlite_load"}
+
+
+# ============================================================================
+# Scaled project copies
+# ============================================================================
+
+def id_span():
+    """Power of ten above the Student_ID range, so copy k can add k * span"""
+    ids = []
+    for name in ("admissions", "currentStudents"):
+        with open(PROJECT_ROOT / "data" / DATA_FILES[name], newline="", encoding="utf-8-sig") as f:
+            ids.extend(int(row["Student_ID"]) for row in csv.DictReader(f) if row["Student_ID"])
+    span = 10
+    while span <= max(ids) - min(ids):
+        span *= 10
+    return span
+
+
+def scale_csv(src, dst, factor, span):
+    """
+    Write factor copies of a CSV's rows, offsetting Student_ID by k * span
+
+    Returns:
+        int: data rows written
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    with open(src, newline="", encoding="utf-8-sig") as fin:
+        reader = csv.reader(fin)
+        header = next(reader)
+        rows = [row for row in reader if row]
+    if "Student_ID" not in header:
+        shutil.copyfile(src, dst)
+        return len(rows)
+    id_index = header.index("Student_ID")
+    with open(dst, "w", newline="", encoding="utf-8") as fout:
+        writer = csv.writer(fout)
+        writer.writerow(header)
+        for k in range(factor):
+            if k == 0:
+                writer.writerows(rows)
+                continue
+            for row in rows:
+                row = list(row)
+                if row[id_index]:
+                    row[id_index] = str(int(row[id_index]) + k * span)
+                writer.writerow(row)
+    return len(rows) * factor
+
+
+def make_scaled_project(root, factor, span):
+    """
+    Copy the project into root with data scaled factor times
+
+    Returns:
+        dict: dataset -> row count
+    """
+    for name in PROJECT_FILES:
+        src = PROJECT_ROOT / name
+        if src.is_dir():
+            shutil.copytree(src, root / name, ignore=shutil.ignore_patterns("__pycache__", "*.sqlite"))
+        else:
+            shutil.copyfile(src, root / name)
+    rows = {key: scale_csv(PROJECT_ROOT / "data" / file, root / "data" / file, factor, span)
+            for key, file in DATA_FILES.items()}
+    for src in (PROJECT_ROOT / "generated_data").rglob("*.csv"):
+        scale_csv(src, root / "generated_data" / src.relative_to(PROJECT_ROOT / "generated_data"),
+                  factor, span)
+    return rows
+
+
+# ============================================================================
+# History
+# ============================================================================
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous_result(history, stage, scale):
+    for entry in reversed(history):
+        if entry["stage"] == stage and entry["scale"] == scale:
+            return entry
+    return None
+
+
+def append_history(path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+
+# ============================================================================
+# Run
+# ============================================================================
+
+def run_stage(root, stage, factor):
+    script, *args = STAGES[stage][0]
+    if stage == "generate":
+        args = [*args, "--scale", factor, "--source",
+                PROJECT_ROOT / "data" / DATA_FILES["currentStudents"]]
+    result = run_measured(python_script(root / "scripts" / script, *args), cwd=root)
+    if result["returncode"] not in ALLOWED_EXIT.get(stage, {0}):
+        sys.exit(f"{stage} failed at {factor}x (exit {result['returncode']})")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE)
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative wall-time increase reported as a regression (default 0.2)")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="exit 1 if any stage regressed beyond the threshold")
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    commit = git_commit()
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    span = id_span()
+
+    print("=" * 96)
+    print(f"Pipeline benchmark (commit {commit or 'unknown'}, history {args.history})")
+    print("=" * 96)
+    print(f"{'Scale':>5}  {'Stage':<13}{'Rows':>12}{'Wall (s)':>10}{'Peak RSS MB':>13}"
+          f"{'Rows/s':>12}{'vs previous':>14}")
+
+    entries = []
+    regressions = []
+    for factor in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            rows = make_scaled_project(root, factor, span)
+            for stage in args.stages:
+                prerequisite = PREREQUISITES.get(stage)
+                if prerequisite and prerequisite not in args.stages:
+                    run_stage(root, prerequisite, factor)
+                r = run_stage(root, stage, factor)
+                stage_rows = sum(rows[k] for k in STAGES[stage][1])
+                entry = {
+                    "timestamp": timestamp,
+                    "commit": commit,
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "scale": factor,
+                    "stage": stage,
+                    "rows": stage_rows,
+                    "wall_s": r["wall_s"],
+                    "peak_rss_mb": r["peak_rss_mb"],
+                    "rows_per_s": round(stage_rows / r["wall_s"], 1) if r["wall_s"] else None,
+                }
+                entries.append(entry)
+
+                change = ""
+                previous = previous_result(history, stage, factor)
+                if previous and previous["wall_s"]:
+                    delta = entry["wall_s"] / previous["wall_s"] - 1
+                    change = f"{delta:+.0%}"
+                    if delta > args.threshold:
+                        change += " !"
+                        regressions.append((stage, factor, previous, entry))
+                print(f"{factor:>4}x  {stage:<13}{stage_rows:>12,}{r['wall_s']:>10.2f}"
+                      f"{r['peak_rss_mb']:>13.1f}{entry['rows_per_s'] or 0:>12,.0f}{change:>14}")
+
+    append_history(args.history, entries)
+    print("=" * 96)
+    for stage, factor, previous, entry in regressions:
+        print(f"Regression: {stage} at {factor}x took {entry['wall_s']:.2f}s, "
+              f"{previous['wall_s']:.2f}s at {previous['commit'] or 'unknown'} ({previous['timestamp']})")
+    print(f"Appended {len(entries)} results to {args.history}")
+    return not (regressions and args.fail_on_regression)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
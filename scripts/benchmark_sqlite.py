@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Load-throughput and query-latency benchmark for the local SQLite backend.
+
+Each load runs in a fresh child process (into a temporary database file) so
+peak RSS belongs to that load alone; throughput is reported per executemany
+batch size. The dashboard queries are then timed against the last database.
+
+Usage:
+  python scripts/benchmark_sqlite.py [--batch-sizes 1000 10000 50000] [--repeat 3]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmark_utils import python_script, run_measured
+
+SCRIPT = Path(__file__).resolve()
+
+
+def child(db_path, batch_size):
+    """Load the database in this process and print the stats as JSON."""
+    import sqlite_backend
+
+    stats = sqlite_backend.load_database(db_path, int(batch_size), quiet=True)
+    print(json.dumps(stats))
+
+
+def measure_load(db_path, batch_size, repeat):
+    runs = []
+    for _ in range(repeat):
+        r = run_measured(python_script(SCRIPT, "--child", db_path, batch_size), capture=True)
+        if r["returncode"] != 0:
+            sys.exit(f"Load with batch size {batch_size} failed (exit {r['returncode']})")
+        runs.append(dict(json.loads(r["stdout"]), peak_rss_mb=r["peak_rss_mb"]))
+    total_s = statistics.median(x["total"]["seconds"] for x in runs)
+    rows = runs[0]["total"]["rows"]
+    return {
+        "rows": rows,
+        "load_s": total_s,
+        "index_s": statistics.median(x["indexes"]["seconds"] for x in runs),
+        "rows_per_s": rows / total_s,
+        "peak_rss_mb": statistics.median(x["peak_rss_mb"] for x in runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", nargs=2, metavar=("DB", "BATCH_SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    import sqlite_backend
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "benchmark.sqlite"
+
+        print("=" * 72)
+        print(f"SQLite bulk load (median of {args.repeat}, one transaction per load)")
+        print("=" * 72)
+        print(f"{'Batch size':>10}{'Rows':>10}{'Load s':>9}{'Index s':>9}{'Rows/s':>12}{'Peak RSS MB':>14}")
+        for batch_size in args.batch_sizes:
+            r = measure_load(db_path, batch_size, args.repeat)
+            print(f"{batch_size:>10,}{r['rows']:>10,}{r['load_s']:>9.2f}{r['index_s']:>9.2f}"
+                  f"{r['rows_per_s']:>12,.0f}{r['peak_rss_mb']:>14.1f}")
+
+        print()
+        print("=" * 72)
+        print(f"Dashboard queries (median of {args.repeat})")
+        print("=" * 72)
+        conn = sqlite_backend.connect(db_path)
+        timings = []
+        for number, title, sql in sqlite_backend.dashboard_queries():
+            rows, ms = sqlite_backend.time_query(conn, sql, args.repeat)
+            timings.append(ms)
+            print(f"  Q{number:<3}{title:<44}{len(rows):>6} rows{ms:>10.2f} ms")
+        conn.close()
+        print(f"  {'All queries':<47}{'':>11}{sum(timings):>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
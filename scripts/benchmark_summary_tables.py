@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Query-latency benchmark: analytics views vs their materialized summary tables.
+
+Builds a fresh SQLite database in a temporary directory, then times the same
+reads against vw_student_summary / vw_programme_performance and against
+mv_student_summary / mv_programme_performance, and the cost of refreshing
+one academic year against refreshing every year.
+
+Usage:
+  python scripts/benchmark_summary_tables.py [--repeat 5] [--year 2024/25]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import sqlite_backend
+
+# (label, SQL against the view); the summary-table SQL swaps vw_ for mv_
+QUERIES = [
+    ("Student summary, all rows",
+     "SELECT * FROM vw_student_summary ORDER BY student_id, current_year DESC"),
+    ("Student summary, one year",
+     "SELECT * FROM vw_student_summary WHERE current_year = :year"),
+    ("Student summary, one student",
+     "SELECT * FROM vw_student_summary WHERE student_id = :student"),
+    ("Programme performance, all rows",
+     "SELECT * FROM vw_programme_performance ORDER BY academic_year DESC, programme_name"),
+    ("Programme performance, one year",
+     "SELECT * FROM vw_programme_performance WHERE academic_year = :year"),
+]
+
+
+def summary_sql(view_sql):
+    return view_sql.replace("vw_student_summary", "mv_student_summary") \
+                   .replace("vw_programme_performance", "mv_programme_performance")
+
+
+def dashboard_query_3():
+    return next(sql for number, _, sql in sqlite_backend.dashboard_queries() if number == 3)
+
+
+def time_refresh(conn, years, repeat):
+    """Median ms to refresh the given years; each run is rolled back"""
+    timings = []
+    for _ in range(repeat):
+        conn.execute("BEGIN")
+        start = time.perf_counter()
+        sqlite_backend.refresh_summaries(conn, years)
+        timings.append((time.perf_counter() - start) * 1000)
+        conn.execute("ROLLBACK")
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--year", default="2024/25", help="Academic year for the filtered reads")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "benchmark.sqlite"
+        sqlite_backend.load_database(db_path, quiet=True)
+        conn = sqlite_backend.connect(db_path, readonly=False)
+        student = conn.execute("SELECT student_id FROM current_students "
+                               "WHERE academic_year = ? LIMIT 1", (args.year,)).fetchone()[0]
+        params = {"year": args.year, "student": student}
+
+        cases = [(label, sql, summary_sql(sql)) for label, sql in QUERIES]
+        q3 = dashboard_query_3()
+        cases.append(("Dashboard query 3 (programme comparison)", q3, summary_sql(q3)))
+
+        print("=" * 84)
+        print(f"Views vs summary tables (median of {args.repeat} runs, ms)")
+        print("=" * 84)
+        print(f"{'Query':<42}{'Rows':>7}{'View':>11}{'Summary':>11}{'Speedup':>10}")
+        for label, view_sql, table_sql in cases:
+            view_rows, view_ms = sqlite_backend.time_query(conn, view_sql, args.repeat, params)
+            table_rows, table_ms = sqlite_backend.time_query(conn, table_sql, args.repeat, params)
+            if len(view_rows) != len(table_rows):
+                raise SystemExit(f"{label}: view returned {len(view_rows)} rows, "
+                                 f"summary table {len(table_rows)}")
+            print(f"{label:<42}{len(view_rows):>7}{view_ms:>11.2f}{table_ms:>11.2f}"
+                  f"{view_ms / max(table_ms, 1e-3):>9.0f}x")
+
+        one_ms = time_refresh(conn, [args.year], args.repeat)
+        all_ms = time_refresh(conn, None, args.repeat)
+        print()
+        print(f"Refresh {args.year} only: {one_ms:.0f} ms    Refresh every year: {all_ms:.0f} ms")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the benchmark scripts.
+
+Every measurement runs in a fresh child process so that the peak resident
+set size reported belongs to that run alone.
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def rss_to_mb(ru_maxrss):
+    return ru_maxrss * _RSS_UNIT / (1024 * 1024)
+
+
+def peak_rss_mb():
+    """Peak RSS of the current process so far, in MB."""
+    return rss_to_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def run_measured(args, cwd=None, env=None, quiet=True, capture=False):
+    """
+    Run a command to completion and measure it.
+
+    Returns:
+        dict: wall_s, peak_rss_mb and returncode of the child process, plus
+        its stdout text under "stdout" when capture is set
+    """
+    if capture:
+        stdout = subprocess.PIPE
+    else:
+        stdout = subprocess.DEVNULL if quiet else None
+    start = time.perf_counter()
+    proc = subprocess.Popen(args, cwd=cwd, env=env, stdout=stdout, text=capture or None)
+    output = proc.stdout.read() if capture else None
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if capture:
+        proc.stdout.close()
+    result = {
+        "wall_s": round(wall, 3),
+        "peak_rss_mb": round(rss_to_mb(usage.ru_maxrss), 1),
+        "returncode": proc.returncode,
+    }
+    if capture:
+        result["stdout"] = output
+    return result
+
+
+def python_script(path, *args):
+    """Argument list to run a script with the current interpreter."""
+    return [sys.executable, str(path), *map(str, args)]
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Plan and latency benchmark: fan-out analytics views vs the pre-aggregated
+rewrite in database/sqlite/create_analytics_views.sql.
+
+For each scale factor a fresh SQLite database is built in a temporary
+directory and its students (with their enrolments, attendance and degree
+classifications) are replicated under new student IDs. The original
+join-then-COUNT(DISTINCT) definitions are recreated alongside as
+*_fanout views and both versions are timed and compared.
+
+Usage:
+  python scripts/benchmark_view_plans.py [--scales 1 5 10] [--repeat 3]
+"""
+
+import argparse
+import math
+import tempfile
+from pathlib import Path
+
+import sqlite_backend
+
+# The definitions before the rewrite, kept here as the comparison baseline
+FANOUT_VIEWS = {
+    "vw_student_summary": """
+SELECT
+    cs.student_id,
+    cs.forename,
+    cs.surname,
+    cs.gender,
+    cs.nationality,
+    cs.programme_name,
+    cs.academic_year AS current_year,
+    cs.prog_yr AS current_level,
+    cs.stud_yr AS years_enrolled,
+    cs.aims_start AS start_date,
+    COUNT(DISTINCT ce.course_code) AS courses_enrolled,
+    AVG(a.attendance_percentage) AS avg_attendance,
+    dc.final_gpa,
+    dc.degree_classification,
+    dc.graduation_status
+FROM current_students cs
+LEFT JOIN course_enrolments ce
+    ON cs.student_id = ce.student_id
+    AND cs.academic_year = ce.academic_year
+LEFT JOIN attendance a
+    ON cs.student_id = a.student_id
+    AND cs.academic_year = a.academic_year
+LEFT JOIN degree_classifications dc
+    ON cs.student_id = dc.student_id
+GROUP BY cs.student_id, cs.academic_year
+ORDER BY cs.student_id, cs.academic_year DESC""",
+    "vw_programme_performance": """
+SELECT
+    cs.programme_name,
+    cs.academic_year,
+    COUNT(DISTINCT cs.student_id) AS total_students,
+    AVG(a.attendance_percentage) AS avg_attendance,
+    COUNT(DISTINCT CASE
+        WHEN dc.graduation_status = 'Graduated'
+        THEN dc.student_id
+    END) AS graduates,
+    AVG(dc.final_gpa) AS avg_final_gpa,
+    COUNT(DISTINCT CASE
+        WHEN dc.degree_classification LIKE '%First%'
+        THEN dc.student_id
+    END) AS first_class_count,
+    COUNT(DISTINCT CASE
+        WHEN dc.degree_classification LIKE '%Upper Second%'
+        THEN dc.student_id
+    END) AS upper_second_count,
+    ROUND(COUNT(DISTINCT CASE
+        WHEN dc.graduation_status = 'Graduated'
+        THEN dc.student_id
+    END) * 100.0 / NULLIF(COUNT(DISTINCT cs.student_id), 0), 2) AS graduation_rate
+FROM current_students cs
+LEFT JOIN attendance a
+    ON cs.student_id = a.student_id
+    AND cs.academic_year = a.academic_year
+LEFT JOIN degree_classifications dc
+    ON cs.student_id = dc.student_id
+GROUP BY cs.programme_name, cs.academic_year
+ORDER BY cs.academic_year DESC, cs.programme_name""",
+}
+
+# Tables replicated per scale step; student IDs are offset so keys stay unique
+SCALED_TABLES = ["current_students", "course_enrolments", "attendance", "degree_classifications"]
+ID_OFFSET = 100_000_000
+
+# Columns that the fan-out weighted differently (avg_final_gpa counted each
+# graduate once per attendance record); reported, not treated as a mismatch
+REWEIGHTED_COLUMNS = {"vw_programme_performance": {"avg_final_gpa"}}
+
+
+def scale_database(conn, factor):
+    """Append factor - 1 copies of every student's rows under new IDs"""
+    for table in SCALED_TABLES:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+                   if row[1] not in ("id", "created_at")]
+        select = ", ".join(
+            "CAST(CAST(student_id AS INTEGER) + :offset AS TEXT)" if c == "student_id" else c
+            for c in columns)
+        sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+               f"SELECT {select} FROM {table} WHERE CAST(student_id AS INTEGER) < {ID_OFFSET}")
+        for step in range(1, factor):
+            conn.execute(sql, {"offset": step * ID_OFFSET})
+    conn.execute("ANALYZE")
+
+
+def query_plan(conn, sql):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def compare(view, old_rows, new_rows):
+    """
+    Check the rewrite returns the same rows
+
+    Returns:
+        dict: column -> largest absolute difference for REWEIGHTED_COLUMNS
+    """
+    if len(old_rows) != len(new_rows):
+        raise SystemExit(f"{view}: {len(old_rows)} rows before the rewrite, {len(new_rows)} after")
+    reweighted = {c: 0.0 for c in REWEIGHTED_COLUMNS.get(view, ())}
+    for old, new in zip(old_rows, new_rows):
+        for column in old.keys():
+            a, b = old[column], new[column]
+            if column in reweighted:
+                if a is not None and b is not None:
+                    reweighted[column] = max(reweighted[column], abs(a - b))
+            elif isinstance(a, float) or isinstance(b, float):
+                if not math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9):
+                    raise SystemExit(f"{view}.{column}: {a} before the rewrite, {b} after")
+            elif a != b:
+                raise SystemExit(f"{view}.{column}: {a!r} before the rewrite, {b!r} after")
+    return reweighted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    for factor in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "benchmark.sqlite"
+            sqlite_backend.load_database(db_path, quiet=True)
+            conn = sqlite_backend.connect(db_path, readonly=False)
+            scale_database(conn, factor)
+            for view, body in FANOUT_VIEWS.items():
+                conn.execute(f"CREATE VIEW {view}_fanout AS {body}")
+            students = conn.execute("SELECT COUNT(*) FROM current_students").fetchone()[0]
+
+            for view in FANOUT_VIEWS:
+                old_sql = f"SELECT * FROM {view}_fanout"
+                new_sql = f"SELECT * FROM {view}"
+                if factor == args.scales[0]:
+                    print(f"\n{view} — plan before the rewrite:")
+                    print("\n".join(f"  {line}" for line in query_plan(conn, old_sql)))
+                    print(f"{view} — plan after the rewrite:")
+                    print("\n".join(f"  {line}" for line in query_plan(conn, new_sql)))
+                old_rows, old_ms = sqlite_backend.time_query(conn, old_sql, args.repeat)
+                new_rows, new_ms = sqlite_backend.time_query(conn, new_sql, args.repeat)
+                reweighted = compare(view, old_rows, new_rows)
+                results.append((factor, students, view, len(new_rows), old_ms, new_ms, reweighted))
+            conn.close()
+
+    print()
+    print("=" * 92)
+    print(f"Fan-out vs pre-aggregated views (median of {args.repeat} runs, ms)")
+    print("=" * 92)
+    print(f"{'Scale':>5}{'Student-years':>15}  {'View':<26}{'Rows':>7}{'Fan-out':>11}"
+          f"{'Rewrite':>11}{'Speedup':>9}")
+    for factor, students, view, rows, old_ms, new_ms, _ in results:
+        print(f"{factor:>4}x{students:>15,}  {view:<26}{rows:>7,}{old_ms:>11.1f}{new_ms:>11.1f}"
+              f"{old_ms / new_ms:>8.1f}x")
+
+    drift = {}
+    for *_, reweighted in results:
+        for column, diff in reweighted.items():
+            drift[column] = max(drift.get(column, 0.0), diff)
+    for column, diff in drift.items():
+        print(f"\nNote: {column} now weights each student once (the fan-out weighted "
+              f"graduates by attendance records); largest change {diff:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Main-thread stalls on filter changes, with and without the Web Worker.
+
+dashboard_standalone.html is built without and with --worker and each is
+run under node (the first_chart.py harness, with the worker on a worker
+thread). The same series of filter changes is applied to both, and for each
+change the total time until the page has redrawn and the longest stretch
+the main thread was blocked are reported. Filters the aggregate cube covers
+(year/school/programme/gender) are answered on the main thread in both.
+
+Both pages then visit every tab after each filter change, and the charts,
+tables, insights and header stats must be identical.
+
+Usage:
+  python scripts/benchmark_worker.py [--no-cube] [--no-filter-index]
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+from build_standalone import OUT, build
+from first_chart import run_harness, same_snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--no-cube", action="store_true", help="Compare builds without the aggregate cube")
+    parser.add_argument("--no-filter-index", action="store_true", help="Compare builds without the filter index")
+    args = parser.parse_args()
+    if shutil.which("node") is None:
+        print("node is required to run the dashboard script")
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages = {}
+        for name, worker in (("main thread", False), ("worker", True)):
+            build(cube=not args.no_cube, filter_index=not args.no_filter_index, worker=worker)
+            pages[name] = Path(tmp) / f"{name.replace(' ', '_')}.html"
+            shutil.copy(OUT, pages[name])
+        timings = {name: run_harness(path, mode="filters") for name, path in pages.items()}
+        checks = {name: run_harness(path, mode="check") for name, path in pages.items()}
+    if not all(timings.values()) or not all(checks.values()):
+        return 1
+
+    print("=" * 96)
+    print("Filter changes: total time / longest main-thread stall (ms)")
+    print("=" * 96)
+    print(f"{'Filters':<52}{'main thread':>22}{'worker':>22}")
+    stalls = {name: [] for name in pages}
+    for i, step in enumerate(timings["worker"]["filters"]):
+        label = json.dumps(step["filters"]) if step["filters"] is not None else "reset"
+        line = f"{label[:50]:<52}"
+        for name in pages:
+            change = timings[name]["filters"][i]
+            stalls[name].append(change["stall_ms"])
+            line += f"{change['total_ms']:>12.1f} /{change['stall_ms']:>7.1f}"
+        print(line)
+    print("-" * 96)
+    print(f"{'Median stall':<52}" + "".join(f"{statistics.median(stalls[n]):>22.1f}" for n in pages))
+    print(f"{'Longest stall':<52}" + "".join(f"{max(stalls[n]):>22.1f}" for n in pages))
+    print("(times from node; with a single CPU the worker competes with the page, so totals can grow)")
+    print("=" * 96)
+
+    if not same_snapshots(checks["main thread"], checks["worker"]):
+        return 1
+    steps = len(checks["worker"]["snapshots"])
+    print(f"Both pages draw identical charts, tables and insights across {steps} filter states.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
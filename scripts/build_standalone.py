@@ -1,16 +1,64 @@
 #!/usr/bin/env python3
 """
-Build a single self-contained HTML file that embeds all CSV data, CSS, and JS.
+Build a single self-contained HTML file that embeds the CSV data (the columns the
+dashboard consumes, see projection.py), CSS, and JS.
 The output file can be opened directly in any browser — no server required.
+
+With --api URL a thin client (dashboard_client.html) is built instead: it
+embeds no data and fetches the datasets and the DataStore metrics from
+scripts/query_service.py running on this machine, with the access token of
+the service's current run (rebuild after restarting the service).
+
+With --bundles the data is split: dashboard_lazy.html inlines only the datasets
+the Management Overview and the initial tab read, and every other dataset is
+written to dashboard_lazy_bundles/<dataset>.js, loaded with a <script> element
+(which works from file://) when a tab, filter or the assistant first needs it.
+dashboard_standalone.html remains the single-file build.
+
+With --worker the page also starts a Web Worker running DataLoader and
+DataStore on the embedded data, so filter changes the aggregate cube does not
+cover are computed off the main thread (see js/standalone/workerClient.js).
+
+Each piece of the page (CSS, every JS file, every embedded dataset, the
+aggregate cube, the filter index) is cached under .cache/standalone keyed by the content hash
+of its inputs, so a rebuild only re-renders what changed and is skipped
+entirely when nothing did.
 """
 
+import argparse
+import hashlib
 import json
+import os
+import re
+import time
 from pathlib import Path
+from urllib.parse import urlsplit
 
-PROJECT = Path(__file__).resolve().parent.parent
+import instrumentation
+from aggregates import CUBE_METHODS, DashboardAggregates, build_cube, load_tables
+from datasets import DATASETS, csv_path
+from filter_index import build_filter_index, load_index_tables
+from first_chart import print_first_chart
+from packed_data import pack_files, print_comparison
+from projection import projected_csv
+from query_service import TOKEN_FILE, is_loopback, read_token
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+BUILD_SCRIPT = Path(__file__).resolve()
+PROJECT = SCRIPTS_DIR.parent
 OUT = PROJECT / "dashboard_standalone.html"
+CLIENT_OUT = PROJECT / "dashboard_client.html"
+LAZY_OUT = PROJECT / "dashboard_lazy.html"
+BUNDLE_DIR = PROJECT / "dashboard_lazy_bundles"
+
+# Content-hashed fragment cache (see build())
+CACHE_DIR = PROJECT / ".cache" / "standalone"
+MANIFEST_FILE = CACHE_DIR / "manifest.json"
+FRAGMENT_DIR = CACHE_DIR / "fragments"
+MANIFEST_VERSION = 2
 
 # Files to embed
+INDEX_FILE = PROJECT / "index.html"
 CSS_FILE = PROJECT / "css" / "dashboard.css"
 JS_FILES = [
     PROJECT / "js" / "config.js",
@@ -23,13 +71,42 @@ JS_FILES = [
     PROJECT / "js" / "assistant.js",
     PROJECT / "js" / "app.js",
 ]
-CSV_FILES = {
-    "admissions":      PROJECT / "data" / "01_Admissions_Synthetic_Data.csv",
-    "currentStudents": PROJECT / "data" / "02_COMBINED_Current_Students_All_Years.csv",
-    "enrollments":     PROJECT / "data" / "03_COMBINED_Course_Enrolments_All_Years.csv",
-    "attendance":      PROJECT / "data" / "04_COMBINED_Attendance_All_Years.csv",
-    "classifications": PROJECT / "data" / "05_Degree_Classifications.csv",
-    "courseResults":    PROJECT / "data" / "06_COMBINED_Course_Results_All_Years.csv",
+# Standalone-only overrides, appended after the embedded data
+CUBE_JS_FILE = PROJECT / "js" / "standalone" / "aggregateCube.js"
+FILTER_INDEX_JS_FILE = PROJECT / "js" / "standalone" / "filterIndex.js"
+PACKED_JS_FILE = PROJECT / "js" / "standalone" / "packedData.js"
+CLIENT_JS_FILE = PROJECT / "js" / "standalone" / "queryClient.js"
+LAZY_JS_FILE = PROJECT / "js" / "standalone" / "lazyBundles.js"
+WORKER_CLIENT_JS_FILE = PROJECT / "js" / "standalone" / "workerClient.js"
+# The worker's own source, in load order
+WORKER_JS_FILES = [
+    PROJECT / "js" / "config.js",
+    PROJECT / "js" / "dataLoader.js",
+    PROJECT / "js" / "dataStore.js",
+    PACKED_JS_FILE,
+    PROJECT / "js" / "standalone" / "dataWorker.js",
+]
+CSV_FILES = {name: csv_path(name) for name in DATASETS}
+# The declared column schema and the processors it is checked against decide what is embedded
+PROJECTION_INPUTS = [SCRIPTS_DIR / "projection.py", SCRIPTS_DIR / "datasets.py", PROJECT / "js" / "dataLoader.js"]
+
+# Datasets each dashboard view reads (ChartsManager.sections, plus the header stats in
+# "overview"): "rows" when DataStore computes the metrics from the rows, "cube" when the
+# aggregate cube serves them (no filters, or only year/school/programme/gender).
+# enrollments is read by no view; the dropdowns use values precomputed at build time.
+VIEW_DATASETS = {
+    "overview": {"rows": ["admissions", "currentStudents", "attendance", "classifications"],
+                 "cube": ["admissions"]},
+    "enrollment": {"rows": ["admissions", "currentStudents"]},
+    "performance": {"rows": ["admissions", "classifications", "courseResults"]},
+    "comparison": {"rows": ["admissions", "currentStudents", "attendance", "classifications", "courseResults"],
+                   "cube": ["admissions", "currentStudents", "classifications"]},
+    "retention": {"rows": ["admissions", "classifications"]},
+    "demographics": {"rows": ["admissions"]},
+    "insights": {"rows": ["admissions", "currentStudents", "attendance", "classifications", "courseResults"],
+                 "cube": ["admissions", "attendance", "classifications", "courseResults"]},
+    "assistant": {"rows": ["admissions", "currentStudents", "attendance", "classifications", "courseResults"],
+                  "cube": ["admissions", "currentStudents", "classifications", "courseResults"]},
 }
 
 
@@ -37,40 +114,12 @@ def read_file(path):
     return path.read_text(encoding="utf-8")
 
 
-def build():
-    # Read the index.html as a template reference for the body structure
-    index_html = read_file(PROJECT / "index.html")
+def script_json(value):
+    """Compact JSON that is safe to inline in a <script> element"""
+    return json.dumps(value, separators=(",", ":")).replace("</", "<\\/")
 
-    # Extract the body content between <body> and </body>
-    body_start = index_html.index("<body>") + len("<body>")
-    body_end = index_html.index("</body>")
-    body_content = index_html[body_start:body_end]
-
-    # Remove the <script src="..."> tags from body content — we'll inline them
-    import re
-    body_content = re.sub(r'\s*<script src="js/[^"]+"></script>', '', body_content)
-    body_content = re.sub(r'\s*<script src="https://[^"]+"></script>', '', body_content)
 
-    # Read CSS
-    css = read_file(CSS_FILE)
-
-    # Read all JS files and concatenate
-    js_parts = []
-    for js_file in JS_FILES:
-        js_parts.append(f"// === {js_file.name} ===")
-        js_parts.append(read_file(js_file))
-    all_js = "\n\n".join(js_parts)
-
-    # Embed CSV data as JS strings and override the loadCSV method
-    csv_embed_parts = ["// === Embedded CSV Data ===", "const EMBEDDED_CSV_DATA = {};"]
-    for key, csv_path in CSV_FILES.items():
-        csv_text = read_file(csv_path)
-        # Escape for JS string using JSON encoding
-        csv_json = json.dumps(csv_text)
-        csv_embed_parts.append(f"EMBEDDED_CSV_DATA['{key}'] = {csv_json};")
-
-    # Override DataLoader.loadCSV to parse from embedded strings instead of downloading
-    csv_embed_parts.append("""
+CSV_LOADER_JS = """
 // Override loadCSV to use embedded data
 DataLoader._originalLoadCSV = DataLoader.loadCSV;
 DataLoader.loadCSV = function(path) {
@@ -90,8 +139,379 @@ DataLoader.loadCSV = function(path) {
     // Fallback to original (won't work from file:// but just in case)
     return this._originalLoadCSV(path);
 };
-""")
-    csv_embed_js = "\n".join(csv_embed_parts)
+"""
+
+PACKED_LOADER_JS = """
+// Override loadCSV to decode the embedded packed columns
+DataLoader._originalLoadCSV = DataLoader.loadCSV;
+DataLoader.loadCSV = function(path) {
+    for (const [key, csvPath] of Object.entries(CONFIG.csvPaths)) {
+        if (csvPath === path && EMBEDDED_PACKED_DATA[key]) {
+            return Promise.resolve(PackedData.toRows(EMBEDDED_PACKED_DATA[key]));
+        }
+    }
+    // Fallback to original (won't work from file:// but just in case)
+    return this._originalLoadCSV(path);
+};
+"""
+
+
+# ============================================================================
+# Fragments — each piece of the page, rendered from its own inputs
+# ============================================================================
+
+def render_body():
+    """index.html body without its <script src> tags (they are inlined)"""
+    index_html = read_file(INDEX_FILE)
+    body_start = index_html.index("<body>") + len("<body>")
+    body_end = index_html.index("</body>")
+    body_content = index_html[body_start:body_end]
+    body_content = re.sub(r'\s*<script src="js/[^"]+"></script>', '', body_content)
+    body_content = re.sub(r'\s*<script src="https://[^"]+"></script>', '', body_content)
+    return body_content
+
+
+def render_js(js_file):
+    return f"// === {js_file.name} ===\n{read_file(js_file)}"
+
+
+def render_csv_dataset(key):
+    """Embed the consumed columns as CSV text; the browser parses it with Papa.parse on load"""
+    # Escape for JS string using JSON encoding
+    return f"EMBEDDED_CSV_DATA['{key}'] = {json.dumps(projected_csv(key, CSV_FILES[key]))};"
+
+
+def render_packed_dataset(key, stats):
+    """Embed dictionary/typed-array packed columns decoded without CSV parsing"""
+    payload, dataset_stats = pack_files({key: CSV_FILES[key]})
+    stats.extend(dataset_stats)
+    return f"EMBEDDED_PACKED_DATA['{key}'] = {script_json(payload[key])};"
+
+
+def render_cube():
+    """Precompute the DataStore aggregate cube and return the JS that installs it"""
+    start = time.perf_counter()
+    cube = build_cube(load_tables(CSV_FILES))
+    cube_json = script_json(cube)
+    print(f"Aggregate cube: {len(cube['index'])} filter combinations, "
+          f"{len(cube['cells'])} distinct cells, {len(cube_json) / 1024:.0f} KB "
+          f"({time.perf_counter() - start:.1f}s)")
+    return "\n".join([
+        f"// === {CUBE_JS_FILE.name} ===",
+        read_file(CUBE_JS_FILE),
+        "// === Embedded Aggregate Cube ===",
+        f"const EMBEDDED_AGGREGATE_CUBE = {cube_json};",
+        "AggregateCube.install(EMBEDDED_AGGREGATE_CUBE);",
+    ])
+
+
+def render_filter_index():
+    """Precompute the applyFilters bitset index and return the JS that installs it"""
+    start = time.perf_counter()
+    index = build_filter_index(load_index_tables(CSV_FILES))
+    index_json = script_json(index)
+    print(f"Filter index: {index['students']:,} students, "
+          f"{sum(len(v) for v in index['bitsets'].values())} bitsets, {len(index_json) / 1024:.0f} KB "
+          f"({time.perf_counter() - start:.1f}s)")
+    return "\n".join([
+        f"// === {FILTER_INDEX_JS_FILE.name} ===",
+        read_file(FILTER_INDEX_JS_FILE),
+        "// === Embedded Filter Index ===",
+        f"const EMBEDDED_FILTER_INDEX = {index_json};",
+        "FilterIndex.install(EMBEDDED_FILTER_INDEX);",
+    ])
+
+
+def initial_view():
+    """The tab index.html opens on"""
+    match = re.search(r'class="tab active" data-tab="(\w+)"', read_file(INDEX_FILE))
+    return match.group(1) if match else "enrollment"
+
+
+def split_datasets(cube):
+    """
+    (core, deferred) datasets of the --bundles build: core is what the Management
+    Overview and the initial tab read on first paint (admissions always, as every
+    view reads the students)
+    """
+    mode = "cube" if cube else "rows"
+    core = {"admissions"}
+    for view in ("overview", initial_view()):
+        deps = VIEW_DATASETS[view]
+        core.update(deps.get(mode, deps["rows"]))
+    return [key for key in CSV_FILES if key in core], [key for key in CSV_FILES if key not in core]
+
+
+def lazy_views(cube):
+    """VIEW_DATASETS as LazyBundles reads it (no cube lists without the cube)"""
+    return {view: deps if cube else {"rows": deps["rows"]} for view, deps in VIEW_DATASETS.items()}
+
+
+def render_lazy():
+    """LazyBundles plus the filter dropdown values of datasets that may not be loaded yet"""
+    aggregates = DashboardAggregates(load_tables(CSV_FILES))
+    values = {
+        "academicYears": aggregates.academic_years(),
+        "attendanceStatuses": aggregates.attendance_statuses(),
+        "classifications": aggregates.classification_values(),
+    }
+    return "\n".join([
+        f"// === {LAZY_JS_FILE.name} ===",
+        read_file(LAZY_JS_FILE),
+        f"const LAZY_BUNDLE_VALUES = {script_json(values)};",
+    ])
+
+
+def render_worker():
+    """The worker's source as a string, started by WorkerClient from a Blob URL"""
+    source = "\n\n".join(render_js(f) for f in WORKER_JS_FILES)
+    return "\n".join([
+        f"// === {WORKER_CLIENT_JS_FILE.name} ===",
+        read_file(WORKER_CLIENT_JS_FILE),
+        "// === Embedded Worker Source ===",
+        f"const DASHBOARD_WORKER_SOURCE = {script_json(source)};",
+        "WorkerClient.install(DASHBOARD_WORKER_SOURCE);",
+    ])
+
+
+def render_client():
+    """Thin client: data and metrics come from query_service.py at QUERY_SERVICE_URL"""
+    return "\n".join([
+        f"// === {CLIENT_JS_FILE.name} ===",
+        read_file(CLIENT_JS_FILE),
+        f"QueryClient.install(QUERY_SERVICE_URL, QUERY_SERVICE_TOKEN, {script_json(CUBE_METHODS)});",
+    ])
+
+
+def fragment_specs(cube, payload, stats, api=None, filter_index=True, bundles=False, worker=False):
+    """
+    The page's fragments in output order (with bundles, the deferred datasets'
+    fragments are written to their own files instead, see build())
+
+    Returns:
+        dict: section -> list of (name, input paths, render callable)
+    """
+    data = []
+    if api:
+        # The service URL is part of the output key, not of this fragment
+        data.append(("client", [CLIENT_JS_FILE, SCRIPTS_DIR / "aggregates.py"], render_client))
+        cube = filter_index = False
+    elif payload == "packed":
+        data.append(("packed:header", [PACKED_JS_FILE], lambda: "\n".join([
+            f"// === {PACKED_JS_FILE.name} ===", read_file(PACKED_JS_FILE),
+            "// === Embedded Packed Data ===", "const EMBEDDED_PACKED_DATA = {};"])))
+        for key, path in CSV_FILES.items():
+            data.append((f"packed:{key}", [path, *PROJECTION_INPUTS, SCRIPTS_DIR / "packed_data.py"],
+                         lambda key=key: render_packed_dataset(key, stats)))
+        data.append(("packed:loader", [], lambda: PACKED_LOADER_JS))
+    else:
+        data.append(("csv:header", [], lambda: "// === Embedded CSV Data ===\nconst EMBEDDED_CSV_DATA = {};"))
+        for key, path in CSV_FILES.items():
+            data.append((f"csv:{key}", [path, *PROJECTION_INPUTS], lambda key=key: render_csv_dataset(key)))
+        data.append(("csv:loader", [], lambda: CSV_LOADER_JS))
+
+    cube_specs = []
+    if worker and payload == "packed" and not api:
+        # Installed before the filter index and the cube: they wrap applyFilters around it
+        cube_specs.append(("worker", [WORKER_CLIENT_JS_FILE, *WORKER_JS_FILES], render_worker))
+    if filter_index:
+        # Installed before the cube so the cube's applyFilters wrapper sees every call
+        cube_specs.append(("filter_index", [*CSV_FILES.values(), FILTER_INDEX_JS_FILE,
+                                            SCRIPTS_DIR / "filter_index.py", SCRIPTS_DIR / "aggregates.py"],
+                           render_filter_index))
+    if cube:
+        # Every dataset feeds the cube, so any data change rebuilds it
+        cube_specs.append(("cube", [*CSV_FILES.values(), CUBE_JS_FILE, SCRIPTS_DIR / "aggregates.py"],
+                           render_cube))
+
+    lazy_specs = []
+    if bundles and not api:
+        # Installed last so its wrappers see every call the cube and the filter index take over
+        lazy_specs.append(("lazy", [*CSV_FILES.values(), LAZY_JS_FILE, SCRIPTS_DIR / "aggregates.py"],
+                           render_lazy))
+
+    return {
+        "css": [("css", [CSS_FILE], lambda: read_file(CSS_FILE))],
+        "body": [("body", [INDEX_FILE], render_body)],
+        "js": [(f"js:{f.name}", [f], lambda f=f: render_js(f)) for f in JS_FILES],
+        "data": data,
+        "cube": cube_specs,
+        "lazy": lazy_specs,
+    }
+
+
+# ============================================================================
+# Build cache
+# ============================================================================
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest():
+    if MANIFEST_FILE.exists():
+        manifest = json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    return {"version": MANIFEST_VERSION, "inputs": {}, "fragments": {}, "outputs": {}}
+
+
+def save_manifest(manifest):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, MANIFEST_FILE)
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None if it is missing."""
+    if not path.exists():
+        return None
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def input_hash(path, manifest):
+    """Content hash of an input, reusing the cached hash while its stat is unchanged"""
+    rel = path.relative_to(PROJECT).as_posix()
+    signature = file_signature(path)
+    cached = manifest["inputs"].get(rel)
+    if cached and cached["signature"] == signature:
+        return cached["sha256"]
+    sha = file_sha256(path)
+    manifest["inputs"][rel] = {"signature": signature, "sha256": sha}
+    return sha
+
+
+def fragment_key(name, inputs, manifest):
+    """Hash of the fragment name, its inputs and this build script"""
+    digest = hashlib.sha256(name.encode("utf-8"))
+    for path in [BUILD_SCRIPT, *inputs]:
+        digest.update(path.relative_to(PROJECT).as_posix().encode("utf-8"))
+        digest.update(input_hash(path, manifest).encode("ascii"))
+    return digest.hexdigest()
+
+
+def fragment_path(name):
+    return FRAGMENT_DIR / (name.replace(":", "__") + ".js")
+
+
+def watched_inputs(cube, payload, api=None, filter_index=True, bundles=False, worker=False):
+    """Every file the build reads, for --watch (with api, the service's token too)"""
+    paths = {BUILD_SCRIPT, *([TOKEN_FILE] if api else [])}
+    for specs in fragment_specs(cube, payload, [], api, filter_index, bundles, worker).values():
+        for _, inputs, _ in specs:
+            paths.update(inputs)
+    return sorted(paths)
+
+
+def write_bundles(texts):
+    """Write the deferred datasets' bundle files, removing those no longer deferred"""
+    BUNDLE_DIR.mkdir(exist_ok=True)
+    for stale in BUNDLE_DIR.glob("*.js"):
+        if stale.stem not in texts:
+            stale.unlink()
+    for key, text in texts.items():
+        path = BUNDLE_DIR / f"{key}.js"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def bundle_signatures(keys):
+    return {key: file_signature(BUNDLE_DIR / f"{key}.js") for key in keys}
+
+
+def build(cube=True, payload="packed", force=False, api=None, filter_index=True, bundles=False, worker=False):
+    """
+    Build the standalone HTML from cached fragments, re-rendering only the
+    fragments whose inputs changed. Nothing is written when every fragment
+    and the existing output are current. With api, build the thin client
+    for the query service at that URL instead; with bundles, the split
+    dashboard_lazy.html plus its per-dataset bundle files. With worker, the
+    page filters and aggregates in a Web Worker.
+
+    Returns:
+        bool: True if the output file was (re)written
+    """
+    manifest = load_manifest()
+    if force:
+        manifest["fragments"] = {}
+    FRAGMENT_DIR.mkdir(parents=True, exist_ok=True)
+
+    stats = []
+    with instrumentation.stage("hash_inputs"):
+        specs = fragment_specs(cube, payload, stats, api, filter_index, bundles, worker)
+        keys = {name: fragment_key(name, inputs, manifest)
+                for section in specs.values() for name, inputs, _ in section}
+    bundles = bundles and not api
+    out = CLIENT_OUT if api else LAZY_OUT if bundles else OUT
+    deferred = split_datasets(cube)[1] if bundles else []
+    token = read_token() if api else None
+    if api and token is None:
+        print(f"No query service token at {TOKEN_FILE}: start scripts/query_service.py first")
+        return False
+    output_key = hashlib.sha256(("".join(keys.values()) + (api or "") + (token or "")
+                                 + ",".join(deferred)).encode("utf-8")).hexdigest()
+
+    output = manifest["outputs"].get(out.name)
+    if (not force and output and output["key"] == output_key
+            and output["signature"] == file_signature(out)
+            and output.get("bundles", {}) == bundle_signatures(deferred)):
+        save_manifest(manifest)
+        print(f"Up to date: {out}")
+        return False
+
+    start = time.perf_counter()
+    rendered = []
+    sections = {}
+    for section, section_specs in specs.items():
+        parts = []
+        for name, _, render in section_specs:
+            path = fragment_path(name)
+            if manifest["fragments"].get(name) == keys[name] and path.exists():
+                parts.append(path.read_text(encoding="utf-8"))
+                continue
+            with instrumentation.stage("render", fragment=name):
+                text = render()
+            path.write_text(text, encoding="utf-8")
+            manifest["fragments"][name] = keys[name]
+            rendered.append(name)
+            parts.append(text)
+        sections[section] = parts
+
+    if stats:
+        print_comparison(stats)
+
+    css = sections["css"][0]
+    body_content = sections["body"][0]
+    all_js = "\n\n".join(sections["js"])
+    bundle_texts = {}
+    if bundles:
+        names = [name for name, _, _ in specs["data"]]
+        for key in deferred:
+            bundle_texts[key] = sections["data"].pop(names.index(f"{payload}:{key}"))
+            names.remove(f"{payload}:{key}")
+    data_js = "\n".join(sections["data"])
+    if api:
+        data_js = (f"const QUERY_SERVICE_URL = {script_json(api)};\n"
+                   f"const QUERY_SERVICE_TOKEN = {script_json(token)};\n{data_js}")
+    cube_js = "\n".join(sections["cube"])
+    if bundles:
+        # Bundle URLs carry their fragment hash, so a browser never reuses a stale copy
+        lazy_manifest = {
+            "bundles": {key: f"{BUNDLE_DIR.name}/{key}.js?v={keys[f'{payload}:{key}'][:12]}" for key in deferred},
+            "views": lazy_views(cube),
+            "fallback": OUT.name,
+        }
+        cube_js += "\n\n" + "\n".join([
+            *sections["lazy"],
+            f"LazyBundles.install({{...{script_json(lazy_manifest)}, values: LAZY_BUNDLE_VALUES}});",
+        ])
 
     # Build the standalone HTML
     html = f"""<!DOCTYPE html>
@@ -112,18 +532,108 @@ DataLoader.loadCSV = function(path) {
     <script>
 {all_js}
 
-{csv_embed_js}
+{data_js}
+
+{cube_js}
     </script>
 </body>
 </html>
 """
 
-    OUT.write_text(html, encoding="utf-8")
-    size_mb = OUT.stat().st_size / (1024 * 1024)
-    print(f"Built: {OUT}")
+    with instrumentation.stage("write_output", bytes=len(html)):
+        if bundles:
+            write_bundles(bundle_texts)
+        tmp = out.with_suffix(".tmp")
+        tmp.write_text(html, encoding="utf-8")
+        os.replace(tmp, out)
+    manifest["outputs"][out.name] = {"key": output_key, "signature": file_signature(out),
+                                     "bundles": bundle_signatures(deferred)}
+    save_manifest(manifest)
+
+    size_mb = out.stat().st_size / (1024 * 1024)
+    print(f"Fragments: {len(rendered)} rebuilt, {len(keys) - len(rendered)} cached "
+          f"({time.perf_counter() - start:.1f}s)")
+    if rendered:
+        print(f"Rebuilt: {', '.join(rendered)}")
+    print(f"Built: {out}")
     print(f"Size: {size_mb:.1f} MB")
-    print(f"Open this file directly in any browser — no server needed.")
+    if bundles:
+        bundle_kb = sum(len(text.encode("utf-8")) for text in bundle_texts.values()) / 1024
+        print(f"Bundles: {', '.join(bundle_texts) or 'none'} ({bundle_kb:,.0f} KB in {BUNDLE_DIR.name}/, "
+              f"loaded when first needed)")
+    if api:
+        print(f"Open this file in a browser while scripts/query_service.py serves {api}; "
+              f"rebuild after restarting the service (new token).")
+    else:
+        print(f"Open this file directly in any browser — no server needed.")
+        if payload == "packed":
+            print_first_chart(out)
+    return True
+
+
+def watch(cube=True, payload="packed", interval=1.0, api=None, filter_index=True, bundles=False, worker=False):
+    """Rebuild whenever an input changes; only the affected fragments are re-rendered"""
+    paths = watched_inputs(cube, payload, api, filter_index, bundles, worker)
+    build(cube=cube, payload=payload, api=api, filter_index=filter_index, bundles=bundles, worker=worker)
+    seen = {path: file_signature(path) for path in paths}
+    print(f"Watching {len(paths)} files (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(interval)
+            current = {path: file_signature(path) for path in paths}
+            changed = [path for path in paths if current[path] != seen[path]]
+            if not changed:
+                continue
+            seen = current
+            print(f"\nChanged: {', '.join(p.relative_to(PROJECT).as_posix() for p in changed)}")
+            try:
+                build(cube=cube, payload=payload, api=api, filter_index=filter_index, bundles=bundles,
+                      worker=worker)
+            except Exception as exc:
+                # Keep watching — the next save usually fixes a half-written file
+                print(f"Build failed: {exc}")
+    except KeyboardInterrupt:
+        print("Stopped watching.")
 
 
 if __name__ == "__main__":
-    build()
+    parser = argparse.ArgumentParser(description="Build dashboard_standalone.html")
+    parser.add_argument("--no-cube", action="store_true",
+                        help="Skip the precomputed aggregate cube (browser computes every metric)")
+    parser.add_argument("--no-filter-index", action="store_true",
+                        help="Skip the precomputed filter index (applyFilters scans every table)")
+    parser.add_argument("--payload", choices=["packed", "csv"], default="packed",
+                        help="Embed packed typed-array columns (default) or CSV text")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore the fragment cache and rebuild everything")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and rebuild the affected fragments when inputs change")
+    parser.add_argument("--bundles", action="store_true",
+                        help="Build dashboard_lazy.html, which inlines only the datasets the first screen "
+                             "reads and loads the rest from dashboard_lazy_bundles/ when a tab needs them")
+    parser.add_argument("--worker", action="store_true",
+                        help="Filter and aggregate in a Web Worker so the page stays responsive "
+                             "(packed payload, single-file build only)")
+    parser.add_argument("--api", metavar="URL",
+                        help="Build dashboard_client.html, a thin client that loads data and metrics "
+                             "from query_service.py at URL (e.g. http://127.0.0.1:8765)")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    if args.api and args.bundles:
+        parser.error("--bundles and --api are alternative outputs")
+    if args.worker and (args.api or args.bundles or args.payload != "packed"):
+        # The worker receives the embedded columns as transferable buffers: every dataset, packed
+        parser.error("--worker needs the single-file build with --payload packed")
+    if args.api:
+        api_url = urlsplit(args.api)
+        if api_url.scheme != "http" or not api_url.hostname or not is_loopback(api_url.hostname):
+            parser.error(f"--api must be an http:// URL on this machine (loopback), not {args.api}")
+        if not args.watch and read_token() is None:
+            parser.error(f"no query service token at {TOKEN_FILE}; start scripts/query_service.py first")
+    with instrumentation.session("build_standalone", args):
+        if args.watch:
+            watch(cube=not args.no_cube, payload=args.payload, api=args.api,
+                  filter_index=not args.no_filter_index, bundles=args.bundles, worker=args.worker)
+        else:
+            build(cube=not args.no_cube, payload=args.payload, force=args.force, api=args.api,
+                  filter_index=not args.no_filter_index, bundles=args.bundles, worker=args.worker)
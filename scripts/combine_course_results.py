@@ -5,19 +5,39 @@ Combine individual course report CSVs from generated_data/ into a single file.
 Scans generated_data/YYYY-YY/Sem*/ for *_Course_Report_*.csv files and merges
 them into data/06_COMBINED_Course_Results_All_Years.csv.
 
+With --incremental, a manifest in .cache/course_results/ records the path,
+mtime, size and SHA-256 of every report along with a cached, already
+normalised CSV fragment. Only new or changed reports are re-parsed; the
+output is re-assembled from the fragments and is byte-identical to a full run.
+
 Output schema:
   Academic_Year, Semester, Course_Code, Student_ID, Course_Grade_Point, Overall_Grade, Warning
 """
 
+import argparse
 import csv
+import hashlib
+import io
+import json
 import os
 import re
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import instrumentation
+from datasets import csv_path
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 GENERATED_DATA = PROJECT_ROOT / "generated_data"
-OUTPUT_FILE = PROJECT_ROOT / "data" / "06_COMBINED_Course_Results_All_Years.csv"
+OUTPUT_FILE = csv_path("courseResults")
+
+# Incremental mode cache
+CACHE_DIR = PROJECT_ROOT / ".cache" / "course_results"
+MANIFEST_FILE = CACHE_DIR / "manifest.json"
+FRAGMENT_DIR = CACHE_DIR / "fragments"
+MANIFEST_VERSION = 1
 
 FIELDNAMES = [
     "Academic_Year",
@@ -50,66 +70,250 @@ def parse_semester_folder(folder_name):
     return f"Sem{num}"
 
 
-def combine_course_results():
+def discover_reports():
+    """
+    List every course report and resit file in output order.
+
+    Returns:
+        list of (csv_file, academic_year, semester, course_code) tuples
+    """
+    reports = []
+
+    # Iterate over academic year directories
+    for year_dir in sorted(GENERATED_DATA.iterdir()):
+        if not year_dir.is_dir():
+            continue
+        academic_year = year_dir.name  # e.g. "2017-18"
+
+        # Iterate over semester directories within each year
+        for sem_dir in sorted(year_dir.iterdir()):
+            if not sem_dir.is_dir():
+                continue
+
+            semester = parse_semester_folder(sem_dir.name)
+            if semester is None:
+                continue
+
+            # Each CSV in the semester directory (course reports and resits)
+            for csv_file in sorted(sem_dir.glob("*.csv")):
+                m = FILENAME_RE.match(csv_file.name)
+                if not m:
+                    m = RESIT_RE.match(csv_file.name)
+                if not m:
+                    continue
+                reports.append((csv_file, academic_year, semester, m.group(1)))
+
+    return reports
+
+
+def parse_report(report):
+    """Read one report file into normalised output rows."""
+    csv_file, academic_year, semester, course_code = report
+    rows = []
+    with open(csv_file, "r", encoding="utf-8") as infile:
+        reader = csv.DictReader(infile)
+        for row in reader:
+            student_id = row.get("Student_ID", "").strip()
+            if not student_id:
+                continue
+
+            rows.append({
+                "Academic_Year": academic_year,
+                "Semester": semester,
+                "Course_Code": course_code,
+                "Student_ID": student_id,
+                "Course_Grade_Point": row.get("Course_Grade_Point", "").strip(),
+                "Overall_Grade": row.get("Overall_Grade", "").strip(),
+                "Warning": row.get("Warning", "").strip(),
+            })
+    return rows
+
+
+def iter_parsed_reports(reports, workers):
+    """Parse reports, on a process pool when workers > 1, yielding rows in order."""
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(parse_report, reports, chunksize=16)
+    else:
+        yield from map(parse_report, reports)
+
+
+def combine_course_results(workers=1):
     if not GENERATED_DATA.exists():
         print(f"Error: generated_data directory not found at {GENERATED_DATA}")
         sys.exit(1)
 
     total_rows = 0
     files_processed = 0
+    with instrumentation.stage("discover") as discover:
+        reports = discover_reports()
+        discover.add_rows(len(reports))
 
+    read = instrumentation.Stage("read_reports", workers=workers)
+    write = instrumentation.Stage("write_output")
     with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as outfile:
         writer = csv.DictWriter(outfile, fieldnames=FIELDNAMES)
         writer.writeheader()
 
-        # Iterate over academic year directories
-        for year_dir in sorted(GENERATED_DATA.iterdir()):
-            if not year_dir.is_dir():
+        for rows in read.iter(iter_parsed_reports(reports, workers)):
+            with write:
+                writer.writerows(rows)
+            total_rows += len(rows)
+            files_processed += 1
+    read.add_rows(total_rows)
+    write.add_rows(total_rows)
+    read.emit(files=files_processed)
+    write.emit()
+
+    print(f"Done. Processed {files_processed} course report files.")
+    print(f"Total rows written: {total_rows}")
+    print(f"Output: {OUTPUT_FILE}")
+
+
+# ============================================================================
+# Incremental mode
+# ============================================================================
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fragment_path(rel_path):
+    """Cache location of the normalised rows for one report."""
+    return FRAGMENT_DIR / (rel_path.replace("/", "__"))
+
+
+def build_fragment(task):
+    """Worker: parse one report and write its rows (no header) to the cache."""
+    report, rel_path = task
+    buffer = io.StringIO(newline="")
+    writer = csv.DictWriter(buffer, fieldnames=FIELDNAMES)
+    rows = parse_report(report)
+    writer.writerows(rows)
+    fragment_path(rel_path).write_text(buffer.getvalue(), encoding="utf-8", newline="")
+    return rel_path, len(rows)
+
+
+def load_manifest():
+    if MANIFEST_FILE.exists():
+        manifest = json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    return {"version": MANIFEST_VERSION, "files": {}, "output": None}
+
+
+def save_manifest(manifest):
+    tmp = MANIFEST_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, MANIFEST_FILE)
+
+
+def output_signature():
+    """(mtime_ns, size) of the combined file, or None if it is missing."""
+    if not OUTPUT_FILE.exists():
+        return None
+    st = OUTPUT_FILE.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def combine_course_results_incremental(workers=1):
+    if not GENERATED_DATA.exists():
+        print(f"Error: generated_data directory not found at {GENERATED_DATA}")
+        sys.exit(1)
+
+    FRAGMENT_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest()
+    cached = manifest["files"]
+    with instrumentation.stage("discover") as discover:
+        reports = discover_reports()
+        discover.add_rows(len(reports))
+
+    scan = instrumentation.Stage("scan_manifest")
+    with scan:
+        entries = {}
+        stale = []
+        for report in reports:
+            csv_file = report[0]
+            rel_path = csv_file.relative_to(GENERATED_DATA).as_posix()
+            st = csv_file.stat()
+            entry = cached.get(rel_path)
+            have_fragment = fragment_path(rel_path).exists()
+
+            # Fast path: unchanged mtime and size
+            if entry and have_fragment and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                entries[rel_path] = entry
                 continue
-            academic_year = year_dir.name  # e.g. "2017-18"
 
-            # Iterate over semester directories within each year
-            for sem_dir in sorted(year_dir.iterdir()):
-                if not sem_dir.is_dir():
-                    continue
+            # Touched but identical content: keep the fragment, refresh the stat
+            sha = file_sha256(csv_file)
+            if entry and have_fragment and entry["sha256"] == sha:
+                entries[rel_path] = dict(entry, mtime_ns=st.st_mtime_ns, size=st.st_size)
+                continue
 
-                semester = parse_semester_folder(sem_dir.name)
-                if semester is None:
-                    continue
+            entries[rel_path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": sha, "rows": 0}
+            stale.append((report, rel_path))
 
-                # Process each CSV in the semester directory (course reports and resits)
-                for csv_file in sorted(sem_dir.glob("*.csv")):
-                    m = FILENAME_RE.match(csv_file.name)
-                    if not m:
-                        m = RESIT_RE.match(csv_file.name)
-                    if not m:
-                        continue
-                    course_code = m.group(1)
-
-                    with open(csv_file, "r", encoding="utf-8") as infile:
-                        reader = csv.DictReader(infile)
-                        for row in reader:
-                            student_id = row.get("Student_ID", "").strip()
-                            if not student_id:
-                                continue
-
-                            writer.writerow({
-                                "Academic_Year": academic_year,
-                                "Semester": semester,
-                                "Course_Code": course_code,
-                                "Student_ID": student_id,
-                                "Course_Grade_Point": row.get("Course_Grade_Point", "").strip(),
-                                "Overall_Grade": row.get("Overall_Grade", "").strip(),
-                                "Warning": row.get("Warning", "").strip(),
-                            })
-                            total_rows += 1
-
-                    files_processed += 1
+        removed = sorted(set(cached) - set(entries))
+        for rel_path in removed:
+            fragment_path(rel_path).unlink(missing_ok=True)
+    scan.emit(files=len(reports), stale=len(stale), removed=len(removed))
 
-    print(f"Done. Processed {files_processed} course report files.")
+    # Re-parse changed reports
+    with instrumentation.stage("read_reports", workers=workers, files=len(stale)) as read:
+        if workers > 1 and len(stale) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(build_fragment, stale, chunksize=8))
+        else:
+            results = [build_fragment(task) for task in stale]
+        for rel_path, rows in results:
+            entries[rel_path]["rows"] = rows
+            read.add_rows(rows)
+
+    order = [r[0].relative_to(GENERATED_DATA).as_posix() for r in reports]
+    unchanged = not stale and not removed and order == manifest.get("order")
+    if unchanged and manifest.get("output") == output_signature():
+        # Keep stat entries refreshed for touched files, so they are not re-hashed next run
+        if entries != cached:
+            manifest.update(files=entries)
+            save_manifest(manifest)
+        print(f"Up to date. {len(reports)} course report files unchanged.")
+        print(f"Output: {OUTPUT_FILE}")
+        return
+
+    # Re-assemble the combined file from cached fragments
+    total_rows = sum(entries[p]["rows"] for p in order)
+    with instrumentation.stage("write_output") as write:
+        with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as outfile:
+            csv.DictWriter(outfile, fieldnames=FIELDNAMES).writeheader()
+            for rel_path in order:
+                with open(fragment_path(rel_path), "r", newline="", encoding="utf-8") as fragment:
+                    shutil.copyfileobj(fragment, outfile)
+        write.add_rows(total_rows)
+
+    manifest.update(files=entries, order=order, output=output_signature())
+    save_manifest(manifest)
+
+    print(f"Done. Re-parsed {len(stale)} of {len(reports)} course report files"
+          f" ({len(removed)} removed).")
     print(f"Total rows written: {total_rows}")
     print(f"Output: {OUTPUT_FILE}")
 
 
 if __name__ == "__main__":
-    combine_course_results()
+    parser = argparse.ArgumentParser(description="Combine course report CSVs into file 06.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="re-parse only new or changed reports, using the manifest cache")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="parse reports on a process pool of this size")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumentation.session("combine_course_results", args):
+        if args.incremental:
+            combine_course_results_incremental(args.workers)
+        else:
+            combine_course_results(args.workers)
@@ -9,20 +9,40 @@ Features:
 - Degree classification bands
 """
 
+import argparse
+import csv
+import numpy as np
 import pandas as pd
 import random
 import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from pathlib import Path
+
+import instrumentation
+from datasets import csv_path
 
 # Configuration
 RANDOM_SEED = 42
 random.seed(RANDOM_SEED)
 
-print("="*80)
-print("Student Performance Analytics - Data Generator")
-print("="*80)
-print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Source cohort: one row per student per academic year (Academic_Year,
+# Student_ID, Programme_Name, Prog_Yr)
+STUDENTS_FILE = csv_path('currentStudents')
+OUTPUT_DIR = 'Generated_Data'
+# Rows buffered per write in streaming mode
+DEFAULT_BATCH_SIZE = 50_000
+
+# Output schemas
+ENROLMENT_COLUMNS = ['Academic_Year', 'Student_ID', 'Course_Code', 'Credits', 'Semester']
+ATTENDANCE_COLUMNS = [
+    'Academic_Year', 'Semester', 'Student_ID', 'Course_Code', 'Total_Sessions',
+    'Sessions_Attended', 'Attendance_Percentage', 'Attendance_Status'
+]
 
 # ============================================================================
 # Programme Course Mappings
@@ -164,16 +184,17 @@ CREDIT_MAP = {
 # Helper Functions
 # ============================================================================
 
+PROGRAMME_COURSE_MAP = {
+    'Business Management': BM_COURSES,
+    'Accountancy & Finance': AF_COURSES,
+    'Business Management and Information Systems': BM_IS_COURSES,
+    'Business Management and International Relations': BM_IR_COURSES,
+    'Computing Science': CS_COURSES
+}
+
 def get_programme_courses(programme_name):
     """Return course dictionary for given programme"""
-    prog_map = {
-        'Business Management': BM_COURSES,
-        'Accountancy & Finance': AF_COURSES,
-        'Business Management and Information Systems': BM_IS_COURSES,
-        'Business Management and International Relations': BM_IR_COURSES,
-        'Computing Science': CS_COURSES
-    }
-    return prog_map.get(programme_name, BM_COURSES)
+    return PROGRAMME_COURSE_MAP.get(programme_name, BM_COURSES)
 
 def generate_grade():
     """Generate realistic grade distribution"""
@@ -213,46 +234,28 @@ def calculate_gpa(grades_dict):
     
     return round(total_points / total_credits, 2)
 
+# Degree classification bands: lower GPA bound of each band after 'Fail', ascending
+CLASSIFICATION_BOUNDS = np.array([8.5, 9.0, 11.5, 12.0, 14.5, 15.0, 17.5, 18.0])
+CLASSIFICATIONS = np.array([
+    'Fail', 'Borderline Fail/3rd', 'Third Class Honours', 'Borderline 3rd/2.2',
+    'Lower Second Class Honours', 'Borderline 2.2/2.1', 'Upper Second Class Honours',
+    'Borderline 2.1/1st', 'First Class Honours'
+])
+
+def classify(final_gpas):
+    """Degree classification for each final GPA (array), by sorted-threshold lookup"""
+    return CLASSIFICATIONS[np.searchsorted(CLASSIFICATION_BOUNDS, final_gpas, side='right')]
+
 def determine_classification(final_gpa):
     """Determine degree classification from final GPA"""
-    if final_gpa >= 18.0:
-        return 'First Class Honours'
-    elif final_gpa >= 17.5:
-        return 'Borderline 2.1/1st'
-    elif final_gpa >= 15.0:
-        return 'Upper Second Class Honours'
-    elif final_gpa >= 14.5:
-        return 'Borderline 2.2/2.1'
-    elif final_gpa >= 12.0:
-        return 'Lower Second Class Honours'
-    elif final_gpa >= 11.5:
-        return 'Borderline 3rd/2.2'
-    elif final_gpa >= 9.0:
-        return 'Third Class Honours'
-    elif final_gpa >= 8.5:
-        return 'Borderline Fail/3rd'
-    else:
-        return 'Fail'
+    return str(classify(final_gpa))
 
 # ============================================================================
 # Main Generation Logic
 # ============================================================================
 
-def generate_all_data():
-    """Main function to generate all years of data"""
-    
-    # Load admissions data
-    admissions_df = pd.read_csv('01_Admissions_Synthetic_Data.csv')
-    
-    output_dir = 'Generated_Data'
-    os.makedirs(output_dir, exist_ok=True)
-    
-    all_students = []
-    all_enrolments = []
-    all_attendance = []
-    all_classifications = []
-    
-    # Generate data year by year
+def iter_course_rows(admissions_df):
+    """Yield (enrolment, attendance) row dicts for every student course, year by year"""
     for year in range(2017, 2026):
         year_str = f"{year}/{str(year+1)[2:]}"
         print(f"\nGenerating {year_str}...")
@@ -291,17 +294,14 @@ def generate_all_data():
                         else:
                             status = 'Concern'
                         
-                        # Record enrolment
-                        all_enrolments.append({
+                        enrolment = {
                             'Academic_Year': year_str,
                             'Student_ID': student_id,
                             'Course_Code': course_code,
                             'Credits': credits,
                             'Semester': semester
-                        })
-                        
-                        # Record attendance
-                        all_attendance.append({
+                        }
+                        attendance = {
                             'Academic_Year': year_str,
                             'Semester': semester,
                             'Student_ID': student_id,
@@ -310,21 +310,649 @@ def generate_all_data():
                             'Sessions_Attended': sessions_attended,
                             'Attendance_Percentage': attendance_pct,
                             'Attendance_Status': status
-                        })
+                        }
+                        yield enrolment, attendance
+
+def generate_all_data(source=STUDENTS_FILE, output_dir=OUTPUT_DIR, scale=1,
+                      stream=False, batch_size=DEFAULT_BATCH_SIZE):
+    """Main function to generate all years of data"""
     
-    # Save combined files
-    pd.DataFrame(all_enrolments).to_csv(
-        f'{output_dir}/COMBINED_Course_Enrolments_All_Years.csv', index=False
-    )
-    pd.DataFrame(all_attendance).to_csv(
-        f'{output_dir}/COMBINED_Attendance_All_Years.csv', index=False
-    )
+    # Load student cohort
+    with instrumentation.stage('read_students') as read:
+        admissions_df = scale_cohort(pd.read_csv(source), scale)
+        read.add_rows(len(admissions_df))
+    
+    os.makedirs(output_dir, exist_ok=True)
+    enrolments_path = f'{output_dir}/COMBINED_Course_Enrolments_All_Years.csv'
+    attendance_path = f'{output_dir}/COMBINED_Attendance_All_Years.csv'
     
+    generate = instrumentation.Stage('generate')
+    write = instrumentation.Stage('write_csv')
+    if stream:
+        # Write rows as they are produced, batch_size rows at a time
+        with BatchedCSVWriter(enrolments_path, ENROLMENT_COLUMNS, batch_size) as enrolments, \
+             BatchedCSVWriter(attendance_path, ATTENDANCE_COLUMNS, batch_size) as attendance:
+            for enrolment, record in generate.iter(iter_course_rows(admissions_df)):
+                with write:
+                    enrolments.writerow(enrolment)
+                    attendance.writerow(record)
+            with write:
+                enrolments.flush()
+                attendance.flush()
+        total_enrolments = enrolments.rows_written
+        total_attendance = attendance.rows_written
+    else:
+        all_enrolments = []
+        all_attendance = []
+        for enrolment, record in generate.iter(iter_course_rows(admissions_df)):
+            all_enrolments.append(enrolment)
+            all_attendance.append(record)
+        
+        # Save combined files
+        with write:
+            pd.DataFrame(all_enrolments).to_csv(enrolments_path, index=False)
+            pd.DataFrame(all_attendance).to_csv(attendance_path, index=False)
+        total_enrolments = len(all_enrolments)
+        total_attendance = len(all_attendance)
+    generate.add_rows(total_enrolments)
+    write.add_rows(total_enrolments + total_attendance)
+    generate.emit()
+    write.emit()
+    
+    print("\n" + "="*80)
+    print("Data Generation Complete!")
+    print(f"Total Enrolments: {total_enrolments:,}")
+    print(f"Total Attendance Records: {total_attendance:,}")
+    print("="*80)
+
+# ============================================================================
+# Streaming Output
+# ============================================================================
+
+class BatchedCSVWriter:
+    """
+    CSV writer that buffers at most batch_size rows before flushing to disk
+
+    Accepts row dicts (writerow) or column arrays (write_columns), so peak
+    memory is bounded by the batch size rather than the dataset size.
+    """
+
+    def __init__(self, path, columns, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.columns = columns
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._buffer = []
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file, lineterminator='\n')
+        self._writer.writerow(self.columns)
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        self._file.close()
+
+    def writerow(self, row):
+        self._buffer.append([row[col] for col in self.columns])
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._writer.writerows(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+
+    def write_columns(self, batch):
+        """Append column arrays, batch_size rows at a time"""
+        self.flush()
+        n = len(batch[self.columns[0]]) if batch else 0
+        for start in range(0, n, self.batch_size):
+            stop = min(start + self.batch_size, n)
+            pd.DataFrame({col: batch[col][start:stop] for col in self.columns}).to_csv(
+                self._file, header=False, index=False)
+            self.rows_written += stop - start
+
+# ============================================================================
+# Vectorized Generation Engine
+# ============================================================================
+
+SEMESTERS = ['Sem1', 'Sem2']
+TOTAL_SESSIONS = 20
+
+# Same distribution as generate_grade(): (cumulative upper bound, grades, point range)
+GRADE_BANDS = [
+    (0.03, ['NP'], None),
+    (0.05, ['A1', 'A2'], (20.0, 22.0)),
+    (0.15, ['A3', 'A4', 'A5'], (18.0, 19.99)),
+    (0.40, ['B1', 'B2', 'B3'], (15.0, 17.99)),
+    (0.70, ['C1', 'C2', 'C3'], (12.0, 14.99)),
+    (0.90, ['D1', 'D2', 'D3'], (9.0, 11.99)),
+    (1.00, ['E1', 'E2', 'E3', 'F1', 'F2', 'F3'], (0.0, 8.99)),
+]
+
+BAND_UPPER = np.array([upper for upper, _, _ in GRADE_BANDS])
+BAND_SIZES = np.array([len(grades) for _, grades, _ in GRADE_BANDS])
+BAND_OFFSETS = np.concatenate([[0], np.cumsum(BAND_SIZES)[:-1]])
+BAND_GRADES = np.array([g for _, grades, _ in GRADE_BANDS for g in grades])
+BAND_LOW = np.array([r[0] if r else np.nan for _, _, r in GRADE_BANDS])
+BAND_HIGH = np.array([r[1] if r else np.nan for _, _, r in GRADE_BANDS])
+
+# Attendance status thresholds (lower bounds, ascending)
+ATTENDANCE_THRESHOLDS = np.array([60.0, 80.0])
+ATTENDANCE_STATUSES = np.array(['Concern', 'Warning', 'Good'])
+
+# Common Grading Scale lower bounds (ascending), used to grade resit grade points
+CGS_FLOORS = np.array([0.0, 0.5, 1.0] + list(range(3, 23)), dtype=float)
+CGS_GRADES = np.array(['G3', 'G2', 'G1', 'F3', 'F2', 'F1', 'E3', 'E2', 'E1', 'D3', 'D2', 'D1',
+                       'C3', 'C2', 'C1', 'B3', 'B2', 'B1', 'A5', 'A4', 'A3', 'A2', 'A1'])
+PASS_MARK = 9.0
+MAX_GRADE_POINT = 22.0
+# Share of failed first sittings (NP excluded) that are resat
+RESIT_RATE = 0.68
+RESIT_SEMESTER = 'Sem3_Resit'
+NO_PAPER_WARNING = 'NO PAPER - FOLLOW UP REQUIRED'
+
+# Graduation status draw for classified students (cumulative upper bounds)
+GRADUATION_STATUS_UPPER = np.array([0.74, 0.89, 1.00])
+GRADUATION_STATUSES = np.array(['Graduated', 'Deferred', 'Pending'])
+
+# Course report / resit file and classification schemas
+REPORT_COLUMNS = ['Student_ID', 'Course_Grade_Point', 'Overall_Grade', 'Warning']
+RESULT_COLUMNS = ['Academic_Year', 'Semester', 'Course_Code', 'Student_ID',
+                  'Course_Grade_Point', 'Overall_Grade', 'Resit_Grade_Point', 'Resit_Grade']
+CLASSIFICATION_COLUMNS = [
+    'Student_ID', 'Programme', 'Entry_Level', 'Entry_Year', 'Total_Credits', 'Year_3_GPA',
+    'Year_4_GPA', 'Final_GPA', 'Degree_Classification', 'Graduation_Date', 'Graduation_Status'
+]
+
+def id_stride(students_df):
+    """Student_ID offset between cohort copies, wide enough to avoid collisions"""
+    ids = students_df['Student_ID'].astype(np.int64)
+    return int(ids.max() - ids.min() + 1)
+
+def scale_cohort(students_df, scale):
+    """Replicate the cohort `scale` times, offsetting Student_IDs per copy"""
+    if scale <= 1:
+        return students_df
+    ids = students_df['Student_ID'].astype(np.int64)
+    stride = id_stride(students_df)
+    copies = []
+    for k in range(scale):
+        copy = students_df.copy()
+        copy['Student_ID'] = ids + k * stride
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+def build_course_templates():
+    """Flatten programme course maps into (programme, prog_yr) -> course slot arrays"""
+    templates = {}
+    for programme, prog_courses in PROGRAMME_COURSE_MAP.items():
+        for prog_yr, semesters in prog_courses.items():
+            slots = [(code, semester)
+                     for semester in SEMESTERS
+                     for code in semesters.get(semester, [])]
+            templates[(programme, prog_yr)] = slots
+    return templates
+
+def expand_course_slots(students_df):
+    """
+    Expand students x programme courses into flat column arrays in one step
+
+    Returns:
+        dict: column name -> numpy array, one entry per (student, course)
+    """
+    templates = build_course_templates()
+    keys = list(templates)
+    key_index = {key: i for i, key in enumerate(keys)}
+
+    lengths = np.array([len(templates[k]) for k in keys], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    flat_codes = np.array([code for k in keys for code, _ in templates[k]], dtype=object)
+    flat_sems = np.array([sem for k in keys for _, sem in templates[k]], dtype=object)
+
+    # Unknown programmes fall back to Business Management (as get_programme_courses does);
+    # programme years without a course list produce no rows
+    programmes = students_df['Programme_Name'].where(
+        students_df['Programme_Name'].isin(PROGRAMME_COURSE_MAP), 'Business Management'
+    )
+    template_ids = np.array([
+        key_index.get((p, y), -1)
+        for p, y in zip(programmes, students_df['Prog_Yr'].astype(int))
+    ], dtype=np.int64)
+    counts = np.where(template_ids >= 0, lengths[template_ids], 0)
+
+    student_rows = np.repeat(np.arange(len(students_df)), counts)
+    row_starts = np.cumsum(counts) - counts
+    position = np.arange(counts.sum()) - np.repeat(row_starts, counts)
+    slot = starts[template_ids[student_rows]] + position
+
+    course_codes = flat_codes[slot]
+    return {
+        'Academic_Year': students_df['Academic_Year'].to_numpy()[student_rows],
+        'Student_ID': students_df['Student_ID'].to_numpy()[student_rows],
+        'Course_Code': course_codes,
+        'Credits': pd.Series(course_codes).map(CREDIT_MAP).fillna(15).astype(np.int64).to_numpy(),
+        'Semester': flat_sems[slot],
+        'Prog_Yr': students_df['Prog_Yr'].to_numpy(np.int64)[student_rows],
+    }
+
+def draw_grades(rng, n):
+    """Draw n (grade, grade_point) pairs with the generate_grade() distribution"""
+    band = np.searchsorted(BAND_UPPER, rng.random(n), side='right')
+    pick = np.minimum((rng.random(n) * BAND_SIZES[band]).astype(np.int64), BAND_SIZES[band] - 1)
+    grades = BAND_GRADES[BAND_OFFSETS[band] + pick]
+    low, high = BAND_LOW[band], BAND_HIGH[band]
+    points = np.round(low + rng.random(n) * (high - low), 2)  # NaN for NP
+    return grades, points
+
+def draw_attendance(rng, n):
+    """Draw n attendance percentages with their sessions attended and status"""
+    pct = np.round(rng.uniform(40, 100, n), 2)
+    sessions = (TOTAL_SESSIONS * pct / 100).astype(np.int64)
+    status = ATTENDANCE_STATUSES[np.searchsorted(ATTENDANCE_THRESHOLDS, pct, side='right')]
+    return pct, sessions, status
+
+def grade_for_points(points):
+    """Common Grading Scale grade for each grade point, by sorted-threshold lookup"""
+    return CGS_GRADES[np.searchsorted(CGS_FLOORS, points, side='right') - 1]
+
+def draw_resits(rng, points):
+    """
+    Resit RESIT_RATE of the failed first sittings (NP is never resat)
+
+    Returns:
+        (resit grade points, resit grades): NaN and '' where there is no resit
+    """
+    n = len(points)
+    resat = (points < PASS_MARK) & (rng.random(n) < RESIT_RATE)
+    improved = np.round(np.clip(points + rng.uniform(-2.0, 6.0, n), 0.0, MAX_GRADE_POINT), 2)
+    resit_points = np.where(resat, improved, np.nan)
+    return resit_points, np.where(resat, grade_for_points(np.nan_to_num(resit_points)), '')
+
+def generate_batch(students_df, rng):
+    """Generate enrolment, grade and attendance columns for a block of students"""
+    batch = expand_course_slots(students_df)
+    n = len(batch['Course_Code'])
+    batch['Overall_Grade'], batch['Course_Grade_Point'] = draw_grades(rng, n)
+    (batch['Attendance_Percentage'],
+     batch['Sessions_Attended'],
+     batch['Attendance_Status']) = draw_attendance(rng, n)
+    batch['Total_Sessions'] = np.full(n, TOTAL_SESSIONS, dtype=np.int64)
+    # Drawn last, so enrolment and attendance output is the same with or without resits
+    batch['Resit_Grade_Point'], batch['Resit_Grade'] = draw_resits(rng, batch['Course_Grade_Point'])
+    return batch
+
+def write_columns(batch, columns, path):
+    """Write selected batch columns straight to CSV"""
+    pd.DataFrame({col: batch[col] for col in columns}).to_csv(path, index=False)
+
+def shard_seed(seed, academic_year, programme, replica):
+    """
+    Derive the seed for one (academic year, programme, cohort copy) shard
+
+    Depends only on the shard's identity, never on scheduling, so output is
+    identical whatever the worker count.
+    """
+    return np.random.SeedSequence([
+        seed, int(academic_year[:4]), zlib.crc32(programme.encode('utf-8')), replica
+    ])
+
+def plan_shards(students_df, scale, seed):
+    """Split the cohort into year x programme x copy shards, in output order"""
+    stride = id_stride(students_df)
+    shards = []
+    for (year, programme), group in students_df.groupby(
+            ['Academic_Year', 'Programme_Name'], sort=True):
+        for replica in range(scale):
+            shards.append((year, programme, replica, replica * stride, group, seed))
+    return shards
+
+def generate_shard(shard):
+    """Worker entry point: generate one shard with its own derived Generator"""
+    year, programme, replica, id_offset, students_df, seed = shard
+    if id_offset:
+        students_df = students_df.assign(Student_ID=students_df['Student_ID'] + id_offset)
+    rng = np.random.default_rng(shard_seed(seed, year, programme, replica))
+    return generate_batch(students_df, rng)
+
+def merge_batches(batches):
+    """Concatenate shard batches column by column"""
+    batches = list(batches)
+    if not batches:
+        return {}
+    return {col: np.concatenate([b[col] for b in batches]) for col in batches[0]}
+
+def iter_shard_batches(shards, pool=None, workers=1):
+    """
+    Yield shard batches in shard order, generated on pool when given
+
+    With a pool at most 2 x workers shards are in flight at once, so
+    finished batches never pile up faster than they are written out.
+    """
+    if pool is None:
+        yield from map(generate_shard, shards)
+        return
+    pending = deque()
+    for shard in shards:
+        pending.append(pool.submit(generate_shard, shard))
+        if len(pending) >= 2 * workers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+# ============================================================================
+# Course Reports and Classifications
+# ============================================================================
+
+def course_report_tasks(batch, output_dir):
+    """
+    Split a batch's grades into one (path, frame) task per course report and
+    resit file, laid out under output_dir/YYYY-YY/Sem*/ as
+    combine_course_results.py expects. Rows keep batch (shard) order.
+    """
+    resat = ~np.isnan(batch['Resit_Grade_Point'])
+    sittings = [
+        ('Course_Report', pd.DataFrame({
+            'Academic_Year': batch['Academic_Year'],
+            'Semester': batch['Semester'],
+            'Course_Code': batch['Course_Code'],
+            'Student_ID': batch['Student_ID'],
+            'Course_Grade_Point': batch['Course_Grade_Point'],
+            'Overall_Grade': batch['Overall_Grade'],
+        })),
+        ('Resit', pd.DataFrame({
+            'Academic_Year': batch['Academic_Year'][resat],
+            'Semester': RESIT_SEMESTER,
+            'Course_Code': batch['Course_Code'][resat],
+            'Student_ID': batch['Student_ID'][resat],
+            'Course_Grade_Point': batch['Resit_Grade_Point'][resat],
+            'Overall_Grade': batch['Resit_Grade'][resat],
+        })),
+    ]
+    tasks = []
+    for kind, frame in sittings:
+        frame['Warning'] = np.where(frame['Overall_Grade'] == 'NP', NO_PAPER_WARNING, '')
+        for (year, semester, code), report in frame.groupby(
+                ['Academic_Year', 'Semester', 'Course_Code'], sort=True):
+            folder = year.replace('/', '-')
+            path = os.path.join(output_dir, folder, semester, f'{code}_{kind}_{folder}.csv')
+            tasks.append((path, report[REPORT_COLUMNS]))
+    return tasks
+
+def write_report(task):
+    """Worker entry point: write (or append to) one course report or resit file"""
+    path, frame, append = task
+    if not append:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    frame.to_csv(path, index=False, mode='a' if append else 'w', header=not append)
+    return len(frame)
+
+def write_course_reports(tasks, pool=None):
+    """Write report files, spread across pool's workers when given; returns rows written"""
+    written = pool.map(write_report, tasks, chunksize=8) if pool else map(write_report, tasks)
+    return sum(written)
+
+class CourseReportWriter:
+    """
+    Collects shard batches and writes their course report and resit rows
+    once at least batch_size rows are pending
+
+    Each flush splits the pending rows by file in one pass and writes (or
+    appends to) every file once, keeping shard order, so a file is opened a
+    handful of times rather than once per shard while memory stays bounded
+    by the batch size.
+    """
+
+    def __init__(self, output_dir, pool=None, batch_size=DEFAULT_BATCH_SIZE):
+        self.output_dir = output_dir
+        self.pool = pool
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._pending = []
+        self._pending_rows = 0
+        self._started = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.flush()
+
+    def add(self, batch):
+        self._pending.append(batch)
+        self._pending_rows += len(batch['Course_Code'])
+        if self._pending_rows >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        tasks = []
+        for path, frame in course_report_tasks(merge_batches(self._pending), self.output_dir):
+            tasks.append((path, frame, path in self._started))
+            self._started.add(path)
+        self._pending = []
+        self._pending_rows = 0
+        self.rows_written += write_course_reports(tasks, self.pool)
+
+class GPATotals:
+    """
+    Running Year 3 and Year 4 credit-weighted grade point and credit sums,
+    one slot per student of each cohort copy, folded in batch by batch
+
+    Counts NP as 0 grade points over the course's full credits and ignores
+    resits, as verify_gpa.py does, so generated classifications verify clean.
+    The sums take a few float arrays of honours students x scale, whatever
+    the number of batches.
+    """
+
+    def __init__(self, students_df, scale):
+        ids = students_df['Student_ID'].astype(np.int64)
+        self.first_id = int(ids.min())
+        self.stride = id_stride(students_df)
+        self.ids = np.unique(ids[students_df['Prog_Yr'].isin((3, 4))].to_numpy())
+        self.weighted = np.zeros((scale, len(self.ids), 2))
+        self.credits = np.zeros((scale, len(self.ids), 2))
+
+    def add(self, batch):
+        # Summed per batch as verify_gpa.py does, so the GPAs round the same way
+        honours = np.isin(batch['Prog_Yr'], (3, 4))
+        credits = batch['Credits'][honours]
+        sums = pd.DataFrame({
+            'Student_ID': batch['Student_ID'][honours].astype(np.int64),
+            'Prog_Yr': batch['Prog_Yr'][honours],
+            'Weighted': np.nan_to_num(batch['Course_Grade_Point'][honours]) * credits,
+            'Credits': credits,
+        }).groupby(['Student_ID', 'Prog_Yr'], sort=False).sum()
+        ids = sums.index.get_level_values('Student_ID').to_numpy()
+        replica = (ids - self.first_id) // self.stride
+        slot = (replica, np.searchsorted(self.ids, ids - replica * self.stride),
+                sums.index.get_level_values('Prog_Yr').to_numpy() - 3)
+        self.weighted[slot] += sums['Weighted'].to_numpy()
+        self.credits[slot] += sums['Credits'].to_numpy()
+
+    def year_gpas(self, replica):
+        """
+        GPA per student of one cohort copy and programme year
+
+        Returns:
+            DataFrame: indexed by Student_ID, one column per Prog_Yr (3, 4),
+            NaN where the student has no results for that year
+        """
+        with np.errstate(invalid='ignore'):
+            gpas = self.weighted[replica] / self.credits[replica]
+        return pd.DataFrame(gpas, index=self.ids + replica * self.stride, columns=[3, 4])
+
+def build_classifications(students_df, gpas, rng):
+    """
+    Degree classification for every student who completed Year 4 before the
+    last generated academic year, from their Year 3 and Year 4 GPAs (50/50)
+
+    Called once per cohort copy in Student_ID order with the same rng, so the
+    graduation statuses match a single draw over the whole scaled cohort.
+    """
+    history = students_df.sort_values(['Student_ID', 'Academic_Year'], kind='stable').groupby('Student_ID')
+    first, last = history.first(), history.last()
+    gpas = gpas.reindex(last.index)
+    graduates = ((last['Prog_Yr'] == 4)
+                 & (last['Academic_Year'] < students_df['Academic_Year'].max())
+                 & gpas[3].notna() & gpas[4].notna()).to_numpy()
+
+    first, last, gpas = first[graduates], last[graduates], gpas[graduates]
+    year_3, year_4 = gpas[3].round(2).to_numpy(), gpas[4].round(2).to_numpy()
+    final = np.round(year_3 * 0.5 + year_4 * 0.5, 2)
+    status = np.searchsorted(GRADUATION_STATUS_UPPER, rng.random(len(final)), side='right')
+    entry_level = first['Prog_Yr'].to_numpy()
+    return pd.DataFrame({
+        'Student_ID': last.index.to_numpy(),
+        'Programme': last['Programme_Name'].to_numpy(),
+        'Entry_Level': entry_level,
+        'Entry_Year': first['Academic_Year'].to_numpy(),
+        'Total_Credits': 120 * (4 - entry_level),
+        'Year_3_GPA': year_3,
+        'Year_4_GPA': year_4,
+        'Final_GPA': final,
+        'Degree_Classification': classify(final),
+        'Graduation_Date': [f"{int(year[:4]) + 1}-06-30" for year in last['Academic_Year']],
+        'Graduation_Status': GRADUATION_STATUSES[status],
+    })[CLASSIFICATION_COLUMNS]
+
+def write_classifications(students_df, scale, totals, seed, path):
+    """Write Degree_Classifications.csv one cohort copy at a time; returns rows written"""
+    rng = np.random.default_rng(np.random.SeedSequence([seed, zlib.crc32(b'classifications')]))
+    stride = id_stride(students_df)
+    rows = 0
+    for replica in range(scale):
+        copy = students_df.assign(Student_ID=students_df['Student_ID'] + replica * stride)
+        frame = build_classifications(copy, totals.year_gpas(replica), rng)
+        frame.to_csv(path, index=False, mode='a' if replica else 'w', header=not replica)
+        rows += len(frame)
+    return rows
+
+def generate_all_data_vectorized(source=STUDENTS_FILE, output_dir=OUTPUT_DIR,
+                                 scale=1, seed=RANDOM_SEED, workers=1,
+                                 stream=False, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Batched replacement for generate_all_data()
+
+    The cohort is split into academic year x programme x copy shards, each
+    drawn from its own Generator seeded by shard_seed(). With workers > 1 the
+    shards run on a process pool; results are merged in shard order, so the
+    same seed and scale always produce byte-identical output files.
+
+    Alongside the combined enrolment and attendance files, the same pass
+    writes every per-course report and resit file (YYYY-YY/Sem*/, written
+    across the worker pool) and Degree_Classifications.csv, whose Year 3 and
+    Year 4 GPAs are summed batch by batch (GPATotals).
+
+    With stream=True each shard is appended to the enrolment, attendance and
+    course report files as soon as it is ready instead of being merged
+    first, so peak memory stays at a few shards however large the cohort is
+    scaled. The files are the same either way.
+    """
+    with instrumentation.stage('read_students') as read:
+        students_df = pd.read_csv(source, usecols=['Academic_Year', 'Student_ID',
+                                                   'Programme_Name', 'Prog_Yr'])
+        years = [f"{year}/{str(year+1)[2:]}" for year in range(2017, 2026)]
+        students_df = students_df[students_df['Academic_Year'].isin(years)]
+        read.add_rows(len(students_df))
+
+    os.makedirs(output_dir, exist_ok=True)
+    enrolments_path = f'{output_dir}/COMBINED_Course_Enrolments_All_Years.csv'
+    attendance_path = f'{output_dir}/COMBINED_Attendance_All_Years.csv'
+    classifications_path = f'{output_dir}/Degree_Classifications.csv'
+    shards = plan_shards(students_df, scale, seed)
+    print(f"Students: {len(students_df) * scale:,} (scale x{scale}, seed {seed})")
+    print(f"Shards: {len(shards)} across {workers} worker(s)")
+
+    generate = instrumentation.Stage('generate', shards=len(shards), workers=workers)
+    write = instrumentation.Stage('write_csv')
+    reports = instrumentation.Stage('write_reports', workers=workers)
+    totals = GPATotals(students_df, scale)
+    with (ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()) as pool:
+        if stream:
+            with BatchedCSVWriter(enrolments_path, ENROLMENT_COLUMNS, batch_size) as enrolments, \
+                 BatchedCSVWriter(attendance_path, ATTENDANCE_COLUMNS, batch_size) as attendance, \
+                 CourseReportWriter(output_dir, pool, batch_size) as course_reports:
+                for batch in generate.iter(iter_shard_batches(shards, pool, workers)):
+                    with write:
+                        enrolments.write_columns(batch)
+                        attendance.write_columns(batch)
+                    with reports:
+                        course_reports.add(batch)
+                    totals.add(batch)
+                with reports:
+                    course_reports.flush()
+            reports.add_rows(course_reports.rows_written)
+            total = enrolments.rows_written
+        else:
+            with generate:
+                batch = merge_batches(iter_shard_batches(shards, pool, workers))
+            with write:
+                write_columns(batch, ENROLMENT_COLUMNS, enrolments_path)
+                write_columns(batch, ATTENDANCE_COLUMNS, attendance_path)
+            total = len(batch['Course_Code']) if batch else 0
+            if total:
+                with reports, CourseReportWriter(output_dir, pool) as course_reports:
+                    course_reports.add(batch)
+                reports.add_rows(course_reports.rows_written)
+                totals.add(batch)
+    generate.add_rows(total)
+    write.add_rows(2 * total)
+    generate.emit()
+    write.emit()
+    reports.emit()
+
+    with instrumentation.stage('classify') as stage:
+        classified = write_classifications(students_df, scale, totals, seed, classifications_path)
+        stage.add_rows(classified)
+
     print("\n" + "="*80)
     print("Data Generation Complete!")
-    print(f"Total Enrolments: {len(all_enrolments):,}")
-    print(f"Total Attendance Records: {len(all_attendance):,}")
+    print(f"Total Enrolments: {total:,}")
+    print(f"Total Attendance Records: {total:,}")
+    print(f"Total Course Results: {reports.rows:,} (resits: {reports.rows - total:,})")
+    print(f"Degree Classifications: {classified:,}")
+    print("="*80)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--engine', choices=['vectorized', 'legacy'], default='vectorized',
+                        help='vectorized numpy engine (default) or the original row-by-row loop')
+    parser.add_argument('--source', default=str(STUDENTS_FILE),
+                        help='student-year CSV to generate from')
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--scale', type=int, default=1,
+                        help='multiply the cohort size N times (new Student_IDs per copy)')
+    parser.add_argument('--seed', type=int, default=RANDOM_SEED,
+                        help='random seed; identical seed and scale give identical output')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='process pool size for the vectorized engine (default: serial)')
+    parser.add_argument('--stream', action='store_true',
+                        help='write rows in bounded batches instead of holding them all in memory')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'rows per write in --stream mode (default {DEFAULT_BATCH_SIZE:,})')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    print("="*80)
+    print("Student Performance Analytics - Data Generator")
     print("="*80)
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+    with instrumentation.session('data_generator', args):
+        if args.engine == 'legacy':
+            random.seed(args.seed)
+            generate_all_data(args.source, args.output_dir, args.scale,
+                              args.stream, args.batch_size)
+        else:
+            generate_all_data_vectorized(args.source, args.output_dir, args.scale, args.seed,
+                                         args.workers, args.stream, args.batch_size)
 
 if __name__ == '__main__':
-    generate_all_data()
+    main()
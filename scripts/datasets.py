@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Dataset registry and loaders for the six combined data files in data/.
+
+Every script reads the data files through this module. load_dataset()
+returns a typed DataFrame, with categorical encoding for the repeated string
+columns (course codes, semesters, academic years and programme names), after
+checking the columns the dashboard requires are present. Only the columns the
+dashboard consumes are kept (see projected_columns()); the personal details
+in the admissions and current-student files never leave the CSV.
+
+The first load of a dataset parses it and writes a binary copy to
+.cache/datasets/ — one .npy array per column, string columns stored as
+dictionary codes — keyed by the CSV's mtime, size and SHA-256. Later loads
+memory-map those arrays instead of re-parsing, until the CSV changes.
+
+`python scripts/datasets.py convert` writes a typed, zstd-compressed Parquet
+copy of each CSV to data/columnar/. When the binary cache is stale, parsing
+prefers that copy if it is at least as new as the CSV (and pyarrow is
+installed) and falls back to pandas.read_csv otherwise. Every path returns
+the same dtypes.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine)
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+COLUMNAR_DIR = DATA_DIR / "columnar"
+
+# Memory-mapped column cache (see load_dataset())
+CACHE_DIR = PROJECT_ROOT / ".cache" / "datasets"
+CACHE_VERSION = 2
+
+# Keys match CSV_FILES in build_standalone.py and CONFIG.csvPaths in js/config.js;
+# "required" mirrors CONFIG.csvSchemas (checked by DataLoader.validateSchema) — keep in sync.
+# "consumed" lists the columns the DataLoader processors read, trimmed (the
+# processors try both spellings of headers like 'Gender '); projection.py
+# checks it against js/dataLoader.js
+DATASETS = {
+    "admissions": {
+        "file": "01_Admissions_Synthetic_Data.csv",
+        "categorical": ["Academic Year ", "Course/Degree"],
+        "integer": ["Student_ID"],
+        "float": [],
+        "required": ["Student_ID", "First Name", "Last Name", "Gender", "Nationality", "Date of Birth",
+                     "Course/Degree", "Student Status", "Academic Year"],
+        "consumed": ["Student_ID", "First Name", "Last Name", "Gender", "Marital Status", "Academic Year",
+                     "Entry Semester", "Degree Type", "Course/Degree", "Level offered", "Student Status",
+                     "Preferred Entry Level", "Conditional/ Unconditional", "Date of Birth", "Nationality",
+                     "Sponsored Students (Yes / No)", "Disability / Health Issues", "Recent Education System",
+                     "IELTS", "How did you hear about us ?", "How did you hear about us?"],
+    },
+    "currentStudents": {
+        "file": "02_COMBINED_Current_Students_All_Years.csv",
+        "categorical": ["Academic_Year", "Programme_Name"],
+        "integer": ["Student_ID", "Prog_Yr", "Stud_Yr"],
+        "float": [],
+        "required": ["Student_ID", "Academic_Year", "Surname", "Forename", "Gender", "Nationality",
+                     "Programme_Name"],
+        "consumed": ["Student_ID", "Academic_Year", "Surname", "Forename", "Gender", "Date_of_Birth",
+                     "Nationality", "Prog_Yr", "Stud_Yr", "Category", "Programme_Name"],
+    },
+    "enrollments": {
+        "file": "03_COMBINED_Course_Enrolments_All_Years.csv",
+        "categorical": ["Academic_Year", "Course_Code", "Semester"],
+        "integer": ["Student_ID", "Credits"],
+        "float": [],
+        "required": ["Student_ID", "Academic_Year", "Course_Code", "Credits", "Semester"],
+        "consumed": ["Student_ID", "Academic_Year", "Course_Code", "Credits", "Semester"],
+    },
+    "attendance": {
+        "file": "04_COMBINED_Attendance_All_Years.csv",
+        "categorical": ["Academic_Year", "Semester", "Course_Code", "Attendance_Status"],
+        "integer": ["Student_ID", "Total_Sessions", "Sessions_Attended"],
+        "float": ["Attendance_Percentage"],
+        "required": ["Student_ID", "Academic_Year", "Semester", "Course_Code", "Total_Sessions",
+                     "Sessions_Attended", "Attendance_Percentage", "Attendance_Status"],
+        "consumed": ["Student_ID", "Academic_Year", "Semester", "Course_Code", "Total_Sessions",
+                     "Sessions_Attended", "Attendance_Percentage", "Attendance_Status"],
+    },
+    "classifications": {
+        "file": "05_Degree_Classifications.csv",
+        "categorical": ["Programme", "Entry_Year", "Degree_Classification", "Graduation_Status"],
+        "integer": ["Student_ID", "Entry_Level", "Total_Credits"],
+        "float": ["Year_3_GPA", "Year_4_GPA", "Final_GPA"],
+        "required": ["Student_ID", "Programme", "Final_GPA", "Degree_Classification", "Graduation_Status"],
+        "consumed": ["Student_ID", "Programme", "Entry_Level", "Entry_Year", "Year_3_GPA", "Year_4_GPA",
+                     "Final_GPA", "Degree_Classification", "Total_Credits", "Graduation_Status",
+                     "Graduation_Date"],
+    },
+    "courseResults": {
+        "file": "06_COMBINED_Course_Results_All_Years.csv",
+        "categorical": ["Academic_Year", "Semester", "Course_Code", "Overall_Grade"],
+        "integer": ["Student_ID"],
+        # 'NP' (no paper) grade points become NaN; Overall_Grade keeps the 'NP'
+        "float": ["Course_Grade_Point"],
+        "required": ["Student_ID", "Academic_Year", "Semester", "Course_Code", "Course_Grade_Point",
+                     "Overall_Grade"],
+        "consumed": ["Student_ID", "Academic_Year", "Semester", "Course_Code", "Course_Grade_Point",
+                     "Overall_Grade", "Warning"],
+    },
+}
+
+
+class SchemaError(ValueError):
+    """A data file is missing columns the dashboard requires."""
+
+
+def csv_path(name):
+    return DATA_DIR / DATASETS[name]["file"]
+
+
+def columnar_path(name):
+    return COLUMNAR_DIR / (Path(DATASETS[name]["file"]).stem + ".parquet")
+
+
+def apply_schema(df, name):
+    """Cast a raw CSV frame (or a column subset of one) to the dataset's declared dtypes."""
+    spec = DATASETS[name]
+    for col in spec["integer"]:
+        if col in df:
+            df[col] = pd.to_numeric(df[col]).astype("int32")
+    for col in spec["float"]:
+        if col in df:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    for col in spec["categorical"]:
+        if col in df:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def projected_columns(name, columns):
+    """The columns the dashboard uses (consumed or required), compared trimmed, in file order."""
+    spec = DATASETS[name]
+    keep = {col.strip() for col in spec["consumed"] + spec["required"]}
+    return [col for col in columns if str(col).strip() in keep]
+
+
+def missing_columns(name, columns):
+    """Required columns not in columns, compared trimmed like DataLoader.validateSchema."""
+    present = {str(col).strip() for col in columns}
+    return [col for col in DATASETS[name]["required"] if col.strip() not in present]
+
+
+def validate_schema(name, df):
+    missing = missing_columns(name, df.columns)
+    if missing:
+        raise SchemaError(f"{DATASETS[name]['file']}: missing required columns — {', '.join(missing)}")
+    return df
+
+
+def read_csv_typed(name, path=None):
+    """Parse a dataset's projected columns from CSV text and apply its schema."""
+    path = path or csv_path(name)
+    columns = projected_columns(name, pd.read_csv(path, nrows=0).columns)
+    return apply_schema(pd.read_csv(path, usecols=columns), name)
+
+
+def iter_chunks(name, chunksize, columns=None):
+    """
+    Yield a dataset as typed DataFrames of at most chunksize rows.
+
+    The CSV is read incrementally, so memory is bounded by the chunk size
+    rather than the file size. Categoricals are encoded per chunk, so their
+    categories differ from chunk to chunk.
+    """
+    validate_schema(name, pd.read_csv(csv_path(name), nrows=0))
+    with pd.read_csv(csv_path(name), usecols=columns, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk, name)
+
+
+def estimate_rows(name, sample_bytes=1 << 16):
+    """Approximate row count from the file size and the line lengths in its first sample_bytes."""
+    path = csv_path(name)
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        sample = f.read(sample_bytes)
+    lines = sample.count(b"\n")
+    if not lines or len(sample) >= size:
+        return max(lines - 1, 0)
+    return int(size * lines / len(sample))
+
+
+def columnar_is_fresh(name):
+    """True when the Parquet copy exists and is not older than the CSV."""
+    src, dst = csv_path(name), columnar_path(name)
+    return dst.exists() and (not src.exists() or dst.stat().st_mtime_ns >= src.stat().st_mtime_ns)
+
+
+# ============================================================================
+# Memory-mapped column cache
+# ============================================================================
+
+def cache_dir(name):
+    return CACHE_DIR / Path(DATASETS[name]["file"]).stem
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cache_meta(name):
+    try:
+        meta = json.loads((cache_dir(name) / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == CACHE_VERSION else None
+
+
+def save_cache_meta(name, meta):
+    path = cache_dir(name) / "meta.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(meta, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def cache_is_fresh(name, meta):
+    """
+    True when the CSV is unchanged since the cache was written: the same
+    mtime and size, or the same SHA-256 after a touch (the cached stat is
+    then refreshed so the next check is cheap again).
+    """
+    st = csv_path(name).stat()
+    source = meta["source"]
+    if source["mtime_ns"] == st.st_mtime_ns and source["size"] == st.st_size:
+        return True
+    if source["size"] != st.st_size or source["sha256"] != file_sha256(csv_path(name)):
+        return False
+    source["mtime_ns"] = st.st_mtime_ns
+    save_cache_meta(name, meta)
+    return True
+
+
+def write_cache(name, df, st, sha256):
+    """
+    Store each column as an .npy array: numeric columns as-is, categoricals
+    as their codes, other string columns as dictionary codes (-1 = missing)
+    """
+    directory = cache_dir(name)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Array files are named by content, so a reader never sees a half-replaced set
+    tag = sha256[:16]
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {"name": col, "dtype": str(series.dtype), "file": f"{tag}-{i}.npy"}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry["kind"] = "category"
+            entry["categories"] = series.cat.categories.tolist()
+            values = series.cat.codes.to_numpy()
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+            entry["kind"] = "numeric"
+            values = series.to_numpy()
+        else:
+            codes, uniques = pd.factorize(series)
+            entry["kind"] = "dictionary"
+            entry["categories"] = list(uniques)
+            values = codes.astype(np.int32)
+        np.save(directory / entry["file"], np.ascontiguousarray(values), allow_pickle=False)
+        columns.append(entry)
+
+    save_cache_meta(name, {
+        "version": CACHE_VERSION,
+        "source": {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": sha256},
+        "rows": len(df),
+        "columns": columns,
+    })
+    for path in directory.glob("*.npy"):
+        if not path.name.startswith(f"{tag}-"):
+            path.unlink(missing_ok=True)
+
+
+def read_cache(name, meta):
+    """Rebuild the typed frame over memory-mapped (copy-on-write) column arrays."""
+    directory = cache_dir(name)
+    data = {}
+    for entry in meta["columns"]:
+        # A plain ndarray view still reads through the mapping
+        values = np.load(directory / entry["file"], mmap_mode="c", allow_pickle=False).view(np.ndarray)
+        if entry["kind"] == "numeric":
+            data[entry["name"]] = values
+        elif entry["kind"] == "category":
+            data[entry["name"]] = pd.Categorical.from_codes(
+                values, dtype=pd.CategoricalDtype(entry["categories"]))
+        else:
+            # Code -1 (missing) picks the trailing NaN
+            lookup = np.array(entry["categories"] + [np.nan], dtype=object)
+            data[entry["name"]] = pd.array(lookup[values], dtype=entry["dtype"])
+    return pd.DataFrame(data, copy=False)
+
+
+def load_dataset(name, prefer_columnar=True, cache=True):
+    """
+    Load a dataset as a typed DataFrame.
+
+    Memory-maps the .cache/datasets/ copy while the CSV is unchanged.
+    Otherwise parses data/columnar/*.parquet when available and up to date,
+    or the CSV, checks the required columns and refreshes the cache.
+
+    Raises:
+        SchemaError: the file lacks a column listed in CONFIG.csvSchemas
+    """
+    if cache:
+        meta = load_cache_meta(name)
+        if meta and cache_is_fresh(name, meta):
+            return read_cache(name, meta)
+
+    # Fingerprint before parsing, so a write during the parse invalidates the cache
+    st = csv_path(name).stat()
+    sha256 = file_sha256(csv_path(name)) if cache else None
+    if prefer_columnar and HAVE_PYARROW and columnar_is_fresh(name):
+        # Copies written before projection still hold every column
+        df = pd.read_parquet(columnar_path(name))
+        df = df[projected_columns(name, df.columns)]
+    else:
+        df = read_csv_typed(name)
+    validate_schema(name, df)
+    if cache:
+        write_cache(name, df, st, sha256)
+    return df
+
+
+def convert_dataset(name):
+    """Write the typed Parquet copy of one dataset; returns its path."""
+    if not HAVE_PYARROW:
+        raise RuntimeError("pyarrow is required for columnar conversion (pip install pyarrow)")
+    COLUMNAR_DIR.mkdir(parents=True, exist_ok=True)
+    df = read_csv_typed(name)
+    out = columnar_path(name)
+    df.to_parquet(out, engine="pyarrow", compression="zstd", index=False)
+    return out
+
+
+def warm_cache(names=None):
+    print("=" * 80)
+    print("Dataset Cache")
+    print("=" * 80)
+    print(f"{'Dataset':<16}{'Rows':>9}{'CSV ms':>11}{'Mapped ms':>11}  Cache")
+    for name in names or DATASETS:
+        start = time.perf_counter()
+        df = load_dataset(name, prefer_columnar=False, cache=False)
+        parse_ms = (time.perf_counter() - start) * 1000
+        load_dataset(name)
+        start = time.perf_counter()
+        load_dataset(name)
+        mapped_ms = (time.perf_counter() - start) * 1000
+        print(f"{name:<16}{len(df):>9,}{parse_ms:>11.1f}{mapped_ms:>11.1f}  "
+              f"{cache_dir(name).relative_to(PROJECT_ROOT)}")
+    print("=" * 80)
+
+
+def convert_all(names=None):
+    print("=" * 80)
+    print("Columnar Conversion")
+    print("=" * 80)
+    total_csv = total_parquet = 0
+    for name in names or DATASETS:
+        out = convert_dataset(name)
+        csv_size = csv_path(name).stat().st_size
+        pq_size = out.stat().st_size
+        total_csv += csv_size
+        total_parquet += pq_size
+        print(f"{name:<16} {csv_size / 1024:>9,.0f} KB -> {pq_size / 1024:>7,.0f} KB  {out.name}")
+    print("=" * 80)
+    print(f"Total: {total_csv / 1024:,.0f} KB CSV -> {total_parquet / 1024:,.0f} KB Parquet")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dataset registry and columnar conversion.")
+    parser.add_argument("command", choices=["convert", "cache"],
+                        help="convert: write data/columnar/*.parquet; "
+                             "cache: (re)build the memory-mapped cache and time it")
+    parser.add_argument("datasets", nargs="*", metavar="dataset",
+                        help=f"datasets to process (default: all of {', '.join(DATASETS)})")
+    args = parser.parse_args()
+    unknown = sorted(set(args.datasets) - set(DATASETS))
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(unknown)}")
+    if args.command == "cache":
+        warm_cache(args.datasets or None)
+        sys.exit(0)
+    if not HAVE_PYARROW:
+        sys.exit("pyarrow is required for columnar conversion (pip install pyarrow)")
+    convert_all(args.datasets or None)
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Build-time filter index for DataStore.applyFilters.
+
+applyFilters() narrows DataLoader.students with one scan per active filter
+(several of them scans of currentStudents, classifications or attendance to
+build ID sets) and then re-scans the five related tables. The index
+precomputes all of that over the row positions the browser will have:
+
+  bitsets   per filter dimension and value, one bit per DataLoader.students
+            position (Uint32 words), e.g. bitsets.year["2021/22"]
+  gpa       classification Final_GPAs sorted ascending with the student
+            position of each, so a GPA range is two binary searches
+  keys      student position -> distinct Student_ID number; related rows are
+            attached to IDs, as applyFilters matches them by ID
+  related   per table, the table's row positions grouped by ID (order) and
+            each ID's [offsets[k], offsets[k + 1]) range into them
+
+js/standalone/filterIndex.js turns a filter change into bitset intersection
+plus slicing of `order`. Arrays are little-endian, base64 encoded, in the
+smallest unsigned type (as in packed_data.py).
+
+Row positions only hold for the data the index was built from; the JS side
+checks the table lengths and steps aside for imported files.
+
+Usage:
+  python scripts/filter_index.py          # print index size summary
+"""
+
+import base64
+import json
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from aggregates import (CSV_FILES, EXCLUDED_STATUSES, _field, js_parse_float, js_parse_int,
+                        load_tables, read_csv_rows)
+
+UINT_TYPES = [("Uint8", "<u1"), ("Uint16", "<u2"), ("Uint32", "<u4")]
+
+# Tables re-filtered by applyFilters, in DataStore.filtered order
+RELATED_TABLES = ["currentStudents", "enrollments", "courseResults", "attendance", "classifications"]
+
+# Filter -> student field compared with ===
+STUDENT_DIMENSIONS = {
+    "school": "school",
+    "programme": "programme",
+    "gender": "gender",
+    "nationality": "nationality",
+    "entryLevel": "entry_level",
+}
+
+# Filter -> (table, row field) whose matching rows' IDs select students
+RELATED_DIMENSIONS = {
+    "year": ("currentStudents", "academic_year"),
+    "classification": ("classifications", "classification"),
+    "attendanceStatus": ("attendance", "attendance_status"),
+}
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+
+def uint_type(high):
+    for name, dtype in UINT_TYPES:
+        if high <= np.iinfo(dtype).max:
+            return name, dtype
+    raise ValueError(f"value {high} does not fit in Uint32")
+
+
+def encode(values, dtype=None):
+    """{type, data}: values as the smallest little-endian typed array, base64"""
+    values = np.asarray(values)
+    if dtype is None:
+        name, dtype = uint_type(int(values.max()) if len(values) else 0)
+    else:
+        name = {"<f8": "Float64", "<u4": "Uint32"}[dtype]
+    return {"type": name, "data": base64.b64encode(values.astype(dtype).tobytes()).decode("ascii")}
+
+
+def decode(column):
+    dtype = {"Uint8": "<u1", "Uint16": "<u2", "Uint32": "<u4", "Float64": "<f8"}[column["type"]]
+    return np.frombuffer(base64.b64decode(column["data"]), dtype=dtype)
+
+
+def bitset(positions, n):
+    """Uint32 words with bit i set for each student position i"""
+    words = np.zeros((n + 31) // 32, dtype=np.uint32)
+    positions = np.asarray(sorted(positions), dtype=np.int64)
+    np.bitwise_or.at(words, positions >> 5, (np.uint32(1) << (positions & 31).astype(np.uint32)))
+    return words
+
+
+def bitset_positions(words, n):
+    """Student positions whose bit is set, ascending"""
+    bits = np.unpackbits(words.view(np.uint8), bitorder="little")[:n]
+    return np.flatnonzero(bits)
+
+
+# ============================================================================
+# Index
+# ============================================================================
+
+def load_index_tables(csv_files=CSV_FILES):
+    """
+    DataLoader-shaped tables plus what applyFilters reads beyond aggregates.py:
+    enrolment Student_IDs and the students' names (for the search filter)
+    """
+    tables = load_tables(csv_files)
+    tables["enrollments"] = [{"student_id": _field(row, "Student_ID").strip()}
+                             for row in read_csv_rows(csv_files["enrollments"])]
+    admitted = [row for row in read_csv_rows(csv_files["admissions"])
+                if _field(row, "Student Status").strip() not in EXCLUDED_STATUSES]
+    for student, row in zip(tables["students"], admitted):
+        # DataLoader reads 'First Name' / 'Last Name' exactly (no trailing-space variant)
+        student["first_name"] = (row.get("First Name") or "").strip()
+        student["last_name"] = (row.get("Last Name") or "").strip()
+    return tables
+
+
+def gpa_bounds(filters):
+    """(min, max) as applyFilters parses them; None where parseFloat gives NaN"""
+    low = js_parse_float(str(filters["gpaMin"])) if filters.get("gpaMin") is not None else 0.0
+    high = js_parse_float(str(filters["gpaMax"])) if filters.get("gpaMax") is not None else 22.0
+    return low, high
+
+
+def build_filter_index(tables=None):
+    """
+    Precompute bitsets, the GPA range list and per-ID row ranges
+
+    Returns:
+        dict: JSON-ready index consumed by js/standalone/filterIndex.js
+    """
+    tables = tables or load_index_tables()
+    students = tables["students"]
+    n = len(students)
+
+    # Distinct Student_IDs in first-appearance order, and every position holding each
+    key_of = {}
+    keys = []
+    for s in students:
+        keys.append(key_of.setdefault(s["student_id"], len(key_of)))
+    positions_of = [[] for _ in key_of]
+    for position, key in enumerate(keys):
+        positions_of[key].append(position)
+
+    bitsets = {}
+    for dimension, field in STUDENT_DIMENSIONS.items():
+        groups = {}
+        for position, s in enumerate(students):
+            groups.setdefault(str(s[field]), []).append(position)
+        bitsets[dimension] = {value: encode(bitset(p, n), "<u4") for value, p in sorted(groups.items())}
+    for dimension, (table, field) in RELATED_DIMENSIONS.items():
+        groups = {}
+        for row in tables[table]:
+            key = key_of.get(row["student_id"])
+            if key is not None and row[field]:
+                groups.setdefault(row[field], set()).update(positions_of[key])
+        bitsets[dimension] = {value: encode(bitset(p, n), "<u4") for value, p in sorted(groups.items())}
+
+    gpa = sorted((c["final_gpa"], position)
+                 for c in tables["classifications"]
+                 if c["student_id"] in key_of and c["final_gpa"] == c["final_gpa"]
+                 for position in positions_of[key_of[c["student_id"]]])
+
+    related = {}
+    for table in RELATED_TABLES:
+        row_keys = np.array([key_of.get(row["student_id"], -1) for row in tables[table]], dtype=np.int64)
+        matched = np.flatnonzero(row_keys >= 0)
+        # Stable sort keeps each ID's rows in table order
+        order = matched[np.argsort(row_keys[matched], kind="stable")]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(row_keys[matched], minlength=len(key_of)))])
+        related[table] = {"rows": len(tables[table]), "order": encode(order), "offsets": encode(offsets)}
+
+    return {
+        "students": n,
+        "keys": encode(keys),
+        "bitsets": bitsets,
+        "gpa": {"values": encode([g for g, _ in gpa], "<f8"), "positions": encode([p for _, p in gpa])},
+        "related": related,
+    }
+
+
+# ============================================================================
+# Reference implementations (used by benchmark_filter_index.py)
+# ============================================================================
+
+def apply_index(index, tables, filters):
+    """
+    Python rendering of FilterIndex.applyFilters
+
+    Returns:
+        dict: DataStore.filtered-shaped row position arrays per table
+    """
+    n = index["students"]
+    words = np.full((n + 31) // 32, 0xFFFFFFFF, dtype=np.uint32)
+    empty = np.zeros_like(words)
+    for dimension in [*STUDENT_DIMENSIONS, *RELATED_DIMENSIONS]:
+        value = filters.get(dimension)
+        if not value:
+            continue
+        if dimension == "entryLevel":
+            level = js_parse_int(str(value))
+            value = str(level) if level is not None else None
+        column = index["bitsets"][dimension].get(value)
+        words &= decode(column) if column else empty
+    if filters.get("gpaMin") is not None or filters.get("gpaMax") is not None:
+        low, high = gpa_bounds(filters)
+        if low is None or high is None:
+            words &= empty
+        else:
+            values = decode(index["gpa"]["values"]).tolist()
+            positions = decode(index["gpa"]["positions"])
+            words &= bitset(positions[bisect_left(values, low):bisect_right(values, high)].tolist(), n)
+
+    selected = bitset_positions(words, n)
+    if filters.get("search"):
+        selected = np.array([p for p in selected if matches_search(tables["students"][p], filters["search"])],
+                            dtype=np.int64)
+
+    keys = decode(index["keys"])
+    chosen = np.zeros(int(keys.max()) + 1 if len(keys) else 0, dtype=bool)
+    chosen[keys[selected]] = True
+    out = {"students": selected}
+    for table in RELATED_TABLES:
+        spec = index["related"][table]
+        order, offsets = decode(spec["order"]), decode(spec["offsets"]).astype(np.int64)
+        ranges = [order[offsets[k]:offsets[k + 1]] for k in np.flatnonzero(chosen)]
+        out[table] = np.sort(np.concatenate(ranges)) if ranges else np.array([], dtype=np.int64)
+    return out
+
+
+def matches_search(student, query):
+    q = query.lower()
+    first, last = student["first_name"], student["last_name"]
+    return (q in student["student_id"].lower() or q in first.lower() or q in last.lower()
+            or q in f"{first} {last}".lower())
+
+
+def apply_brute_force(tables, filters):
+    """
+    Python port of the scanning DataStore.applyFilters
+
+    Returns:
+        dict: row position arrays per table, comparable with apply_index()
+    """
+    students = list(enumerate(tables["students"]))
+    if filters.get("search"):
+        students = [(i, s) for i, s in students if matches_search(s, filters["search"])]
+    for dimension, (table, field) in RELATED_DIMENSIONS.items():
+        if filters.get(dimension):
+            ids = {row["student_id"] for row in tables[table] if row[field] == filters[dimension]}
+            students = [(i, s) for i, s in students if s["student_id"] in ids]
+    for dimension, field in STUDENT_DIMENSIONS.items():
+        value = filters.get(dimension)
+        if value:
+            if dimension == "entryLevel":
+                value = js_parse_int(str(value))
+            students = [(i, s) for i, s in students if s[field] == value]
+    if filters.get("gpaMin") is not None or filters.get("gpaMax") is not None:
+        low, high = gpa_bounds(filters)
+        ids = ({c["student_id"] for c in tables["classifications"] if low <= c["final_gpa"] <= high}
+               if low is not None and high is not None else set())
+        students = [(i, s) for i, s in students if s["student_id"] in ids]
+
+    ids = {s["student_id"] for _, s in students}
+    out = {"students": np.array(sorted(i for i, _ in students), dtype=np.int64)}
+    for table in RELATED_TABLES:
+        out[table] = np.array([i for i, row in enumerate(tables[table]) if row["student_id"] in ids],
+                              dtype=np.int64)
+    return out
+
+
+def main():
+    import time
+    start = time.perf_counter()
+    index = build_filter_index()
+    elapsed = time.perf_counter() - start
+    payload = json.dumps(index, separators=(",", ":"))
+    values = sum(len(v) for v in index["bitsets"].values())
+    print(f"Filter index: {index['students']:,} students, {len(index['bitsets'])} dimensions, "
+          f"{values} bitsets, {len(payload) / 1024:.0f} KB JSON, built in {elapsed:.2f}s")
+    for table, spec in index["related"].items():
+        print(f"  {table:<16}{spec['rows']:>9,} rows  order {spec['order']['type']}, "
+              f"offsets {spec['offsets']['type']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-chart of the standalone dashboard builds.
+
+The page's inline script is run under node with a minimal DOM and stand-ins
+for Chart.js and Plotly (the CDN libraries are not part of what the build
+controls). Reported per build:
+
+  script     evaluating the inline <script>: the dashboard code, the embedded
+             data, the cube and the filter index
+  first      DOMContentLoaded until the first chart is created
+  ready      DOMContentLoaded until the loading overlay is hidden
+  tabs       switching to each tab in turn, including any bundle it loads
+
+Bundles referenced by the split build (--bundles) are read from disk when the
+page adds their <script> element, as a browser does from file://, and the
+Web Worker of a --worker build runs on a node worker thread. Byte counts
+and JS time exclude HTML/CSS parsing and layout, which both builds share.
+
+With --check, both builds then visit every tab under a series of filter
+changes, and the chart data, tables, insights and header stats must be the
+same in both.
+
+Usage:
+  python scripts/first_chart.py [--check] [--no-cube]   # builds both modes, then compares
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+
+TABS = ["enrollment", "performance", "comparison", "retention", "demographics", "insights", "assistant"]
+
+NODE_HARNESS = r"""
+const fs = require('fs'), path = require('path'), vm = require('vm');
+const { Worker: ThreadWorker } = require('worker_threads');
+const [htmlPath, mode, tabsJson] = process.argv.slice(1);
+const tabs = JSON.parse(tabsJson);
+const html = fs.readFileSync(htmlPath, 'utf8');
+const inline = html.match(/<script>([\s\S]*)<\/script>/)[1];
+
+const now = () => performance.now();
+let start = 0, firstChart = null;
+const drawn = () => { if (firstChart === null) firstChart = now() - start; };
+
+// Minimal DOM: elements by id keep what the dashboard writes to them
+function deep() {
+    const store = {};
+    return new Proxy(function () {}, {
+        get: (t, k) => (k in store ? store[k] : (store[k] = deep())),
+        set: (t, k, v) => (store[k] = v, true), apply: () => deep(), construct: () => deep()
+    });
+}
+function el(props = {}) {
+    const target = Object.assign({
+        style: {}, dataset: {}, options: [{}], children: [],
+        classList: { add() {}, remove() {}, toggle() {}, contains() { return false; } },
+        getContext() { return {}; }, querySelectorAll() { return []; }, querySelector() { return el(); },
+        addEventListener() {}, removeEventListener() {}, remove() {}, closest() { return el(); },
+        appendChild(child) { this.children.push(child); if (child.src) loadScript(child); return child; },
+        setAttribute() {}, focus() {}, scrollIntoView() {}
+    }, props);
+    return new Proxy(target, { get: (t, k) => (k in t ? t[k] : ''), set: (t, k, v) => (t[k] = v, true) });
+}
+const elements = {};
+const byId = id => elements[id] || (elements[id] = el({ id }));
+const listeners = {};
+const document = {
+    addEventListener(type, fn) { (listeners[type] = listeners[type] || []).push(fn); },
+    getElementById: byId, querySelectorAll() { return []; }, querySelector() { return el(); },
+    createElement(tag) { return el({ tagName: tag.toUpperCase() }); },
+    body: el(), head: el()
+};
+
+// <script src> from file://, relative to the page; asynchronous like the browser
+function loadScript(script) {
+    setTimeout(() => {
+        const file = path.join(path.dirname(htmlPath), script.src.split('?')[0]);
+        try {
+            vm.runInContext(fs.readFileSync(file, 'utf8'), ctx, { filename: file });
+        } catch (err) {
+            return script.onerror && script.onerror(err);
+        }
+        script.onload && script.onload();
+    }, 0);
+}
+
+function viv(o) {
+    return new Proxy(o, { get: (t, k) => {
+        if (!(k in t) && typeof k === 'string') t[k] = {};
+        const v = t[k];
+        return (v && typeof v === 'object' && !Array.isArray(v)) ? viv(v) : v;
+    } });
+}
+class FakeChart {
+    static defaults = deep();
+    static register() {}
+    constructor(canvas, config) { drawn(); this.config = config; this.data = config.data; this.options = viv(config.options || {}); }
+    update() {}
+    destroy() {}
+}
+// Web Worker (workerClient.js) on a worker thread, with self/postMessage/onmessage as in the browser
+const blobs = new Map(), workers = [];
+class Blob { constructor(parts) { this.source = parts.join(''); } }
+const URL = { createObjectURL(blob) { const url = `blob:${blobs.size}`; blobs.set(url, blob.source); return url; } };
+const WORKER_PRELUDE = `const { parentPort } = require('worker_threads');
+globalThis.self = globalThis;
+console.log = () => {};
+globalThis.postMessage = (data, transfer) => parentPort.postMessage(data, transfer);
+parentPort.on('message', data => self.onmessage && self.onmessage({ data }));
+`;
+class WebWorker {
+    constructor(url) {
+        this.thread = new ThreadWorker(WORKER_PRELUDE + blobs.get(url), { eval: true });
+        this.thread.on('message', data => this.onmessage && this.onmessage({ data }));
+        this.thread.on('error', err => this.onerror && this.onerror({ message: err.message }));
+        workers.push(this.thread);
+    }
+    postMessage(data, transfer) { this.thread.postMessage(data, transfer); }
+}
+
+const plots = {};
+const plot = (id, data) => { drawn(); plots[typeof id === 'string' ? id : id.id] = data; };
+const Plotly = { newPlot: plot, react: plot, purge() {}, Plots: { resize() {} } };
+
+const ctx = {
+    console: { log() {}, warn() {}, error: (...a) => process.stderr.write(a.join(' ') + '\n') },
+    atob, structuredClone, performance, document, Chart: FakeChart, Plotly, window: { print() {} },
+    Blob, URL, Worker: WebWorker,
+    localStorage: { getItem() { return null; }, setItem() {}, removeItem() {} },
+    // Notifications remove themselves after a few seconds; nothing else waits that long
+    setTimeout: (fn, ms) => (ms > 100 ? 0 : setTimeout(fn, ms)), clearTimeout,
+    Uint8Array, Uint16Array, Uint32Array, Int8Array, Int16Array, Int32Array, Float64Array
+};
+ctx.globalThis = ctx;
+vm.createContext(ctx);
+
+const tick = () => new Promise(resolve => setTimeout(resolve, 0));
+async function workerReady() {
+    while (vm.runInContext("typeof WorkerClient !== 'undefined' && WorkerClient.worker && !WorkerClient.ready", ctx)) {
+        await tick();
+    }
+}
+function finish(result) {
+    console.log(JSON.stringify(result));
+    workers.forEach(worker => worker.terminate());
+}
+async function setFilters(filters) {
+    for (const [name, id] of Object.entries(inputs)) byId(id).value = (filters && filters[name]) || '';
+    if (filters === null) await vm.runInContext('QueryPanel.resetFilters()', ctx);
+    else await vm.runInContext('QueryPanel.applyFilters()', ctx);
+}
+const inputs = { year: 'filterYear', school: 'filterSchool', gender: 'filterGender', nationality: 'filterNationality',
+    classification: 'filterClassification', attendanceStatus: 'filterAttendance', entryLevel: 'filterEntryLevel',
+    search: 'searchInput' };
+
+async function settle() {
+    await tick();
+    while (vm.runInContext("typeof LazyBundles !== 'undefined' && LazyBundles.pending.size", ctx)) await tick();
+    await tick();
+}
+
+function snapshot() {
+    const charts = {};
+    for (const [id, chart] of Object.entries(vm.runInContext('ChartsManager.charts', ctx))) {
+        charts[id] = JSON.stringify(chart && chart.data);
+    }
+    const text = {};
+    for (const [id, e] of Object.entries(elements)) {
+        if (e.innerHTML || e.textContent) text[id] = [e.innerHTML, e.textContent];
+    }
+    return { charts, plots: JSON.parse(JSON.stringify(plots)), text };
+}
+
+(async () => {
+    start = now();
+    vm.runInContext(inline, ctx, { filename: htmlPath });
+    const script = now() - start;
+
+    start = now();
+    await Promise.all((listeners.DOMContentLoaded || []).map(fn => fn()));
+    const ready = now() - start;
+    const result = { script_ms: script, first_ms: firstChart, ready_ms: ready, tabs: {} };
+    if (mode === 'time') {
+        for (const tab of tabs) {
+            start = now();
+            vm.runInContext(`QueryPanel.switchTab(${JSON.stringify(tab)})`, ctx);
+            await settle();
+            result.tabs[tab] = now() - start;
+        }
+        return finish(result);
+    }
+
+    await workerReady();
+    const values = vm.runInContext(`({ year: DataStore.getAcademicYears(), school: DataStore.getSchools(),
+        gender: DataStore.getGenders(), classification: DataStore.getClassifications(),
+        attendanceStatus: DataStore.getAttendanceStatuses(), nationality: DataStore.getNationalities(),
+        entryLevel: DataStore.getEntryLevels().map(String) })`, ctx);
+    const steps = [{}, { year: values.year[0] }, { school: values.school[0], gender: values.gender[0] },
+        { classification: values.classification[0] }, { attendanceStatus: values.attendanceStatus[0] },
+        { nationality: values.nationality[0] }, { entryLevel: values.entryLevel[0], school: values.school[1] },
+        { search: '10' }, { year: values.year[values.year.length - 1], school: values.school[1] }, null];
+
+    if (mode === 'filters') {
+        // Each filter change: total time, and the longest the main thread went without running a timer
+        result.filters = [];
+        for (const filters of steps) {
+            let last = now(), stall = 0;
+            const timer = setInterval(() => { stall = Math.max(stall, now() - last); last = now(); }, 1);
+            start = now();
+            await setFilters(filters);
+            const total = now() - start;
+            clearInterval(timer);
+            result.filters.push({ filters, total_ms: total, stall_ms: Math.max(stall, now() - last) });
+            await settle();
+        }
+        return finish(result);
+    }
+
+    // check: every tab under a series of filters, then the final state of everything
+    const snapshots = [];
+    for (const filters of steps) {
+        await setFilters(filters);
+        await settle();
+        for (const tab of tabs) {
+            vm.runInContext(`QueryPanel.switchTab(${JSON.stringify(tab)})`, ctx);
+            await settle();
+        }
+        snapshots.push({ filters, ...snapshot() });
+    }
+    result.snapshots = snapshots;
+    finish(result);
+})().catch(err => { console.error(err.stack || err); process.exit(1); });
+"""
+
+
+def run_harness(html_path, mode="time", tabs=TABS):
+    """
+    Run the page under node
+
+    Returns:
+        dict: timings in ms (and snapshots in check mode), or None without node
+    """
+    node = shutil.which("node")
+    if node is None:
+        return None
+    result = subprocess.run([node, "-e", NODE_HARNESS, str(html_path), mode, json.dumps(tabs)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"Time-to-first-chart run failed: {result.stderr.strip()[-500:]}")
+        return None
+    return json.loads(result.stdout)
+
+
+def same_snapshots(expected, actual):
+    """Compare two check runs' charts, plots and element text; print the differences"""
+    mismatches = []
+    for before, after in zip(expected["snapshots"], actual["snapshots"]):
+        for part in ("charts", "plots", "text"):
+            for key in sorted(set(before[part]) | set(after[part])):
+                if before[part].get(key) != after[part].get(key):
+                    mismatches.append((before["filters"], part, key))
+    for filters, part, key in mismatches[:10]:
+        print(f"MISMATCH after filters {filters}: {part} {key}")
+    if mismatches:
+        print(f"{len(mismatches)} mismatches")
+    return not mismatches
+
+
+def page_bytes(html_path):
+    """(HTML bytes, bytes of the bundles next to it)"""
+    bundle_dir = html_path.with_name(html_path.stem + "_bundles")
+    bundles = sum(p.stat().st_size for p in bundle_dir.glob("*.js")) if bundle_dir.exists() else 0
+    return html_path.stat().st_size, bundles
+
+
+def print_first_chart(html_path):
+    """One-line time-to-first-chart report for a freshly built page"""
+    timing = run_harness(html_path, tabs=[])
+    if timing is None:
+        print("(install node to time the first chart)")
+        return
+    print(f"Time to first chart: {timing['script_ms'] + timing['first_ms']:.0f} ms "
+          f"(script {timing['script_ms']:.0f} ms + init {timing['first_ms']:.0f} ms), "
+          f"ready {timing['script_ms'] + timing['ready_ms']:.0f} ms  (times from node)")
+
+
+def main():
+    from build_standalone import LAZY_OUT, OUT, build
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true",
+                        help="Also check that both builds draw identical charts and tables")
+    parser.add_argument("--no-cube", action="store_true", help="Compare builds without the aggregate cube")
+    args = parser.parse_args()
+    if shutil.which("node") is None:
+        print("node is required to run the dashboard script")
+        return 1
+
+    for bundles in (False, True):
+        build(cube=not args.no_cube, bundles=bundles)
+    pages = {"single file": OUT, "bundles": LAZY_OUT}
+    timings = {name: run_harness(path) for name, path in pages.items()}
+    if not all(timings.values()):
+        return 1
+
+    print("=" * 80)
+    print("Time to first chart: single-file build vs lazy bundles")
+    print("=" * 80)
+    print(f"{'':<24}{'single file':>16}{'bundles':>16}")
+    sizes = {name: page_bytes(path) for name, path in pages.items()}
+    print(f"{'HTML KB':<24}" + "".join(f"{sizes[n][0] / 1024:>16,.0f}" for n in pages))
+    print(f"{'Bundle files KB':<24}" + "".join(f"{sizes[n][1] / 1024:>16,.0f}" for n in pages))
+    rows = [("Script eval ms", lambda t: t["script_ms"]),
+            ("First chart ms", lambda t: t["script_ms"] + t["first_ms"]),
+            ("Ready ms", lambda t: t["script_ms"] + t["ready_ms"])]
+    rows += [(f"  open {tab} ms", lambda t, tab=tab: t["tabs"][tab]) for tab in TABS]
+    for label, value in rows:
+        print(f"{label:<24}" + "".join(f"{value(timings[n]):>16.1f}" for n in pages))
+    print("(times from node, from the start of the inline script; tab times include loading bundles)")
+    print("=" * 80)
+
+    if not args.check:
+        return 0
+    checks = {name: run_harness(path, mode="check") for name, path in pages.items()}
+    if not all(checks.values()):
+        return 1
+    if not same_snapshots(checks["single file"], checks["bundles"]):
+        return 1
+    steps = len(checks["bundles"]["snapshots"])
+    print(f"Both builds draw identical charts, tables and insights across {steps} filter states.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Chunked, resumable bulk import of the data/*.csv files into MySQL.
+
+Replaces database/import_data.sql. Each combined CSV is split by academic
+year and the chunks are upserted in parallel over a small connection pool
+(INSERT ... ON DUPLICATE KEY UPDATE on the schema's unique keys). The
+non-unique secondary indexes are dropped for the load and rebuilt after it.
+Every committed chunk is recorded in a checkpoint file with the hash of its
+rows, so a failed import resumes where it stopped, and a re-run after one
+year's data changed reloads only that year. The summary tables from
+create_summary_tables.sql are then refreshed for the years loaded.
+
+Rows are upserted, never deleted: a row removed from a CSV stays in the
+database. Run with --restart after truncating tables so the checkpoint does
+not skip their chunks.
+
+`--backend sqlite` runs the same import against a local SQLite database
+(the sqlite_backend.py schema), for testing without a MySQL server.
+
+Requires PyMySQL for the MySQL backend (pip install pymysql).
+
+Usage:
+  python scripts/import_data.py [--host H] [--port P] [--user U] [--database DB]
+  python scripts/import_data.py --backend sqlite [--db PATH]
+  python scripts/import_data.py ... [--workers 4] [--year 2025/26 ...] [--table attendance ...] [--restart]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import pymysql
+    HAVE_PYMYSQL = True
+except ImportError:
+    HAVE_PYMYSQL = False
+
+import sqlite_backend
+from datasets import csv_path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CHECKPOINT_DIR = PROJECT_ROOT / ".cache" / "import_data"
+CHECKPOINT_VERSION = 1
+
+BATCH_SIZE = 5_000
+WORKERS = 4
+
+# Parents first: course_enrolments references current_students
+LOAD_PHASES = [
+    ["current_students"],
+    ["course_enrolments", "course_results", "attendance", "degree_classifications"],
+]
+
+# Unique keys from create_database_schema.sql — the upsert targets, kept during the load
+UNIQUE_KEYS = {
+    "current_students": ["student_id", "academic_year"],
+    "course_enrolments": ["student_id", "course_code", "academic_year", "semester"],
+    "course_results": ["student_id", "course_code", "academic_year", "semester"],
+    "attendance": ["student_id", "course_code", "academic_year", "semester"],
+    "degree_classifications": ["student_id"],
+}
+
+# Non-unique indexes (MySQL names) dropped for the load and rebuilt after it
+SECONDARY_INDEXES = {
+    "current_students": {
+        "idx_student_id": ["student_id"],
+        "idx_academic_year": ["academic_year"],
+        "idx_programme_name": ["programme_name"],
+    },
+    "course_enrolments": {
+        "idx_student_id": ["student_id"],
+        "idx_course_code": ["course_code"],
+        "idx_academic_year": ["academic_year"],
+    },
+    "course_results": {
+        "idx_student_id": ["student_id"],
+        "idx_course_code": ["course_code"],
+        "idx_academic_year": ["academic_year"],
+    },
+    "attendance": {
+        "idx_student_id": ["student_id"],
+        "idx_course_code": ["course_code"],
+        "idx_academic_year": ["academic_year"],
+        "idx_student_year": ["student_id", "academic_year", "attendance_percentage"],
+    },
+    "degree_classifications": {
+        "idx_student_id": ["student_id"],
+        "idx_programme": ["programme"],
+        "idx_final_gpa": ["final_gpa"],
+    },
+}
+
+# Checkpoint key for tables without an Academic_Year column
+ALL_YEARS = "all"
+
+
+# ============================================================================
+# Targets
+# ============================================================================
+
+class MySQLTarget:
+    placeholder = "%s"
+
+    def __init__(self, host, port, user, password, database):
+        if not HAVE_PYMYSQL:
+            sys.exit("The MySQL backend needs PyMySQL: pip install pymysql "
+                     "(or use --backend sqlite)")
+        self.params = dict(host=host, port=port, user=user, password=password,
+                           database=database, charset="utf8mb4", autocommit=False)
+        self.name = f"mysql://{user}@{host}:{port}/{database}"
+
+    def connect(self):
+        conn = pymysql.connect(**self.params)
+        with conn.cursor() as cur:
+            # Chunks load in parallel, so a child chunk can commit before its parents
+            cur.execute("SET SESSION foreign_key_checks = 0")
+        return conn
+
+    def upsert_sql(self, table, columns):
+        updates = ", ".join(f"{c} = VALUES({c})" for c in columns if c not in UNIQUE_KEYS[table])
+        return (f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(self.placeholder for _ in columns)}) "
+                f"ON DUPLICATE KEY UPDATE {updates}")
+
+    def index_name(self, table, name):
+        return name
+
+    def existing_indexes(self, conn, table):
+        with conn.cursor() as cur:
+            cur.execute("SELECT DISTINCT index_name FROM information_schema.statistics "
+                        "WHERE table_schema = DATABASE() AND table_name = %s", (table,))
+            return {row[0] for row in cur.fetchall()}
+
+    def drop_index_sql(self, table, name):
+        return f"ALTER TABLE {table} DROP INDEX {name}"
+
+    def create_index_sql(self, table, name, columns):
+        return f"ALTER TABLE {table} ADD INDEX {name} ({', '.join(columns)})"
+
+    def academic_years(self, conn):
+        with conn.cursor() as cur:
+            cur.execute("SELECT DISTINCT academic_year FROM current_students")
+            return sorted(row[0] for row in cur.fetchall())
+
+    def refresh_summaries(self, conn, years):
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM information_schema.routines "
+                        "WHERE routine_schema = DATABASE() AND routine_name = 'refresh_summary_tables'")
+            if not cur.fetchone()[0]:
+                return False
+            for year in years:
+                cur.execute("CALL refresh_summary_tables(%s)", (year,))
+        conn.commit()
+        return True
+
+
+class SQLiteTarget:
+    """Local stand-in with the sqlite_backend.py schema; writers are serialized by SQLite"""
+    placeholder = "?"
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path).resolve()
+        self.name = f"sqlite://{self.db_path}"
+        self.created = False
+
+    def ensure_schema(self):
+        """Create an empty database with tables, indexes, views and summary tables"""
+        if self.db_path.exists():
+            return
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute("BEGIN")
+        for script in (sqlite_backend.SCHEMA_SQL, sqlite_backend.INDEXES_SQL,
+                       sqlite_backend.VIEWS_SQL, sqlite_backend.SUMMARY_SQL):
+            sqlite_backend.run_script(conn, script)
+        conn.execute("COMMIT")
+        conn.close()
+        self.created = True
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=300, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        return conn
+
+    def upsert_sql(self, table, columns):
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in UNIQUE_KEYS[table])
+        return (f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(self.placeholder for _ in columns)}) "
+                f"ON CONFLICT ({', '.join(UNIQUE_KEYS[table])}) DO UPDATE SET {updates}")
+
+    def index_name(self, table, name):
+        # SQLite index names are database-wide (see database/sqlite/create_indexes.sql)
+        return f"{table}_{name}"
+
+    def existing_indexes(self, conn, table):
+        return {row[1] for row in conn.execute(f"PRAGMA index_list({table})")}
+
+    def drop_index_sql(self, table, name):
+        return f"DROP INDEX {name}"
+
+    def create_index_sql(self, table, name, columns):
+        return f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"
+
+    def academic_years(self, conn):
+        return sorted(row[0] for row in conn.execute(
+            "SELECT DISTINCT academic_year FROM current_students"))
+
+    def refresh_summaries(self, conn, years):
+        conn.execute("BEGIN")
+        sqlite_backend.refresh_summaries(conn, years)
+        conn.commit()
+        return True
+
+
+class ConnectionPool:
+    """A fixed set of connections shared by the worker threads"""
+
+    def __init__(self, target, size):
+        self.connections = [target.connect() for _ in range(size)]
+        self.idle = queue.Queue()
+        for conn in self.connections:
+            self.idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.idle.get()
+        try:
+            yield conn
+        finally:
+            self.idle.put(conn)
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+
+
+# ============================================================================
+# Chunks
+# ============================================================================
+
+def split_by_year(table):
+    """
+    Read one table's CSV, converted, grouped by academic year
+
+    Returns:
+        dict: academic year (or ALL_YEARS) -> {"rows": [...], "sha256": hex}
+    """
+    dataset, columns = sqlite_backend.TABLES[table]
+    names = [column for column, _, _ in columns]
+    year_index = names.index("academic_year") if "academic_year" in names else None
+
+    chunks = {}
+    with open(csv_path(dataset), newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        positions = [(header.index(source), convert) for _, source, convert in columns]
+        for raw in reader:
+            if not raw:
+                continue
+            row = tuple(convert(raw[i]) for i, convert in positions)
+            year = row[year_index] if year_index is not None else ALL_YEARS
+            chunk = chunks.get(year)
+            if chunk is None:
+                chunk = chunks[year] = {"rows": [], "digest": hashlib.sha256()}
+            chunk["rows"].append(row)
+            chunk["digest"].update("\x1f".join(raw).encode("utf-8") + b"\n")
+
+    return {year: {"rows": c["rows"], "sha256": c["digest"].hexdigest()}
+            for year, c in chunks.items()}
+
+
+def load_chunk(pool, target, table, rows, batch_size):
+    """Worker: upsert one chunk in its own transaction"""
+    columns = [column for column, _, _ in sqlite_backend.TABLES[table][1]]
+    sql = target.upsert_sql(table, columns)
+    start = time.perf_counter()
+    with pool.connection() as conn:
+        cur = conn.cursor()
+        try:
+            for i in range(0, len(rows), batch_size):
+                cur.executemany(sql, rows[i:i + batch_size])
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+    return time.perf_counter() - start
+
+
+# ============================================================================
+# Checkpoint
+# ============================================================================
+
+def checkpoint_path(target):
+    return CHECKPOINT_DIR / (hashlib.sha1(target.name.encode("utf-8")).hexdigest()[:12] + ".json")
+
+
+def load_checkpoint(target):
+    path = checkpoint_path(target)
+    if path.exists():
+        checkpoint = json.loads(path.read_text(encoding="utf-8"))
+        if checkpoint.get("version") == CHECKPOINT_VERSION and checkpoint.get("target") == target.name:
+            return checkpoint
+    return {"version": CHECKPOINT_VERSION, "target": target.name, "chunks": {}}
+
+
+def save_checkpoint(target, checkpoint):
+    path = checkpoint_path(target)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(checkpoint, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ============================================================================
+# Secondary indexes
+# ============================================================================
+
+def drop_secondary_indexes(target, conn, tables):
+    for table in tables:
+        existing = target.existing_indexes(conn, table)
+        for name in SECONDARY_INDEXES[table]:
+            index = target.index_name(table, name)
+            if index in existing:
+                conn.cursor().execute(target.drop_index_sql(table, index))
+    conn.commit()
+
+
+def create_secondary_indexes(target, conn, tables):
+    """Rebuild any secondary index that is missing — also repairs an interrupted run"""
+    start = time.perf_counter()
+    for table in tables:
+        existing = target.existing_indexes(conn, table)
+        for name, columns in SECONDARY_INDEXES[table].items():
+            index = target.index_name(table, name)
+            if index not in existing:
+                conn.cursor().execute(target.create_index_sql(table, index, columns))
+    conn.commit()
+    return time.perf_counter() - start
+
+
+# ============================================================================
+# Import
+# ============================================================================
+
+def import_data(target, tables=None, years=None, workers=WORKERS,
+                batch_size=BATCH_SIZE, restart=False, refresh=True):
+    """
+    Upsert every changed (table, academic year) chunk
+
+    Returns:
+        dict: table -> {"rows": n, "chunks": loaded, "skipped": unchanged}
+    """
+    if isinstance(target, SQLiteTarget):
+        target.ensure_schema()
+    tables = [t for phase in LOAD_PHASES for t in phase if tables is None or t in tables]
+    checkpoint = load_checkpoint(target)
+    if restart or getattr(target, "created", False):
+        checkpoint["chunks"] = {}
+
+    stats = {table: {"rows": 0, "chunks": 0, "skipped": 0, "seconds": 0.0} for table in tables}
+    start = time.perf_counter()
+
+    # Plan: the chunks whose rows changed since the checkpoint, per load phase
+    phases = []
+    for phase in LOAD_PHASES:
+        pending = []
+        for table in (t for t in phase if t in tables):
+            for year, chunk in sorted(split_by_year(table).items()):
+                if years and year != ALL_YEARS and year not in years:
+                    continue
+                if checkpoint["chunks"].get(f"{table}:{year}", {}).get("sha256") == chunk["sha256"]:
+                    stats[table]["skipped"] += 1
+                    continue
+                pending.append((table, year, chunk))
+        if pending:
+            phases.append(pending)
+    changed_tables = sorted({table for pending in phases for table, _, _ in pending})
+
+    loaded_years = set()
+    index_s = 0.0
+    admin = target.connect()
+    if phases:
+        pool = ConnectionPool(target, workers)
+        drop_secondary_indexes(target, admin, changed_tables)
+        try:
+            for pending in phases:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = {executor.submit(load_chunk, pool, target, table, chunk["rows"], batch_size):
+                               (table, year, chunk) for table, year, chunk in pending}
+                    try:
+                        for future in as_completed(futures):
+                            table, year, chunk = futures[future]
+                            seconds = future.result()
+                            rows = len(chunk["rows"])
+                            checkpoint["chunks"][f"{table}:{year}"] = {"sha256": chunk["sha256"], "rows": rows}
+                            save_checkpoint(target, checkpoint)
+                            stats[table]["rows"] += rows
+                            stats[table]["chunks"] += 1
+                            stats[table]["seconds"] += seconds
+                            loaded_years.add(year)
+                            print(f"  {table:<24}{year:>8}{rows:>9,} rows  {seconds:6.2f}s")
+                    except BaseException:
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        raise
+        finally:
+            pool.close()
+            index_s = create_secondary_indexes(target, admin, changed_tables)
+
+    refreshed = []
+    if refresh and loaded_years:
+        refresh_years = (target.academic_years(admin) if ALL_YEARS in loaded_years
+                         else sorted(loaded_years))
+        if target.refresh_summaries(admin, refresh_years):
+            refreshed = refresh_years
+    admin.close()
+
+    print_stats(stats, index_s, refreshed, time.perf_counter() - start)
+    return stats
+
+
+def print_stats(stats, index_s, refreshed, total_s):
+    print(f"\n{'Table':<26}{'Chunks':>8}{'Skipped':>9}{'Rows':>10}{'Rows/s':>10}")
+    for table, s in stats.items():
+        rate = f"{s['rows'] / s['seconds']:,.0f}" if s["seconds"] else "-"
+        print(f"{table:<26}{s['chunks']:>8}{s['skipped']:>9}{s['rows']:>10,}{rate:>10}")
+    print(f"Secondary indexes rebuilt in {index_s:.2f}s")
+    if refreshed:
+        print(f"Summary tables refreshed for {', '.join(refreshed)}")
+    print(f"Total: {total_s:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked, resumable import of data/*.csv")
+    parser.add_argument("--backend", choices=["mysql", "sqlite"], default="mysql")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", default=os.environ.get("USER", "root"))
+    parser.add_argument("--database", default="student_performance_db")
+    parser.add_argument("--db", type=Path, default=sqlite_backend.DEFAULT_DB,
+                        help="SQLite database for --backend sqlite")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Connections in the pool")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--table", action="append", choices=list(UNIQUE_KEYS), dest="tables",
+                        help="Only import this table (repeatable)")
+    parser.add_argument("--year", action="append", dest="years",
+                        help="Only import this academic year, e.g. 2025/26 (repeatable)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint")
+    parser.add_argument("--no-refresh", action="store_true", help="Skip the summary-table refresh")
+    args = parser.parse_args()
+
+    if args.backend == "mysql":
+        # Password from the environment, as the mysql client does
+        target = MySQLTarget(args.host, args.port, args.user,
+                             os.environ.get("MYSQL_PWD", ""), args.database)
+    else:
+        target = SQLiteTarget(args.db)
+
+    print(f"Importing into {target.name} with {args.workers} connections")
+    import_data(target, tables=args.tables, years=args.years, workers=args.workers,
+                batch_size=args.batch_size, restart=args.restart, refresh=not args.no_refresh)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Stage timers, row counters and optional profiling for the pipeline scripts.
+
+Scripts call add_arguments() on their parser and wrap their work in
+session(); inside it, stage() times a block and counts the rows it read or
+wrote. Every finished stage, and the run as a whole, is emitted as one JSON
+object per line:
+
+  {"event": "stage", "script": "combine_course_results", "stage": "read_reports",
+   "wall_s": 0.412, "cpu_s": 0.409, "rows": 62431, "rows_per_s": 151531.6,
+   "peak_rss_mb": 48.1, "pid": 4242, "ts": "2026-10-18T05:02:11+00:00"}
+
+Events go to the file given by --metrics (appended, "-" for stderr) or by
+the PIPELINE_METRICS environment variable, and are discarded when neither
+is set. --profile PATH additionally runs the session under cProfile and
+writes the pstats file there (inspect it with `python -m pstats PATH`).
+"""
+
+import cProfile
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+    HAVE_RESOURCE = True
+except ImportError:
+    HAVE_RESOURCE = False
+
+METRICS_ENV = "PIPELINE_METRICS"
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+_script = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+_metrics_path = os.environ.get(METRICS_ENV)
+
+
+def peak_rss_mb():
+    if not HAVE_RESOURCE:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT / (1024 * 1024), 1)
+
+
+def emit(event, **fields):
+    """Write one event as a JSON line to the configured metrics sink"""
+    if not _metrics_path:
+        return
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "script": _script,
+        "pid": os.getpid(),
+        "event": event,
+        **fields,
+    }
+    line = json.dumps(record, default=str) + "\n"
+    if _metrics_path == "-":
+        sys.stderr.write(line)
+        sys.stderr.flush()
+    else:
+        # One write per event in append mode, so concurrent scripts can share a file
+        with open(_metrics_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class Stage:
+    """
+    Wall and CPU timer plus row counter for one named stage
+
+    Used through stage() for a single block. For a stage spread over a loop,
+    create it directly, enter it once per iteration (or wrap the loop's
+    iterable in iter()) and call emit() after the loop.
+    """
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields
+        self.rows = 0
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self._started = None
+
+    def __enter__(self):
+        self._started = (time.perf_counter(), time.process_time())
+        return self
+
+    def __exit__(self, *exc):
+        wall, cpu = self._started
+        self.wall_s += time.perf_counter() - wall
+        self.cpu_s += time.process_time() - cpu
+        self._started = None
+
+    def add_rows(self, n):
+        self.rows += n
+
+    def iter(self, iterable):
+        """Yield from iterable, timing only the time spent producing each item"""
+        iterator = iter(iterable)
+        while True:
+            with self:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def emit(self, **fields):
+        emit("stage", stage=self.name,
+             wall_s=round(self.wall_s, 4),
+             cpu_s=round(self.cpu_s, 4),
+             rows=self.rows or None,
+             rows_per_s=round(self.rows / self.wall_s, 1) if self.rows and self.wall_s else None,
+             peak_rss_mb=peak_rss_mb(),
+             **self.fields, **fields)
+
+
+@contextmanager
+def stage(name, **fields):
+    """Time a block as one stage; call .add_rows() on the yielded Stage to count rows"""
+    timer = Stage(name, **fields)
+    failed = True
+    try:
+        with timer:
+            yield timer
+        failed = False
+    finally:
+        timer.emit(**({"failed": True} if failed else {}))
+
+
+def timed(name=None):
+    """Decorator form of stage(); the stage name defaults to the function name"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def add_arguments(parser):
+    parser.add_argument("--metrics", metavar="PATH",
+                        help=f"append JSON-lines stage timings to PATH ('-' for stderr; "
+                             f"default ${METRICS_ENV})")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="run under cProfile and write pstats output to PATH")
+
+
+@contextmanager
+def session(script, args=None):
+    """
+    Instrument a whole script run: configure the sink from --metrics, profile
+    when --profile was given, and emit a final "run" event with the exit
+    status (SystemExit codes included)
+    """
+    global _script, _metrics_path
+    _script = script
+    metrics = getattr(args, "metrics", None)
+    profile = getattr(args, "profile", None)
+    if metrics:
+        _metrics_path = metrics
+
+    profiler = cProfile.Profile() if profile else None
+    status = 1
+    run = Stage(script)
+    try:
+        with run:
+            if profiler:
+                profiler.enable()
+            try:
+                yield
+            finally:
+                if profiler:
+                    profiler.disable()
+                    profiler.dump_stats(profile)
+        status = 0
+    except SystemExit as exc:
+        status = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+        raise
+    finally:
+        emit("run", wall_s=round(run.wall_s, 4), cpu_s=round(run.cpu_s, 4),
+             peak_rss_mb=peak_rss_mb(), status=status, argv=sys.argv[1:],
+             profile=profile)
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Packed column payload for the standalone dashboard.
+
+Each CSV is stored column-wise:
+  - "number"  integers and fixed-point decimals stored as scaled offsets in the
+              smallest Uint8/16/32 array ((offset + value) / scale), other
+              floats as Float64
+  - "dict"    strings stored once in a dictionary plus a Uint8/16/32 index array
+Typed arrays are little-endian and base64 encoded. js/standalone/packedData.js
+decodes them back into the same row objects Papa.parse would produce, so the
+DataLoader processors run unchanged. Only the columns the dashboard consumes
+are packed (see projection.py).
+
+A column is only stored numerically if the decoded number prints back as the
+exact CSV text (JavaScript String() or Python float repr style, e.g. "82.0");
+anything else is dictionary encoded.
+
+Usage:
+  python scripts/packed_data.py           # print size/decode comparison
+"""
+
+import base64
+import json
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from projection import csv_text, project_table, read_csv_table
+
+UINT_TYPES = [("Uint8", "<u1"), ("Uint16", "<u2"), ("Uint32", "<u4")]
+FLOAT_TYPE = ("Float64", "<f8")
+
+DECODER_JS = Path(__file__).resolve().parent.parent / "js" / "standalone" / "packedData.js"
+
+# Times PackedData.toRows against a split-based CSV parse (a lower bound on
+# Papa.parse, which also handles quoting) in the JS engine
+NODE_TIMING_SCRIPT = r"""
+const fs = require('fs'), vm = require('vm');
+const [decoderPath, payloadPath, csvPath] = process.argv.slice(1);
+const ctx = { atob, globalThis: null }; ctx.globalThis = ctx;
+Object.assign(ctx, { Uint8Array, Uint16Array, Uint32Array, Int8Array, Int16Array, Int32Array, Float64Array });
+vm.createContext(ctx);
+vm.runInContext(fs.readFileSync(decoderPath, 'utf8') + ';this.PackedData = PackedData;', ctx);
+const payload = JSON.parse(fs.readFileSync(payloadPath, 'utf8'));
+const csv = JSON.parse(fs.readFileSync(csvPath, 'utf8'));
+function splitParse(text) {
+    const lines = text.split(/\r?\n/), header = lines[0].split(','), rows = [];
+    for (let i = 1; i < lines.length; i++) {
+        if (!lines[i]) continue;
+        const f = lines[i].split(','), row = {};
+        for (let j = 0; j < header.length; j++) row[header[j]] = f[j];
+        rows.push(row);
+    }
+    return rows;
+}
+function median(fn) {
+    const times = [];
+    for (let r = 0; r < 5; r++) { const t = performance.now(); fn(); times.push(performance.now() - t); }
+    return times.sort((a, b) => a - b)[2];
+}
+const out = {};
+for (const key of Object.keys(payload)) {
+    out[key] = {
+        decode_ms: median(() => ctx.PackedData.toRows(JSON.parse(JSON.stringify(payload[key])))),
+        csv_ms: median(() => splitParse(JSON.parse(JSON.stringify(csv[key])))),
+    };
+}
+console.log(JSON.stringify(out));
+"""
+
+_NUMBER = re.compile(r"-?\d+(\.\d+)?$")
+# Keeps decoded values above 1e-4, where String(number) never uses exponents
+MAX_DECIMALS = 4
+
+
+def _column(rows, j):
+    """Column j as strings, None where a short row has no value"""
+    return [row[j] if j < len(row) else None for row in rows]
+
+
+def _smallest_type(low, high, types):
+    for name, dtype in types:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return name, dtype
+    return None
+
+
+def _b64(array, dtype):
+    return base64.b64encode(np.asarray(array, dtype=dtype).tobytes()).decode("ascii")
+
+
+def _js_number_string(value):
+    """String(value) in JavaScript, for magnitudes between 1e-4 and 1e16"""
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+def _number_format(numeric, parsed):
+    """"js" if the text is String(number), "repr" if Python float repr, else None"""
+    if all(v == _js_number_string(x) for v, x in zip(numeric, parsed)):
+        return "js"
+    if all(v == repr(x) for v, x in zip(numeric, parsed)):
+        return "repr"
+    return None
+
+
+def _pack_numeric(values):
+    """
+    Encode numeric text as scaled integers, or None if it would not round-trip
+
+    One non-numeric token per column (e.g. 'NP') is allowed and stored as the
+    integer type's minimum value.
+    """
+    if not values or any(v is None for v in values):
+        return None
+    distinct = set(values)
+    tokens = [v for v in distinct if not _NUMBER.match(v)]
+    if len(tokens) > 1 or len(tokens) == len(distinct):
+        return None
+    token = tokens[0] if tokens else None
+
+    numeric = [v for v in distinct if v != token]
+    parsed = [float(v) for v in numeric]
+    fmt = _number_format(numeric, parsed)
+    if fmt is None:
+        return None
+    column = {"kind": "number", "format": fmt}
+    if token is not None:
+        column["token"] = token
+    return _pack_scaled(values, numeric, parsed, column) or _pack_float(values, numeric, parsed, column)
+
+
+def _pack_scaled(values, numeric, parsed, column):
+    """Fixed-point columns as scaled integer offsets; the token is the type's maximum"""
+    decimals = max(len(v) - v.index(".") - 1 if "." in v else 0 for v in numeric)
+    if decimals > MAX_DECIMALS:
+        return None
+    scale = 10 ** decimals
+    scaled = {v: round(x * scale) for v, x in zip(numeric, parsed)}
+    # Decoding divides by scale; the correctly rounded quotient must be the
+    # same double the CSV text parses to
+    if any(scaled[v] / scale != x for v, x in zip(numeric, parsed)):
+        return None
+    # Store offsets from the column minimum so e.g. student IDs fit in Uint16
+    offset = min(scaled.values())
+    span = max(scaled.values()) - offset
+    chosen = _smallest_type(0, span + 1 if "token" in column else span, UINT_TYPES)
+    if chosen is None:
+        return None
+    type_name, dtype = chosen
+    sentinel = int(np.iinfo(dtype).max) + offset
+    return dict(column, scale=scale, offset=offset, type=type_name,
+                data=_b64([scaled.get(v, sentinel) - offset for v in values], dtype))
+
+
+def _pack_float(values, numeric, parsed, column):
+    """Arbitrary-precision floats as Float64; the token is NaN"""
+    lookup = dict(zip(numeric, parsed))
+    type_name, dtype = FLOAT_TYPE
+    return dict(column, scale=1, type=type_name,
+                data=_b64([lookup.get(v, float("nan")) for v in values], dtype))
+
+
+def _pack_dict(values):
+    dictionary = {}
+    codes = [dictionary.setdefault(v, len(dictionary)) for v in values]
+    type_name, dtype = _smallest_type(0, max(len(dictionary) - 1, 0), UINT_TYPES)
+    return {"kind": "dict", "values": list(dictionary), "type": type_name, "data": _b64(codes, dtype)}
+
+
+def pack_table(header, rows):
+    """Pack one CSV into the column payload"""
+    columns = []
+    for j, name in enumerate(header):
+        values = _column(rows, j)
+        # Keep whichever encoding is smaller (dictionaries win for repeated floats)
+        candidates = [c for c in (_pack_numeric(values), _pack_dict(values)) if c]
+        column = min(candidates, key=lambda c: len(json.dumps(c)))
+        columns.append({"name": name, **column})
+    return {"rows": len(rows), "columns": columns}
+
+
+# ============================================================================
+# Reference decoder (mirrors js/standalone/packedData.js; used to verify builds)
+# ============================================================================
+
+def _typed(column):
+    dtype = dict(UINT_TYPES + [FLOAT_TYPE])[column["type"]]
+    return np.frombuffer(base64.b64decode(column["data"]), dtype=dtype)
+
+
+def _decode_number(value, column):
+    if "token" in column:
+        if column["type"] == FLOAT_TYPE[0]:
+            is_token = value != value  # NaN
+        else:
+            is_token = value == np.iinfo(dict(UINT_TYPES)[column["type"]]).max
+        if is_token:
+            return column["token"]
+    number = (value + column.get("offset", 0)) / column["scale"]
+    if column["format"] == "repr":
+        return repr(float(number))
+    return _js_number_string(number)
+
+
+def unpack_table(table):
+    """Decode a packed table back to row dicts (missing values omitted)"""
+    decoded = []
+    for column in table["columns"]:
+        data = _typed(column).tolist()
+        if column["kind"] == "dict":
+            values = column["values"]
+            decoded.append([values[i] for i in data])
+        else:
+            decoded.append([_decode_number(v, column) for v in data])
+
+    names = [c["name"] for c in table["columns"]]
+    rows = []
+    for i in range(table["rows"]):
+        rows.append({name: col[i] for name, col in zip(names, decoded) if col[i] is not None})
+    return rows
+
+
+def rows_as_dicts(header, rows):
+    return [{name: row[j] for j, name in enumerate(header) if j < len(row)} for row in rows]
+
+
+def time_js_decode(payload, csv_texts):
+    """
+    Time the browser decoder under node, if it is installed
+
+    Returns:
+        dict: dataset -> {"decode_ms", "csv_ms"}, or None without node
+    """
+    node = shutil.which("node")
+    if node is None:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        payload_path = Path(tmp) / "payload.json"
+        csv_path = Path(tmp) / "csv.json"
+        payload_path.write_text(json.dumps(payload), encoding="utf-8")
+        csv_path.write_text(json.dumps(csv_texts), encoding="utf-8")
+        result = subprocess.run(
+            [node, "-e", NODE_TIMING_SCRIPT, str(DECODER_JS), str(payload_path), str(csv_path)],
+            capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"JS decode timing failed: {result.stderr.strip()}")
+        return None
+    return json.loads(result.stdout)
+
+
+def pack_files(csv_files, verify=True):
+    """
+    Pack the projected columns of every CSV, checking the round trip with
+    the reference decoder
+
+    Returns:
+        tuple: (payload dict, list of per-dataset stats)
+    """
+    payload = {}
+    csv_texts = {}
+    stats = []
+    for key, path in csv_files.items():
+        header, rows = project_table(key, *read_csv_table(path))
+        csv_texts[key] = csv_text(header, rows)
+        table = pack_table(header, rows)
+        if verify and unpack_table(table) != rows_as_dicts(header, rows):
+            raise ValueError(f"Packed payload for {key} does not round-trip")
+
+        payload[key] = table
+        stats.append({
+            "dataset": key,
+            "rows": len(rows),
+            "csv_bytes": len(json.dumps(csv_texts[key])),
+            "packed_bytes": len(json.dumps(table, separators=(",", ":"))),
+            "kinds": {k: sum(c["kind"] == k for c in table["columns"]) for k in ("number", "dict")},
+        })
+
+    timings = time_js_decode(payload, csv_texts)
+    for s in stats:
+        s.update((timings or {}).get(s["dataset"], {}))
+    return payload, stats
+
+
+def print_comparison(stats):
+    timed = all("decode_ms" in s for s in stats)
+    print("=" * 88)
+    print("Embedded payload: CSV text vs packed columns")
+    print("=" * 88)
+    print(f"{'Dataset':<16}{'Rows':>8}{'CSV KB':>9}{'Packed KB':>11}{'Ratio':>8}"
+          f"{'CSV split':>11}{'Decode':>9}  number/dict")
+    for s in stats:
+        k = s["kinds"]
+        times = (f"{s['csv_ms']:>9.1f}ms{s['decode_ms']:>7.1f}ms" if timed else f"{'-':>11}{'-':>9}")
+        print(f"{s['dataset']:<16}{s['rows']:>8,}{s['csv_bytes'] / 1024:>9.0f}"
+              f"{s['packed_bytes'] / 1024:>11.0f}{s['csv_bytes'] / s['packed_bytes']:>7.1f}x"
+              f"{times}  {k['number']}/{k['dict']}")
+    csv_total = sum(s["csv_bytes"] for s in stats)
+    packed_total = sum(s["packed_bytes"] for s in stats)
+    print("-" * 88)
+    totals = (f"{sum(s['csv_ms'] for s in stats):>9.1f}ms{sum(s['decode_ms'] for s in stats):>7.1f}ms"
+              if timed else "")
+    print(f"{'Total':<16}{'':>8}{csv_total / 1024:>9.0f}{packed_total / 1024:>11.0f}"
+          f"{csv_total / packed_total:>7.1f}x{totals}")
+    if timed:
+        print("(times from node: split-based CSV parse, a lower bound on Papa.parse, vs PackedData.toRows)")
+    else:
+        print("(install node to time JS decoding)")
+    print("=" * 88)
+
+
+if __name__ == "__main__":
+    from aggregates import CSV_FILES
+    print_comparison(pack_files(CSV_FILES)[1])
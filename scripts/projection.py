@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Column projection for the dashboard payloads.
+
+DataLoader's processors read a fixed set of columns from each CSV; the rest
+(home addresses, national ID and mobile numbers, personal and university
+e-mail addresses, employment history, ...) is parsed and thrown away on
+every page load. The columns kept are declared per dataset in datasets.py
+("consumed" plus "required", compared trimmed); everything else is dropped
+from the standalone build, the query service's /api/csv responses and the
+cached columnar copies (.cache/datasets/, data/columnar/).
+
+The declaration is checked against the row['...'] reads of each processor
+in js/dataLoader.js, so a processor that starts reading a new column fails
+the build instead of silently seeing undefined.
+
+Usage:
+  python scripts/projection.py            # bytes and parse time saved per dataset
+"""
+
+import csv
+import io
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from datasets import DATASETS, csv_path, projected_columns
+
+DATALOADER_JS = Path(__file__).resolve().parent.parent / "js" / "dataLoader.js"
+
+_PROCESSOR = re.compile(r"\n    (process\w+Data)\(data[^)]*\) \{(.*?)\n    \},", re.S)
+_CALL = re.compile(r"this\.(process\w+Data)\(rawData\.(\w+)")
+_READ = re.compile(r"row\['([^']+)'\]")
+
+
+def processor_reads(source=None):
+    """Dataset -> trimmed column names its DataLoader processor reads"""
+    source = source if source is not None else DATALOADER_JS.read_text(encoding="utf-8")
+    bodies = {m.group(1): m.group(2) for m in _PROCESSOR.finditer(source)}
+    reads = {}
+    for processor, dataset in _CALL.findall(source):
+        reads.setdefault(dataset, set()).update(col.strip() for col in _READ.findall(bodies.get(processor, "")))
+    return reads
+
+
+@lru_cache(maxsize=None)
+def check_declared():
+    """Raise ValueError if a processor reads a column missing from the declared schema"""
+    undeclared = []
+    for dataset, reads in processor_reads().items():
+        declared = {col.strip() for col in DATASETS[dataset]["consumed"]}
+        undeclared += [f"{dataset}: {col}" for col in sorted(reads - declared)]
+    if undeclared:
+        raise ValueError("js/dataLoader.js reads columns not declared as consumed in datasets.py — "
+                         + ", ".join(undeclared))
+
+
+def read_csv_table(path):
+    """Header and data rows, skipping empty lines like Papa's skipEmptyLines"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader if row]
+    return header, rows
+
+
+def project_table(name, header, rows):
+    """Keep the dataset's projected columns; short rows stay short"""
+    check_declared()
+    keep = set(projected_columns(name, header))
+    indexes = [j for j, col in enumerate(header) if col in keep]
+    return [header[j] for j in indexes], [[row[j] for j in indexes if j < len(row)] for row in rows]
+
+
+def projected_csv(name, path=None):
+    """CSV text of the projected columns, for Papa.parse in the browser"""
+    return csv_text(*project_table(name, *read_csv_table(path or csv_path(name))))
+
+
+def csv_text(header, rows):
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def main():
+    from packed_data import pack_table, time_js_decode
+
+    check_declared()
+    payload = {"full": {}, "projected": {}}
+    texts = {"full": {}, "projected": {}}
+    dropped = {}
+    for name in DATASETS:
+        header, rows = read_csv_table(csv_path(name))
+        kept_header, kept_rows = project_table(name, header, rows)
+        dropped[name] = [col for col in header if col not in kept_header]
+        texts["full"][name] = csv_path(name).read_text(encoding="utf-8")
+        texts["projected"][name] = csv_text(kept_header, kept_rows)
+        payload["full"][name] = pack_table(header, rows)
+        payload["projected"][name] = pack_table(kept_header, kept_rows)
+    timings = {variant: time_js_decode(payload[variant], texts[variant]) for variant in payload}
+    timed = all(timings.values())
+
+    print("=" * 96)
+    print("Column projection: full CSV vs the columns the dashboard consumes")
+    print("=" * 96)
+    print(f"{'Dataset':<16}{'Columns':>10}{'CSV KB':>15}{'Packed KB':>15}"
+          f"{'CSV parse ms':>18}{'Decode ms':>16}")
+    totals = {"csv": [0, 0], "packed": [0, 0], "csv_ms": [0.0, 0.0], "decode_ms": [0.0, 0.0]}
+    for name in DATASETS:
+        csv_kb = [len(texts[v][name].encode("utf-8")) / 1024 for v in ("full", "projected")]
+        packed_kb = [len(json.dumps(payload[v][name], separators=(",", ":"))) / 1024 for v in ("full", "projected")]
+        n_full = len(payload["full"][name]["columns"])
+        n_kept = len(payload["projected"][name]["columns"])
+        line = (f"{name:<16}{n_kept:>5}/{n_full:<4}{csv_kb[0]:>7.0f}->{csv_kb[1]:<6.0f}"
+                f"{packed_kb[0]:>7.0f}->{packed_kb[1]:<6.0f}")
+        for i in range(2):
+            totals["csv"][i] += csv_kb[i]
+            totals["packed"][i] += packed_kb[i]
+        if timed:
+            ms = {key: [timings[v][name][key] for v in ("full", "projected")] for key in ("csv_ms", "decode_ms")}
+            for key, values in ms.items():
+                totals[key][0] += values[0]
+                totals[key][1] += values[1]
+            line += f"{ms['csv_ms'][0]:>9.1f}->{ms['csv_ms'][1]:<7.1f}{ms['decode_ms'][0]:>8.1f}->{ms['decode_ms'][1]:<7.1f}"
+        print(line)
+    print("-" * 96)
+    line = (f"{'Total':<16}{'':>10}{totals['csv'][0]:>7.0f}->{totals['csv'][1]:<6.0f}"
+            f"{totals['packed'][0]:>7.0f}->{totals['packed'][1]:<6.0f}")
+    if timed:
+        line += (f"{totals['csv_ms'][0]:>9.1f}->{totals['csv_ms'][1]:<7.1f}"
+                 f"{totals['decode_ms'][0]:>8.1f}->{totals['decode_ms'][1]:<7.1f}")
+    print(line)
+    print(f"Saved: {totals['csv'][0] - totals['csv'][1]:,.0f} KB of CSV, "
+          f"{totals['packed'][0] - totals['packed'][1]:,.0f} KB of packed payload")
+    if timed:
+        print("(times from node: split-based CSV parse, a lower bound on Papa.parse, and PackedData.toRows)")
+    else:
+        print("(install node to time JS parsing)")
+    print("=" * 96)
+    for name, columns in dropped.items():
+        if columns:
+            print(f"Dropped from {name}: {', '.join(col.strip() for col in columns)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
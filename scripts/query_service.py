@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Local asyncio query service for the dashboard aggregates.
+
+Loads the six datasets once into DataLoader-shaped rows (aggregates.py) and
+answers the DataStore metric methods for a year/school/programme/gender
+filter set as JSON, so any number of browser tabs and scripts share one
+parse and one set of results instead of each aggregating the CSVs itself:
+
+  GET /api/health                          datasets loaded, row counts, load time
+  GET /api/filters                         dropdown values (years, schools, ...)
+  GET /api/metrics?year=2021/22&school=... every cube method, or ?method=NAME&method=...
+  GET /api/enrolment-by-year?...           single methods under readable names
+  GET /api/programme-comparison?...          (see ENDPOINTS)
+  GET /api/classification-by-programme?...
+  GET /api/attendance-risk?...
+  GET /api/csv/<dataset>                   CSV text of the consumed columns, for the thin client
+  GET /api/stats                           cache hits, misses, size, reloads
+
+Results are kept in an LRU cache keyed by filter set and method. The data
+files are polled for changes; a change reloads the tables in the background
+and empties the cache.
+
+The service only ever binds a loopback address, and answers only requests
+that name a loopback Host (no DNS rebinding) and carry the token generated
+for this run, as ?token= or an X-Query-Token header. The token is written to
+.cache/query_service/token, where build_standalone.py --api picks it up.
+Browser pages may read responses only from the file:// thin client (origin
+"null") or an origin given with --allow-origin; any other Origin is refused.
+
+Build a dashboard that queries it (after starting the service) with:
+  python scripts/build_standalone.py --api http://127.0.0.1:8765
+
+Usage:
+  python scripts/query_service.py [--port 8765] [--cache-size 512] [--poll 2.0]
+                                  [--allow-origin ORIGIN ...]
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import hmac
+import json
+import os
+import re
+import secrets
+import socket
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from aggregates import CSV_FILES, CUBE_METHODS, DashboardAggregates, cube_key, load_tables
+from projection import projected_csv
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 512
+DEFAULT_POLL = 2.0
+
+# Readable endpoint -> DataStore method
+ENDPOINTS = {
+    "enrolment-by-year": "getEnrollmentByYear",
+    "programme-comparison": "getProgrammeComparison",
+    "classification-by-programme": "getClassificationByProgramme",
+    "attendance-risk": "getAttendanceRiskOverview",
+}
+
+FILTERS = ["year", "school", "programme", "gender"]
+
+# Requests larger than this (request line plus headers) are refused
+MAX_REQUEST_BYTES = 16 * 1024
+
+# This run's access token, read by build_standalone.py --api
+TOKEN_FILE = Path(__file__).resolve().parent.parent / ".cache" / "query_service" / "token"
+TOKEN_HEADER = "x-query-token"
+
+# Origin of pages opened from file://, such as the thin client
+FILE_ORIGIN = "null"
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+           404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+def is_loopback(host):
+    """True if every address host resolves to is a loopback address"""
+    try:
+        infos = socket.getaddrinfo(host, None)
+    except socket.gaierror:
+        return False
+    return all(ipaddress.ip_address(info[4][0]).is_loopback for info in infos)
+
+
+def is_loopback_host(value):
+    """
+    True if a Host header names localhost or a loopback IP literal. Names are
+    not resolved: a rebinding attacker's domain may resolve to 127.0.0.1.
+    """
+    try:
+        hostname = urlsplit(f"//{value}").hostname
+    except ValueError:
+        return False
+    if hostname == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(hostname).is_loopback
+    except ValueError:
+        return False
+
+
+def write_token(token, path=TOKEN_FILE):
+    """Store the run's token where only this user can read it"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+
+
+def read_token(path=TOKEN_FILE):
+    """The token of the running service, or None if it has not been started"""
+    try:
+        return path.read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None if it is missing"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# ============================================================================
+# Loaded data and result cache
+# ============================================================================
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class Snapshot:
+    """One immutable load of the datasets, with the filter values they offer"""
+
+    def __init__(self, csv_files=CSV_FILES):
+        start = time.perf_counter()
+        self.signatures = {name: file_signature(path) for name, path in csv_files.items()}
+        self.csv_text = {name: projected_csv(name, path).encode("utf-8") for name, path in csv_files.items()}
+        self.tables = load_tables(csv_files)
+        base = DashboardAggregates(self.tables)
+        self.filter_values = {
+            "years": base.academic_years(),
+            "schools": base.schools(),
+            "programmes": base.programmes(),
+            "genders": base.genders(),
+        }
+        self.loaded_at = time.time()
+        self.load_s = time.perf_counter() - start
+
+    def check_filters(self, filters):
+        for name, values in zip(FILTERS, ("years", "schools", "programmes", "genders")):
+            if filters[name] and filters[name] not in self.filter_values[values]:
+                raise HTTPError(400, f"unknown {name}: {filters[name]!r}")
+
+    def compute(self, filters, methods):
+        """Run DataStore methods against the rows selected by filters"""
+        students = DashboardAggregates.filter_students(self.tables, *(filters[f] for f in FILTERS))
+        filtered = DashboardAggregates.filter_related(self.tables, students)
+        return DashboardAggregates(self.tables, filtered).compute(methods)
+
+
+class QueryService:
+    """Shared state behind the HTTP handlers"""
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, csv_files=CSV_FILES, token=None, origins=()):
+        self.csv_files = csv_files
+        self.token = token
+        self.origins = {FILE_ORIGIN, *origins}
+        self.cache = LRUCache(cache_size)
+        self.snapshot = None
+        self.generation = 0
+        self.reloads = 0
+        self._inflight = {}
+
+    async def load(self):
+        loop = asyncio.get_running_loop()
+        snapshot = await loop.run_in_executor(None, Snapshot, self.csv_files)
+        # Swap in the new data and drop every result computed from the old
+        self.snapshot = snapshot
+        self.generation += 1
+        self.cache.clear()
+        rows = {name: len(rows) for name, rows in snapshot.tables.items() if isinstance(rows, list)}
+        print(f"Loaded datasets in {snapshot.load_s:.1f}s: "
+              + ", ".join(f"{name} {n:,}" for name, n in rows.items()))
+
+    async def watch(self, interval):
+        """Reload when any data file's mtime or size changes"""
+        while True:
+            await asyncio.sleep(interval)
+            current = {name: file_signature(path) for name, path in self.csv_files.items()}
+            if current == self.snapshot.signatures:
+                continue
+            changed = [name for name in current if current[name] != self.snapshot.signatures.get(name)]
+            print(f"Changed: {', '.join(changed)}; reloading")
+            try:
+                await self.load()
+                self.reloads += 1
+            except Exception as exc:
+                # Keep serving the previous data; retried once the file changes again
+                print(f"Reload failed: {exc}")
+                self.snapshot.signatures = current
+
+    async def results(self, filters, methods):
+        """
+        Method results for a filter set, from the cache where possible
+
+        Concurrent requests for the same uncached filter set share one
+        computation, which runs in a worker thread so the event loop keeps
+        answering cached requests meanwhile.
+        """
+        snapshot = self.snapshot
+        snapshot.check_filters(filters)
+        key = cube_key(*(filters[f] for f in FILTERS))
+        out = {}
+        missing = []
+        for method in methods:
+            cached = self.cache.get((self.generation, key, method))
+            if cached is None:
+                missing.append(method)
+            else:
+                out[method] = cached
+        if missing:
+            task_key = (self.generation, key, tuple(missing))
+            task = self._inflight.get(task_key)
+            if task is None:
+                loop = asyncio.get_running_loop()
+                task = loop.run_in_executor(None, snapshot.compute, filters, missing)
+                self._inflight[task_key] = task
+            try:
+                computed = await task
+            finally:
+                self._inflight.pop(task_key, None)
+            for method, value in computed.items():
+                # Serialise once; cached values are reused verbatim
+                encoded = json.dumps(value, separators=(",", ":"))
+                self.cache.put((task_key[0], key, method), encoded)
+                out[method] = encoded
+        return key, {method: out[method] for method in methods}
+
+    def stats(self):
+        return {
+            "generation": self.generation,
+            "reloads": self.reloads,
+            "cache_entries": len(self.cache),
+            "cache_size": self.cache.maxsize,
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+        }
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+def parse_filters(query):
+    params = parse_qs(query, keep_blank_values=True)
+    unknown = sorted(set(params) - set(FILTERS) - {"method", "token"})
+    if unknown:
+        raise HTTPError(400, f"unknown parameter(s): {', '.join(unknown)}")
+    return {name: params.get(name, [""])[-1] for name in FILTERS}, params.get("method", [])
+
+
+def allowed_origin(service, headers):
+    """
+    Refuse requests that a web page other than an allowed origin could make
+    or read: a non-loopback Host (DNS rebinding) or a foreign Origin
+
+    Returns:
+        str: the Origin to allow in the response, or None
+    """
+    if not is_loopback_host(headers.get("host", "")):
+        raise HTTPError(403, "host not allowed")
+    origin = headers.get("origin")
+    if origin is not None and origin not in service.origins:
+        raise HTTPError(403, f"origin not allowed: {origin}")
+    return origin
+
+
+def check_token(service, headers, target):
+    """Refuse a request without this run's token (header or ?token=)"""
+    if service.token is None:
+        return
+    given = headers.get(TOKEN_HEADER) or parse_qs(urlsplit(target).query).get("token", [""])[-1]
+    if not hmac.compare_digest(given.encode(), service.token.encode()):
+        raise HTTPError(401, "missing or invalid token")
+
+
+def redact(target):
+    """Request target with the token removed, for the log"""
+    return re.sub(r"(?<=[?&]token=)[^&]*", "***", target)
+
+
+async def route(service, method, target):
+    """
+    Dispatch one request
+
+    Returns:
+        (status, content type, body bytes)
+    """
+    if method not in ("GET", "HEAD"):
+        raise HTTPError(405, f"{method} not supported")
+    url = urlsplit(target)
+    path = unquote(url.path).rstrip("/")
+
+    if path == "/api/health":
+        snapshot = service.snapshot
+        body = {
+            "status": "ok",
+            "loaded_at": snapshot.loaded_at,
+            "load_s": round(snapshot.load_s, 3),
+            "datasets": {name: len(rows) for name, rows in snapshot.tables.items() if isinstance(rows, list)},
+        }
+        return 200, "application/json", json.dumps(body).encode()
+    if path == "/api/stats":
+        return 200, "application/json", json.dumps(service.stats()).encode()
+    if path == "/api/filters":
+        return 200, "application/json", json.dumps(service.snapshot.filter_values).encode()
+    if path.startswith("/api/csv/"):
+        name = path[len("/api/csv/"):]
+        if name not in service.snapshot.csv_text:
+            raise HTTPError(404, f"unknown dataset: {name}")
+        return 200, "text/csv; charset=utf-8", service.snapshot.csv_text[name]
+
+    if path == "/api/metrics":
+        filters, methods = parse_filters(url.query)
+        unknown = [m for m in methods if m not in CUBE_METHODS]
+        if unknown:
+            raise HTTPError(400, f"unknown method(s): {', '.join(unknown)}")
+        key, results = await service.results(filters, methods or CUBE_METHODS)
+        # Results are cached as JSON text and spliced in without re-encoding
+        body = ('{"key":' + json.dumps(key) + ',"results":{'
+                + ",".join(f"{json.dumps(m)}:{v}" for m, v in results.items()) + "}}")
+        return 200, "application/json", body.encode()
+    if path.startswith("/api/") and path[len("/api/"):] in ENDPOINTS:
+        filters, methods = parse_filters(url.query)
+        if methods:
+            raise HTTPError(400, "method is only accepted by /api/metrics")
+        name = ENDPOINTS[path[len("/api/"):]]
+        _, results = await service.results(filters, [name])
+        return 200, "application/json", results[name].encode()
+    raise HTTPError(404, f"no such endpoint: {path or '/'}")
+
+
+async def handle(service, reader, writer):
+    """Serve requests on one connection until the client closes it"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.LimitOverrunError:
+                await respond(writer, 413, "application/json", b'{"error":"request too large"}', False)
+                return
+            except asyncio.IncompleteReadError:
+                return
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ")
+            except ValueError:
+                await respond(writer, 400, "application/json", b'{"error":"malformed request"}', False)
+                return
+            headers = {k.strip().lower(): v.strip()
+                       for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+            keep_alive = (headers.get("connection", "").lower() != "close"
+                          and version == "HTTP/1.1")
+
+            start = time.perf_counter()
+            origin = None
+            try:
+                origin = allowed_origin(service, headers)
+                if method == "OPTIONS":
+                    # CORS preflight: sent without the token
+                    status, content_type, body = 204, None, b""
+                else:
+                    check_token(service, headers, target)
+                    status, content_type, body = await route(service, method, target)
+            except HTTPError as exc:
+                status, content_type = exc.status, "application/json"
+                body = json.dumps({"error": str(exc)}).encode()
+            except Exception as exc:
+                status, content_type = 500, "application/json"
+                body = json.dumps({"error": f"{type(exc).__name__}: {exc}"}).encode()
+            await respond(writer, status, content_type, b"" if method == "HEAD" else body,
+                          keep_alive, length=len(body), origin=origin)
+            print(f"{method} {redact(target)} {status} {len(body):,}B "
+                  f"{(time.perf_counter() - start) * 1000:.1f}ms")
+            if not keep_alive:
+                return
+    except (ConnectionResetError, BrokenPipeError):
+        pass
+    finally:
+        writer.close()
+
+
+async def respond(writer, status, content_type, body, keep_alive, length=None, origin=None):
+    """Write one response; origin is the allowed Origin a browser may read it from"""
+    headers = [
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+        f"Content-Length: {len(body) if length is None else length}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        "Vary: Origin",
+    ]
+    if origin is not None:
+        headers += [
+            f"Access-Control-Allow-Origin: {origin}",
+            "Access-Control-Allow-Methods: GET, HEAD, OPTIONS",
+            "Access-Control-Allow-Headers: X-Query-Token",
+        ]
+    if content_type:
+        headers.append(f"Content-Type: {content_type}")
+    writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, cache_size=DEFAULT_CACHE_SIZE, poll=DEFAULT_POLL,
+                origins=()):
+    token = secrets.token_urlsafe(24)
+    write_token(token)
+    service = QueryService(cache_size, token=token, origins=origins)
+    await service.load()
+    server = await asyncio.start_server(lambda r, w: handle(service, r, w), host, port,
+                                        limit=MAX_REQUEST_BYTES)
+    address = server.sockets[0].getsockname()
+    print(f"Serving on http://{address[0]}:{address[1]}/api/ (Ctrl+C to stop)")
+    print(f"Token for this run: {TOKEN_FILE} (rebuild the thin client with build_standalone.py --api)")
+    watcher = asyncio.create_task(service.watch(poll)) if poll > 0 else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if watcher:
+            watcher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help=f"loopback address to bind (default {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"cached (filter set, method) results (default {DEFAULT_CACHE_SIZE})")
+    parser.add_argument("--poll", type=float, default=DEFAULT_POLL,
+                        help=f"seconds between data file change checks; 0 disables (default {DEFAULT_POLL})")
+    parser.add_argument("--allow-origin", action="append", default=[], metavar="ORIGIN",
+                        help="also let browser pages from ORIGIN (e.g. http://localhost:8000) read "
+                             "responses; the file:// thin client is always allowed")
+    args = parser.parse_args()
+    if not is_loopback(args.host):
+        parser.error(f"{args.host} is not a loopback address; the service only runs on localhost")
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.cache_size, args.poll, args.allow_origin))
+    except KeyboardInterrupt:
+        print("Stopped.")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
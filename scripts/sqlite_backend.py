@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Local SQLite copy of the analytics database.
+
+Mirrors database/create_database_schema.sql and create_analytics_views.sql
+(SQLite dialect in database/sqlite/) so the vw_* views and the dashboard
+queries run without a MySQL server. `load` bulk-ingests the data/*.csv files
+with batched executemany inside a single transaction, builds the indexes
+after the insert and atomically replaces the database file.
+
+Values are converted the way import_data.sql intends: dates are stored as
+ISO YYYY-MM-DD (Date_of_Birth is DD/MM/YYYY in the CSV), course result years
+use the '2017/18' form of the other tables, and NP grades load as a NULL
+grade point with is_np set.
+
+The mv_student_summary and mv_programme_performance summary tables hold the
+two fan-out views materialized per academic year. `refresh YEAR` rebuilds one
+year's rows after new data for it arrives, instead of recomputing every year.
+
+Usage:
+  python scripts/sqlite_backend.py load [--db PATH] [--batch-size N]
+  python scripts/sqlite_backend.py refresh [--db PATH] [YEAR ...]
+  python scripts/sqlite_backend.py query [--db PATH] [N ...]
+"""
+
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from datasets import csv_path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SQL_DIR = PROJECT_ROOT / "database" / "sqlite"
+SCHEMA_SQL = SQL_DIR / "create_database_schema.sql"
+INDEXES_SQL = SQL_DIR / "create_indexes.sql"
+VIEWS_SQL = SQL_DIR / "create_analytics_views.sql"
+SUMMARY_SQL = SQL_DIR / "create_summary_tables.sql"
+REFRESH_SQL = SQL_DIR / "refresh_summary_tables.sql"
+QUERIES_SQL = SQL_DIR / "dashboard_queries.sql"
+DEFAULT_DB = PROJECT_ROOT / "database" / "student_performance.sqlite"
+
+BATCH_SIZE = 10_000
+
+
+# ============================================================================
+# Value conversion
+# ============================================================================
+
+def text(value):
+    return value if value != "" else None
+
+
+def integer(value):
+    return int(value) if value != "" else None
+
+
+def decimal(value):
+    return float(value) if value != "" else None
+
+
+def iso_date(value):
+    """YYYY-MM-DD from either ISO or DD/MM/YYYY input"""
+    if value == "":
+        return None
+    if "/" in value:
+        day, month, year = value.split("/")
+        return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+    return value
+
+
+def academic_year(value):
+    """'2017-18' (course results) -> '2017/18' (every other table)"""
+    return value.replace("-", "/")
+
+
+def grade_point(value):
+    return None if value in ("", "NP") else float(value)
+
+
+def np_flag(value):
+    return 1 if value == "NP" else 0
+
+
+# Table -> (dataset, [(column, CSV header, converter), ...])
+TABLES = {
+    "current_students": ("currentStudents", [
+        ("academic_year", "Academic_Year", text),
+        ("student_id", "Student_ID", text),
+        ("surname", "Surname", text),
+        ("forename", "Forename", text),
+        ("gender", "Gender", text),
+        ("date_of_birth", "Date_of_Birth", iso_date),
+        ("nationality", "Nationality", text),
+        ("username", "username", text),
+        ("email", "email", text),
+        ("prog_yr", "Prog_Yr", integer),
+        ("stud_yr", "Stud_Yr", integer),
+        ("aims_start", "AIMS_Start", iso_date),
+        ("aims_expend", "AIMS_ExpEnd", iso_date),
+        ("category", "Category", text),
+        ("programme_name", "Programme_Name", text),
+    ]),
+    "course_enrolments": ("enrollments", [
+        ("academic_year", "Academic_Year", text),
+        ("student_id", "Student_ID", text),
+        ("course_code", "Course_Code", text),
+        ("credits", "Credits", integer),
+        ("semester", "Semester", text),
+    ]),
+    "course_results": ("courseResults", [
+        ("academic_year", "Academic_Year", academic_year),
+        ("semester", "Semester", text),
+        ("course_code", "Course_Code", text),
+        ("student_id", "Student_ID", text),
+        ("course_grade_point", "Course_Grade_Point", grade_point),
+        ("overall_grade", "Overall_Grade", text),
+        ("is_np", "Overall_Grade", np_flag),
+        ("warning", "Warning", text),
+    ]),
+    "attendance": ("attendance", [
+        ("academic_year", "Academic_Year", text),
+        ("semester", "Semester", text),
+        ("student_id", "Student_ID", text),
+        ("course_code", "Course_Code", text),
+        ("total_sessions", "Total_Sessions", integer),
+        ("sessions_attended", "Sessions_Attended", integer),
+        ("attendance_percentage", "Attendance_Percentage", decimal),
+        ("attendance_status", "Attendance_Status", text),
+    ]),
+    "degree_classifications": ("classifications", [
+        ("student_id", "Student_ID", text),
+        ("programme", "Programme", text),
+        ("entry_level", "Entry_Level", integer),
+        ("entry_year", "Entry_Year", text),
+        ("total_credits", "Total_Credits", integer),
+        ("year_3_gpa", "Year_3_GPA", text),
+        ("year_4_gpa", "Year_4_GPA", text),
+        ("final_gpa", "Final_GPA", decimal),
+        ("degree_classification", "Degree_Classification", text),
+        ("graduation_date", "Graduation_Date", iso_date),
+        ("graduation_status", "Graduation_Status", text),
+    ]),
+}
+
+
+# ============================================================================
+# SQL files
+# ============================================================================
+
+def iter_statements(sql_text):
+    """Split a SQL script into complete statements"""
+    statement = ""
+    for line in sql_text.splitlines(keepends=True):
+        if not statement and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement.strip()
+            statement = ""
+    if statement.strip():
+        raise ValueError(f"Incomplete SQL statement: {statement.strip()[:60]}...")
+
+
+def run_script(conn, path, params=()):
+    """Execute a SQL file statement by statement (stays inside the open transaction)"""
+    for statement in iter_statements(path.read_text(encoding="utf-8")):
+        conn.execute(statement, params)
+
+
+QUERY_HEADER_RE = re.compile(r"^-- QUERY (\d+): (.+)$", re.MULTILINE)
+
+
+def dashboard_queries():
+    """
+    The numbered queries of dashboard_queries.sql
+
+    Returns:
+        list of (number, title, sql) tuples
+    """
+    sql_text = QUERIES_SQL.read_text(encoding="utf-8")
+    headers = list(QUERY_HEADER_RE.finditer(sql_text))
+    queries = []
+    for i, m in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(sql_text)
+        statements = list(iter_statements(sql_text[m.end():end]))
+        queries.append((int(m.group(1)), m.group(2).strip(), statements[0]))
+    return queries
+
+
+# ============================================================================
+# Load
+# ============================================================================
+
+def iter_batches(table, batch_size):
+    """Converted rows of one table's CSV, batch_size rows at a time"""
+    dataset, columns = TABLES[table]
+    with open(csv_path(dataset), newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        positions = [(header.index(source), convert) for _, source, convert in columns]
+        batch = []
+        for row in reader:
+            if not row:
+                continue
+            batch.append(tuple(convert(row[i]) for i, convert in positions))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def insert_sql(table):
+    columns = [column for column, _, _ in TABLES[table][1]]
+    return (f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})")
+
+
+def load_database(db_path=DEFAULT_DB, batch_size=BATCH_SIZE, quiet=False):
+    """
+    Build the SQLite database from data/*.csv in one transaction
+
+    Returns:
+        dict: table -> {"rows": n, "seconds": s}, plus "indexes" and "total"
+    """
+    db_path = Path(db_path)
+    tmp_path = db_path.with_suffix(db_path.suffix + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    stats = {}
+    start = time.perf_counter()
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        # The file is rebuilt from scratch, so skip the rollback journal and fsyncs
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("BEGIN")
+        run_script(conn, SCHEMA_SQL)
+
+        for table in TABLES:
+            table_start = time.perf_counter()
+            sql = insert_sql(table)
+            rows = 0
+            for batch in iter_batches(table, batch_size):
+                conn.executemany(sql, batch)
+                rows += len(batch)
+            stats[table] = {"rows": rows, "seconds": time.perf_counter() - table_start}
+
+        index_start = time.perf_counter()
+        run_script(conn, INDEXES_SQL)
+        run_script(conn, VIEWS_SQL)
+        stats["indexes"] = {"seconds": time.perf_counter() - index_start}
+
+        summary_start = time.perf_counter()
+        run_script(conn, SUMMARY_SQL)
+        refresh_summaries(conn)
+        stats["summaries"] = {"seconds": time.perf_counter() - summary_start}
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(tmp_path, db_path)
+
+    total_rows = sum(s.get("rows", 0) for s in stats.values())
+    stats["total"] = {"rows": total_rows, "seconds": time.perf_counter() - start}
+    if not quiet:
+        print_load_stats(stats, db_path)
+    return stats
+
+
+def print_load_stats(stats, db_path):
+    print(f"{'Table':<26}{'Rows':>9}{'Seconds':>10}{'Rows/s':>12}")
+    for table in TABLES:
+        s = stats[table]
+        print(f"{table:<26}{s['rows']:>9,}{s['seconds']:>10.2f}{s['rows'] / s['seconds']:>12,.0f}")
+    print(f"{'indexes + views':<26}{'':>9}{stats['indexes']['seconds']:>10.2f}")
+    print(f"{'summary tables':<26}{'':>9}{stats['summaries']['seconds']:>10.2f}")
+    total = stats["total"]
+    print(f"{'Total':<26}{total['rows']:>9,}{total['seconds']:>10.2f}"
+          f"{total['rows'] / total['seconds']:>12,.0f}")
+    print(f"Database: {db_path} ({Path(db_path).stat().st_size / (1024 * 1024):.1f} MB)")
+
+
+# ============================================================================
+# Summary tables
+# ============================================================================
+
+def refresh_summaries(conn, years=None):
+    """
+    Rebuild the summary-table rows of the given academic years, inside the
+    caller's transaction. With no years every year is rebuilt, including
+    years that no longer have students (their rows are just deleted).
+
+    Returns:
+        list: the academic years refreshed
+    """
+    if years is None:
+        years = sorted({row[0] for row in conn.execute(
+            "SELECT academic_year FROM current_students "
+            "UNION SELECT current_year FROM mv_student_summary "
+            "UNION SELECT academic_year FROM mv_programme_performance")})
+    statements = list(iter_statements(REFRESH_SQL.read_text(encoding="utf-8")))
+    for year in years:
+        for statement in statements:
+            conn.execute(statement, {"academic_year": year})
+    return list(years)
+
+
+def refresh(db_path=DEFAULT_DB, years=None):
+    conn = connect(db_path, readonly=False)
+    start = time.perf_counter()
+    conn.execute("BEGIN")
+    refreshed = refresh_summaries(conn, years)
+    conn.execute("COMMIT")
+    conn.close()
+    print(f"Refreshed {len(refreshed)} academic year(s) in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms: {', '.join(refreshed)}")
+
+
+# ============================================================================
+# Query
+# ============================================================================
+
+def connect(db_path=DEFAULT_DB, readonly=True):
+    """Connection to a database built by load_database()"""
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise FileNotFoundError(f"{db_path} not found. Run: python scripts/sqlite_backend.py load")
+    if readonly:
+        conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def time_query(conn, sql, repeat=1, params=()):
+    """
+    Run a query repeat times
+
+    Returns:
+        tuple: (rows of the last run, median milliseconds)
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return rows, statistics.median(timings)
+
+
+def print_rows(rows, limit=10):
+    if not rows:
+        print("  (no rows)")
+        return
+    columns = rows[0].keys()
+    cells = [[("" if v is None else f"{v:.2f}" if isinstance(v, float) else str(v)) for v in row]
+             for row in rows[:limit]]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    print("  " + "  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in cells:
+        print("  " + "  ".join(v.ljust(w) for v, w in zip(r, widths)))
+    if len(rows) > limit:
+        print(f"  ... {len(rows) - limit} more rows")
+
+
+def run_dashboard_queries(db_path=DEFAULT_DB, numbers=None, repeat=5):
+    conn = connect(db_path)
+    for number, title, sql in dashboard_queries():
+        if numbers and number not in numbers:
+            continue
+        rows, ms = time_query(conn, sql, repeat)
+        print(f"\nQUERY {number}: {title} — {len(rows)} rows, {ms:.2f} ms (median of {repeat})")
+        print_rows(rows)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SQLite analytics database")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    load_parser = sub.add_parser("load", help="Build the database from data/*.csv")
+    load_parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    load_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    refresh_parser = sub.add_parser("refresh", help="Rebuild summary-table rows for academic years")
+    refresh_parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    refresh_parser.add_argument("years", nargs="*", metavar="YEAR",
+                                help="Academic years such as 2024/25 (default: all)")
+
+    query_parser = sub.add_parser("query", help="Run the dashboard queries")
+    query_parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    query_parser.add_argument("--repeat", type=int, default=5)
+    query_parser.add_argument("numbers", nargs="*", type=int, metavar="N",
+                              help="Query numbers to run (default: all)")
+
+    args = parser.parse_args()
+    if args.command == "load":
+        load_database(args.db, args.batch_size)
+        return
+    try:
+        if args.command == "refresh":
+            refresh(args.db, args.years or None)
+        else:
+            run_dashboard_queries(args.db, args.numbers, args.repeat)
+    except FileNotFoundError as exc:
+        sys.exit(str(exc))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Schema and referential integrity validator for the six data files.
+
+Every dataset is loaded once through datasets.load_dataset() (which also
+checks the columns the dashboard requires), its composite keys are encoded
+as int64 and hash-indexed once, and then every check runs on a process
+pool. Workers are forked with the data and indexes already in memory. The
+consolidated report lists each check with its failure count and example
+rows. The exit status is 1 when any error-level check fails, so this can
+gate a new data drop before it is committed.
+
+Course results write academic years as '2017-18' and every other file as
+'2017/18'. The year_format checks hold each file to its own form; keys are
+then compared in the '2017/18' form.
+
+Usage:
+  python scripts/validate_data.py [--workers N] [--json PATH] [--examples 5]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+from datasets import DATASETS, SchemaError, load_dataset
+
+# Key columns per dataset, as (component, column)
+KEY_COLUMNS = {
+    "admissions": [("student", "Student_ID")],
+    "currentStudents": [("student", "Student_ID"), ("year", "Academic_Year")],
+    "enrollments": [("student", "Student_ID"), ("year", "Academic_Year"),
+                    ("course", "Course_Code"), ("semester", "Semester")],
+    "attendance": [("student", "Student_ID"), ("year", "Academic_Year"),
+                   ("course", "Course_Code"), ("semester", "Semester")],
+    "classifications": [("student", "Student_ID")],
+    "courseResults": [("student", "Student_ID"), ("year", "Academic_Year"),
+                      ("course", "Course_Code"), ("semester", "Semester")],
+}
+
+# Academic year column and its expected form per dataset
+YEAR_FORMATS = {
+    "admissions": ("Academic Year ", "/"),
+    "currentStudents": ("Academic_Year", "/"),
+    "enrollments": ("Academic_Year", "/"),
+    "attendance": ("Academic_Year", "/"),
+    "classifications": ("Entry_Year", "/"),
+    "courseResults": ("Academic_Year", "-"),
+}
+
+RESIT_SEMESTER = "Sem3_Resit"
+MAX_GRADE_POINT = 22.0
+# Lower bounds for Warning and Good, as in data_generator.ATTENDANCE_THRESHOLDS
+ATTENDANCE_THRESHOLDS = (60.0, 80.0)
+
+Check = namedtuple("Check", "name severity dataset description func")
+
+# Loaded data, key arrays and indexes; set in the parent before the pool
+# forks (or passed to spawned workers through the initializer)
+_context = None
+
+
+# ============================================================================
+# Key encoding and hash indexes
+# ============================================================================
+
+def normalise_year(values):
+    return pd.Series(values).astype(str).str.replace("-", "/", regex=False).to_numpy()
+
+
+def build_context(frames):
+    """
+    Encode every dataset's key columns against shared vocabularies
+
+    Returns:
+        dict: frames, per-dataset key component arrays, vocabulary sizes
+        and an (initially empty) index cache
+    """
+    values = {"year": [], "course": [], "semester": []}
+    for name, frame in frames.items():
+        for component, column in KEY_COLUMNS[name][1:]:
+            raw = frame[column].to_numpy()
+            values[component].append(normalise_year(raw) if component == "year" else raw.astype(str))
+    vocab = {component: pd.Index(np.unique(np.concatenate(parts))) if parts else pd.Index([])
+             for component, parts in values.items()}
+
+    components = {}
+    for name, frame in frames.items():
+        encoded = {"student": frame["Student_ID"].to_numpy(np.int64)}
+        for component, column in KEY_COLUMNS[name][1:]:
+            raw = frame[column].to_numpy()
+            raw = normalise_year(raw) if component == "year" else raw.astype(str)
+            encoded[component] = vocab[component].get_indexer(raw).astype(np.int64)
+        components[name] = encoded
+    return {
+        "frames": frames,
+        "components": components,
+        "radix": {component: max(len(index), 1) for component, index in vocab.items()},
+        "indexes": {},
+    }
+
+
+def compose(ctx, name, parts, mask=None):
+    """Single int64 key per row from the named components (student first)"""
+    encoded = ctx["components"][name]
+    key = encoded["student"].copy()
+    for part in parts[1:]:
+        key = key * ctx["radix"][part] + encoded[part]
+    return key if mask is None else key[mask]
+
+
+def key_index(ctx, name, parts, mask_name=None):
+    """Hash index over the distinct keys of a dataset, built once and cached"""
+    cache_key = (name, parts, mask_name)
+    if cache_key not in ctx["indexes"]:
+        mask = ROW_FILTERS[mask_name](ctx) if mask_name else None
+        index = pd.Index(np.unique(compose(ctx, name, parts, mask)))
+        index.get_indexer(index[:1])  # build the hash table now, before workers fork
+        ctx["indexes"][cache_key] = index
+    return ctx["indexes"][cache_key]
+
+
+def missing_from(ctx, child, parent, parts, child_filter=None, parent_filter=None):
+    """Rows of child whose key has no match in parent"""
+    index = key_index(ctx, parent, parts, parent_filter)
+    missing = index.get_indexer(compose(ctx, child, parts)) < 0
+    if child_filter:
+        missing &= ROW_FILTERS[child_filter](ctx)
+    return missing
+
+
+# Named row subsets, so indexes over them can be cached
+ROW_FILTERS = {
+    "first_sitting": lambda ctx: ctx["frames"]["courseResults"]["Semester"].astype(str).to_numpy() != RESIT_SEMESTER,
+    "resit": lambda ctx: ctx["frames"]["courseResults"]["Semester"].astype(str).to_numpy() == RESIT_SEMESTER,
+}
+
+# (child, parent, key components, child filter, parent filter) for each reference
+REFERENCES = {
+    "enrolment_student_year": ("enrollments", "currentStudents", ("student", "year"), None, None,
+                               "every enrolment belongs to a student-year in current students"),
+    "attendance_enrolment": ("attendance", "enrollments", ("student", "year", "course", "semester"), None, None,
+                             "every attendance row has a matching enrolment"),
+    "result_student_year": ("courseResults", "currentStudents", ("student", "year"), None, None,
+                            "every result belongs to a student-year in current students"),
+    "result_enrolment": ("courseResults", "enrollments", ("student", "year", "course", "semester"),
+                         "first_sitting", None,
+                         "every first-sitting result has a matching enrolment"),
+    "resit_first_sitting": ("courseResults", "courseResults", ("student", "year", "course"),
+                            "resit", "first_sitting",
+                            "every resit follows a first sitting of the same course and year"),
+    "classification_student": ("classifications", "currentStudents", ("student",), None, None,
+                               "every classified student appears in current students"),
+    "current_student_admission": ("currentStudents", "admissions", ("student",), None, None,
+                                  "every current student has an admissions record"),
+}
+
+UNIQUE_KEYS = {
+    "admissions": ("student",),
+    "currentStudents": ("student", "year"),
+    "enrollments": ("student", "year", "course", "semester"),
+    "attendance": ("student", "year", "course", "semester"),
+    "classifications": ("student",),
+    "courseResults": ("student", "year", "course", "semester"),
+}
+
+
+# ============================================================================
+# Checks
+# ============================================================================
+
+def year_format_check(name):
+    column, separator = YEAR_FORMATS[name]
+    pattern = re.compile(rf"^(\d{{4}}){re.escape(separator)}(\d{{2}})$")
+
+    def check(ctx):
+        values = ctx["frames"][name][column].astype(str).to_numpy()
+        # Check each distinct value once; years repeat on every row
+        distinct, inverse = np.unique(values, return_inverse=True)
+        bad = np.array([not (m := pattern.match(v)) or int(m.group(2)) != (int(m.group(1)) + 1) % 100
+                        for v in distinct], dtype=bool)
+        return bad[inverse]
+    return check
+
+
+def null_key_check(name):
+    def check(ctx):
+        frame = ctx["frames"][name]
+        missing = np.zeros(len(frame), dtype=bool)
+        for _, column in KEY_COLUMNS[name]:
+            missing |= frame[column].isna().to_numpy()
+        return missing
+    return check
+
+
+def unique_key_check(name, parts):
+    def check(ctx):
+        return pd.Series(compose(ctx, name, parts)).duplicated(keep="first").to_numpy()
+    return check
+
+
+def reference_check(child, parent, parts, child_filter, parent_filter):
+    def check(ctx):
+        return missing_from(ctx, child, parent, parts, child_filter, parent_filter)
+    return check
+
+
+def attendance_range(ctx):
+    a = ctx["frames"]["attendance"]
+    pct = a["Attendance_Percentage"].to_numpy()
+    total = a["Total_Sessions"].to_numpy()
+    attended = a["Sessions_Attended"].to_numpy()
+    return ~((pct >= 0) & (pct <= 100) & (total > 0) & (attended >= 0) & (attended <= total))
+
+
+def attendance_sessions(ctx):
+    a = ctx["frames"]["attendance"]
+    total = a["Total_Sessions"].to_numpy()
+    expected = np.floor(total * a["Attendance_Percentage"].to_numpy() / 100)
+    return a["Sessions_Attended"].to_numpy() != expected
+
+
+def attendance_status(ctx):
+    a = ctx["frames"]["attendance"]
+    pct = a["Attendance_Percentage"].to_numpy()
+    expected = np.array(["Concern", "Warning", "Good"])[np.searchsorted(ATTENDANCE_THRESHOLDS, pct, side="right")]
+    return a["Attendance_Status"].astype(str).to_numpy() != expected
+
+
+def grade_points(ctx):
+    r = ctx["frames"]["courseResults"]
+    points = r["Course_Grade_Point"].to_numpy()
+    no_paper = r["Overall_Grade"].astype(str).to_numpy() == "NP"
+    in_range = (points >= 0) & (points <= MAX_GRADE_POINT)
+    return np.where(no_paper, ~np.isnan(points), ~in_range)
+
+
+def enrolment_credits(ctx):
+    return ~(ctx["frames"]["enrollments"]["Credits"].to_numpy() > 0)
+
+
+def classification_gpas(ctx):
+    c = ctx["frames"]["classifications"]
+    bad = np.zeros(len(c), dtype=bool)
+    for column in ("Year_3_GPA", "Year_4_GPA", "Final_GPA"):
+        values = c[column].to_numpy()
+        bad |= ~((values >= 0) & (values <= MAX_GRADE_POINT))
+    return bad
+
+
+def classification_programme(ctx):
+    """Programme differs from the student's latest current-students record"""
+    cs = ctx["frames"]["currentStudents"]
+    latest = (pd.DataFrame({"Student_ID": cs["Student_ID"].to_numpy(),
+                            "Year": cs["Academic_Year"].astype(str).to_numpy(),
+                            "Programme": cs["Programme_Name"].astype(str).to_numpy()})
+              .sort_values(["Student_ID", "Year"])
+              .drop_duplicates("Student_ID", keep="last")
+              .set_index("Student_ID")["Programme"])
+    c = ctx["frames"]["classifications"]
+    current = latest.reindex(c["Student_ID"].to_numpy()).to_numpy()
+    return (current != c["Programme"].astype(str).to_numpy()) & pd.notna(current)
+
+
+def build_checks(names):
+    checks = []
+    for name in names:
+        checks.append(Check(f"null_keys:{name}", "error", name,
+                            "key columns are never empty", null_key_check(name)))
+        checks.append(Check(f"year_format:{name}", "error", name,
+                            f"academic years look like 2017{YEAR_FORMATS[name][1]}18",
+                            year_format_check(name)))
+        parts = UNIQUE_KEYS[name]
+        checks.append(Check(f"unique:{name}", "error", name,
+                            f"one row per ({', '.join(col for _, col in KEY_COLUMNS[name][:len(parts)])})",
+                            unique_key_check(name, parts)))
+    for check_name, (child, parent, parts, child_filter, parent_filter, description) in REFERENCES.items():
+        if child in names and parent in names:
+            checks.append(Check(check_name, "error", child, description,
+                                reference_check(child, parent, parts, child_filter, parent_filter)))
+    values = [
+        ("attendance_range", "error", "attendance",
+         "0-100% attendance and 0 <= sessions attended <= total sessions", attendance_range),
+        ("attendance_sessions", "warning", "attendance",
+         "sessions attended = floor(total sessions x attendance %)", attendance_sessions),
+        ("attendance_status", "warning", "attendance",
+         "status matches the Concern/Warning/Good thresholds (60%, 80%)", attendance_status),
+        ("grade_points", "error", "courseResults",
+         f"grade points within 0-{MAX_GRADE_POINT:g}, and empty exactly when the grade is NP", grade_points),
+        ("enrolment_credits", "error", "enrollments", "credits are positive", enrolment_credits),
+        ("classification_gpas", "error", "classifications",
+         f"Year 3, Year 4 and Final GPA within 0-{MAX_GRADE_POINT:g}", classification_gpas),
+    ]
+    checks += [Check(*spec) for spec in values if spec[2] in names]
+    if {"classifications", "currentStudents"} <= set(names):
+        checks.append(Check("classification_programme", "warning", "classifications",
+                            "programme matches the student's latest current-students record",
+                            classification_programme))
+    return checks
+
+
+# ============================================================================
+# Runner
+# ============================================================================
+
+def example_rows(frame, rows, limit):
+    """'line N: col=value, ...' for the first failing rows (line 1 is the header)"""
+    columns = list(enumerate(frame.columns[:6]))
+    return [f"line {i + 2}: " + ", ".join(f"{col.strip()}={frame.iat[i, j]}" for j, col in columns)
+            for i in rows[:limit]]
+
+
+def run_check(check, examples=5):
+    start = time.perf_counter()
+    failing = np.flatnonzero(check.func(_context))
+    return {
+        "check": check.name,
+        "severity": check.severity,
+        "dataset": check.dataset,
+        "description": check.description,
+        "failures": int(len(failing)),
+        "examples": example_rows(_context["frames"][check.dataset], failing, examples),
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def _init_worker(context):
+    global _context
+    _context = context
+
+
+def _run_indexed(task):
+    index, examples = task
+    return run_check(_checks[index], examples)
+
+
+_checks = []
+
+
+def validate(names=None, workers=None, examples=5):
+    """
+    Load the datasets, build the key indexes and run every check
+
+    Returns:
+        list: one result dict per check, schema failures first
+    """
+    global _context, _checks
+    names = list(names or DATASETS)
+    results = []
+    frames = {}
+    with instrumentation.stage("load_datasets") as load:
+        for name in names:
+            start = time.perf_counter()
+            try:
+                frames[name] = load_dataset(name)
+                failures, message = 0, []
+            except (SchemaError, ValueError) as exc:
+                failures, message = 1, [str(exc)]
+            results.append({"check": f"schema:{name}", "severity": "error", "dataset": name,
+                            "description": "required columns present and typed columns parse",
+                            "failures": failures, "examples": message,
+                            "seconds": round(time.perf_counter() - start, 4)})
+            if name in frames:
+                load.add_rows(len(frames[name]))
+
+    with instrumentation.stage("build_indexes") as stage:
+        _context = build_context(frames)
+        for child, parent, parts, _, parent_filter, _ in REFERENCES.values():
+            if child in frames and parent in frames:
+                key_index(_context, parent, parts, parent_filter)
+        stage.add_rows(sum(len(frame) for frame in frames.values()))
+
+    _checks = build_checks(list(frames))
+    workers = workers or os.cpu_count() or 1
+    with instrumentation.stage("run_checks", workers=workers, checks=len(_checks)):
+        tasks = [(i, examples) for i in range(len(_checks))]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(_context,)) as pool:
+                results += list(pool.map(_run_indexed, tasks))
+        else:
+            results += [_run_indexed(task) for task in tasks]
+    return results
+
+
+def print_report(results, elapsed):
+    print("=" * 96)
+    print("Data Validation Report")
+    print("=" * 96)
+    for r in results:
+        status = "PASS" if not r["failures"] else ("FAIL" if r["severity"] == "error" else "WARN")
+        print(f"{status:<6}{r['check']:<36}{r['failures']:>9,}  {r['description']}")
+    flagged = [r for r in results if r["failures"] and r["examples"]]
+    for r in flagged:
+        print(f"\n{r['check']} ({r['failures']:,} failing):")
+        for example in r["examples"]:
+            print(f"  {example}")
+    errors = sum(1 for r in results if r["failures"] and r["severity"] == "error")
+    warnings = sum(1 for r in results if r["failures"] and r["severity"] != "error")
+    print("\n" + "=" * 96)
+    print(f"{len(results)} checks: {len(results) - errors - warnings} passed, "
+          f"{errors} failed, {warnings} warnings ({elapsed:.2f}s)")
+    print("=" * 96)
+    return errors == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("datasets", nargs="*", metavar="dataset",
+                        help=f"datasets to validate (default: all of {', '.join(DATASETS)})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process pool size (default: one per CPU; 1 runs inline)")
+    parser.add_argument("--examples", type=int, default=5,
+                        help="example rows listed per failing check (default 5)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write the consolidated report as JSON to PATH")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    unknown = sorted(set(args.datasets) - set(DATASETS))
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(unknown)}")
+
+    with instrumentation.session("validate_data", args):
+        start = time.perf_counter()
+        results = validate(args.datasets or None, args.workers, args.examples)
+        elapsed = time.perf_counter() - start
+        ok = print_report(results, elapsed)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"ok": ok, "seconds": round(elapsed, 3), "checks": results}, f, indent=1)
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,18 @@ GPA Calculation Verification Script
 Validates GPA calculations using 50/50 weighting formula
 """
 
+import argparse
+import math
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
 import pandas as pd
 
+import instrumentation
+from datasets import apply_schema, estimate_rows, iter_chunks, load_dataset
+
 # Credit map for weighted GPA calculation
 CREDIT_MAP = {
     # Year 3 courses
@@ -82,7 +92,9 @@ def run_gpa_verification():
     print("="*80)
     
     # Load degree classifications
-    df = pd.read_csv('Degree_Classifications.csv')
+    with instrumentation.stage('load_datasets') as load:
+        df = load_dataset('classifications')
+        load.add_rows(len(df))
     
     # Sample students for verification
     sample = df.sample(n=20, random_state=42)
@@ -124,6 +136,266 @@ def run_gpa_verification():
     
     return passed == len(sample)
 
+# A stored 2 dp GPA is correct if it is any rounding of the exact value
+ROUNDING_TOLERANCE = 0.005 + 1e-9
+
+
+def compute_year_gpas(results_df, enrolments_df, students_df):
+    """
+    Recompute credit-weighted GPAs per student and programme year
+
+    Uses first-sitting results only (Sem3 resits are excluded), counts NP as
+    0 grade points and takes credits from the enrolment file.
+
+    Returns:
+        DataFrame: Student_ID, Prog_Yr, GPA (unrounded)
+    """
+    results = results_df[results_df['Semester'] != 'Sem3_Resit']
+    results = pd.DataFrame({
+        'Student_ID': results['Student_ID'].to_numpy(),
+        # Results use '2017-18'; every other file uses '2017/18'
+        'Academic_Year': results['Academic_Year'].astype(str).str.replace('-', '/', regex=False).to_numpy(),
+        'Course_Code': results['Course_Code'].astype(str).to_numpy(),
+        'Grade_Point': results['Course_Grade_Point'].fillna(0.0).to_numpy(),
+    })
+    credits = pd.DataFrame({
+        'Student_ID': enrolments_df['Student_ID'].to_numpy(),
+        'Academic_Year': enrolments_df['Academic_Year'].astype(str).to_numpy(),
+        'Course_Code': enrolments_df['Course_Code'].astype(str).to_numpy(),
+        'Credits': enrolments_df['Credits'].to_numpy(),
+    })
+    years = pd.DataFrame({
+        'Student_ID': students_df['Student_ID'].to_numpy(),
+        'Academic_Year': students_df['Academic_Year'].astype(str).to_numpy(),
+        'Prog_Yr': students_df['Prog_Yr'].to_numpy(),
+    })
+
+    merged = (results
+              .merge(credits, on=['Student_ID', 'Academic_Year', 'Course_Code'], how='left')
+              .merge(years, on=['Student_ID', 'Academic_Year'], how='inner'))
+    # Fall back to the default credit weighting for courses without an enrolment row
+    merged['Credits'] = merged['Credits'].fillna(merged['Course_Code'].map(CREDIT_MAP)).fillna(15)
+    merged['Weighted'] = merged['Grade_Point'] * merged['Credits']
+
+    totals = merged.groupby(['Student_ID', 'Prog_Yr'], sort=False)[['Weighted', 'Credits']].sum()
+    totals['GPA'] = totals['Weighted'] / totals['Credits']
+    return totals['GPA'].reset_index()
+
+
+# Partition files are all open at once while streaming; keep well under the fd limit
+MAX_PARTITIONS = 256
+
+# compute_year_gpas() inputs, in argument order, and the columns it reads
+GPA_INPUTS = {
+    'courseResults': ['Academic_Year', 'Semester', 'Course_Code', 'Student_ID', 'Course_Grade_Point'],
+    'enrollments': ['Academic_Year', 'Student_ID', 'Course_Code', 'Credits'],
+    'currentStudents': ['Academic_Year', 'Student_ID', 'Prog_Yr'],
+}
+
+
+def write_partitions(frames, partitions, directory, name, prefix='', divisor=1):
+    """
+    Append each frame's rows to one pickle file per Student_ID hash
+    partition, {name}-{prefix}{p}.pkl; rows already grouped by an outer hash
+    of `divisor` partitions are split by the next digit of the hash
+
+    Returns:
+        list: rows written to each partition
+    """
+    counts = [0] * partitions
+    files = [open(Path(directory) / f'{name}-{prefix}{p}.pkl', 'wb') for p in range(partitions)]
+    try:
+        for frame in frames:
+            part = (frame['Student_ID'].to_numpy() // divisor) % partitions
+            for p, f in enumerate(files):
+                piece = frame[part == p]
+                if len(piece):
+                    pickle.dump(piece, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    counts[p] += len(piece)
+    finally:
+        for f in files:
+            f.close()
+    return counts
+
+
+def partition_dataset(name, columns, chunksize, partitions, directory):
+    """
+    Stream a dataset in chunks into Student_ID hash partitions
+
+    Returns:
+        list: rows written to each partition
+    """
+    return write_partitions(iter_chunks(name, chunksize, columns), partitions, directory, name)
+
+
+def iter_partition(name, key, directory):
+    """The pickled pieces of one partition, in their original file order"""
+    with open(Path(directory) / f'{name}-{key}.pkl', 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def read_partition(name, columns, key, directory):
+    """All rows of one partition, in their original file order"""
+    pieces = list(iter_partition(name, key, directory))
+    if not pieces:
+        return apply_schema(pd.DataFrame({col: pd.Series(dtype=object) for col in columns}), name)
+    return pd.concat(pieces, ignore_index=True)
+
+
+def split_oversized(sizes, partitions, chunksize, directory):
+    """
+    Hash each partition holding more than twice chunksize rows of an input
+    a second time, into sub-partitions of about chunksize rows. This happens
+    when the inputs outgrow MAX_PARTITIONS × chunksize rows, or the hash is
+    skewed.
+
+    Args:
+        sizes: input name → rows in each first-pass partition
+
+    Returns:
+        list: partition keys to compute, in order
+    """
+    keys = []
+    for p in range(partitions):
+        rows = max(counts[p] for counts in sizes.values())
+        if rows <= 2 * chunksize:
+            keys.append(str(p))
+            continue
+        sub = min(MAX_PARTITIONS, math.ceil(rows / chunksize))
+        largest = 0
+        for name in GPA_INPUTS:
+            counts = write_partitions(iter_partition(name, p, directory), sub, directory, name,
+                                      prefix=f'{p}.', divisor=partitions)
+            (Path(directory) / f'{name}-{p}.pkl').unlink()
+            largest = max(largest, *counts)
+        if largest > 2 * chunksize:
+            print(f"Warning: partition {p} still holds {largest:,} rows of an input after a second "
+                  f"hash pass (chunk size {chunksize:,}); memory grows with it")
+        keys.extend(f'{p}.{q}' for q in range(sub))
+    return keys
+
+
+def compute_year_gpas_chunked(chunksize):
+    """
+    Out-of-core compute_year_gpas()
+
+    Streams the inputs chunksize rows at a time into Student_ID hash
+    partitions on disk, then runs compute_year_gpas() one partition at a
+    time. Each student's rows land in a single partition in their original
+    order, so the per-student sums are bit-identical to the in-memory path
+    while memory stays bounded by the partition size. Partitions are sized
+    at about chunksize rows of the largest input; beyond MAX_PARTITIONS of
+    them, oversized partitions are split again (split_oversized()).
+    """
+    largest = max(estimate_rows(name) for name in GPA_INPUTS)
+    partitions = min(MAX_PARTITIONS, max(1, math.ceil(largest / chunksize)))
+    with tempfile.TemporaryDirectory() as tmp:
+        with instrumentation.stage('partition', partitions=partitions) as stage:
+            sizes = {}
+            for name, columns in GPA_INPUTS.items():
+                sizes[name] = partition_dataset(name, columns, chunksize, partitions, tmp)
+                stage.add_rows(sum(sizes[name]))
+        with instrumentation.stage('repartition'):
+            keys = split_oversized(sizes, partitions, chunksize, tmp)
+        gpas = []
+        with instrumentation.stage('compute_gpas', partitions=len(keys)) as stage:
+            for key in keys:
+                frames = [read_partition(name, columns, key, tmp) for name, columns in GPA_INPUTS.items()]
+                gpas.append(compute_year_gpas(*frames))
+                stage.add_rows(len(frames[0]))
+    return pd.concat(gpas, ignore_index=True)
+
+
+def verify_all_gpas(chunksize=None):
+    """
+    Verify Year 3, Year 4 and Final GPA for every graduate in one pass
+
+    With chunksize, course results, enrolments and student-years are
+    processed out of core (compute_year_gpas_chunked()); the mismatches are
+    identical either way.
+
+    Returns:
+        tuple: (DataFrame with one row per mismatch — Student_ID, Field,
+        Stored, Expected — and the number of graduates checked)
+    """
+    with instrumentation.stage('load_datasets') as load:
+        classifications = load_dataset('classifications')
+        load.add_rows(len(classifications))
+        if chunksize is None:
+            results = load_dataset('courseResults')
+            enrolments = load_dataset('enrollments')
+            students = load_dataset('currentStudents')
+            load.add_rows(len(results) + len(enrolments) + len(students))
+    if chunksize is None:
+        with instrumentation.stage('compute_gpas') as compute:
+            gpas = compute_year_gpas(results, enrolments, students)
+            compute.add_rows(len(results))
+    else:
+        gpas = compute_year_gpas_chunked(chunksize)
+    with instrumentation.stage('compare') as compare:
+        by_year = gpas.pivot(index='Student_ID', columns='Prog_Yr', values='GPA')
+
+        stored = classifications.set_index('Student_ID')
+        expected = pd.DataFrame(index=stored.index)
+        # A partial data drop may have no Year 3 or Year 4 rows at all
+        by_year = by_year.reindex(index=stored.index, columns=[3, 4])
+        expected['Year_3_GPA'] = by_year[3]
+        expected['Year_4_GPA'] = by_year[4]
+        expected['Final_GPA'] = (stored['Year_3_GPA'] * 0.5) + (stored['Year_4_GPA'] * 0.5)
+
+        mismatches = []
+        for field in ['Year_3_GPA', 'Year_4_GPA', 'Final_GPA']:
+            diff = (stored[field] - expected[field]).abs()
+            bad = ~(diff <= ROUNDING_TOLERANCE)  # NaN expected (no results found) counts as a mismatch
+            mismatches.append(pd.DataFrame({
+                'Student_ID': stored.index[bad],
+                'Field': field,
+                'Stored': stored.loc[bad, field].to_numpy(),
+                'Expected': expected.loc[bad, field].round(3).to_numpy(),
+            }))
+        compare.add_rows(len(stored))
+    return pd.concat(mismatches, ignore_index=True), len(stored)
+
+
+def run_full_verification(chunksize=None):
+    """Verify every student and print each mismatch"""
+    print("="*80)
+    print("GPA Calculation Verification (full population)")
+    print("="*80)
+
+    start = time.perf_counter()
+    mismatches, total = verify_all_gpas(chunksize)
+    elapsed = time.perf_counter() - start
+
+    for row in mismatches.itertuples(index=False):
+        print(f"✗ FAIL | {row.Student_ID} | {row.Field} | "
+              f"Stored: {row.Stored:.2f} | Expected: {row.Expected:.3f}")
+
+    failed = mismatches['Student_ID'].nunique()
+    print("\n" + "="*80)
+    print(f"Results: {total - failed}/{total} students verified correctly "
+          f"({len(mismatches)} mismatched values)")
+    print(f"Success Rate: {(total - failed)/total*100:.1f}%")
+    print(f"Time: {elapsed:.3f}s")
+    print("="*80)
+
+    return mismatches.empty
+
+
 if __name__ == '__main__':
-    success = run_gpa_verification()
-    exit(0 if success else 1)
+    parser = argparse.ArgumentParser(description='Verify stored degree GPAs')
+    parser.add_argument('--all', action='store_true',
+                        help='Recompute Year 3/4 GPAs from course results for every student')
+    parser.add_argument('--chunk-size', type=int, metavar='ROWS',
+                        help='with --all, stream the inputs ROWS rows at a time (memory bounded '
+                             'by the chunk size instead of the file size)')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumentation.session('verify_gpa', args):
+        success = run_full_verification(args.chunk_size) if args.all else run_gpa_verification()
+        exit(0 if success else 1)
@@ -3,10 +3,16 @@ Programme Course Verification Script
 Validates that students are enrolled in correct programme-specific courses
 """
 
-import pandas as pd
-import random
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
 
-# Programme course mappings for verification
+from datasets import load_dataset
+
+# Programme course mappings for verification (BM-IS and BM-IR as in the
+# generator's PROGRAMME_COURSE_MAP)
 PROGRAMME_COURSES = {
     'Business Management': {
         1: ['GS1001', 'GS1002', 'B1003', 'B1004', 'B1501', 'B1502', 'B1503', 'B1504'],
@@ -21,13 +27,35 @@ PROGRAMME_COURSES = {
         4: ['B4003', 'B4007', 'B4010', 'B4015', 'B4501', 'B4502']
     },
     'Computing Science': {
-        1: ['GS1001', 'C1001', 'C1002', 'C1003', 'B1501', 'C1504', 'C1505', 'C1506'],
-        2: ['C2001', 'C2002', 'C2003', 'C2004', 'C2501', 'C2502', 'C2503', 'B2501'],
+        # Semester 2 elective: any of B1501-B1504 or I1501 (Y1), B2501-B2506 (Y2)
+        1: ['GS1001', 'C1001', 'C1002', 'C1003', 'C1504', 'C1505', 'C1506',
+            'B1501', 'B1502', 'B1503', 'B1504', 'I1501'],
+        2: ['C2001', 'C2002', 'C2003', 'C2004', 'C2501', 'C2502', 'C2503',
+            'B2501', 'B2502', 'B2503', 'B2504', 'B2505', 'B2506'],
         3: ['C3001', 'C3002', 'C3501', 'C3502'],
         4: ['C4501', 'C4502', 'C4503', 'C4505']
+    },
+    'Business Management and Information Systems': {
+        1: ['GS1001', 'GS1002', 'B1003', 'B1004', 'B1501', 'B1502', 'B1503', 'I1501'],
+        2: ['B2004', 'B2006', 'B2007', 'B2009', 'B2504', 'B2505', 'B2506', 'I2501'],
+        3: ['B3004', 'B3005', 'B3006', 'I3501'],
+        4: ['B4005', 'I4501', 'I4502']
+    },
+    'Business Management and International Relations': {
+        1: ['GS1001', 'GS1002', 'B1003', 'B1004', 'B1501', 'B1502', 'B1503', 'I1501'],
+        2: ['B2004', 'B2006', 'B2007', 'I2001', 'B2504', 'B2505', 'B2506', 'I2501'],
+        3: ['B3004', 'I3001', 'B3006', 'I3501'],
+        4: ['B4005', 'I4001', 'I4502']
     }
 }
 
+# (programme, prog_yr) -> frozenset of valid course codes, built once
+VALID_COURSES = {
+    (programme, prog_yr): frozenset(courses)
+    for programme, years in PROGRAMME_COURSES.items()
+    for prog_yr, courses in years.items()
+}
+
 def verify_student_courses(student_id, programme, prog_yr, enrolled_courses):
     """
     Verify a student's courses match their programme requirements
@@ -41,7 +69,7 @@ def verify_student_courses(student_id, programme, prog_yr, enrolled_courses):
     if prog_yr not in PROGRAMME_COURSES[programme]:
         return True, f"Year {prog_yr} not defined for {programme}"
     
-    valid_courses = set(PROGRAMME_COURSES[programme][prog_yr])
+    valid_courses = VALID_COURSES[(programme, prog_yr)]
     enrolled_set = set(enrolled_courses)
     
     # Check if all enrolled courses are valid
@@ -59,8 +87,8 @@ def run_verification():
     print("="*80)
     
     # Load data
-    students_df = pd.read_csv('COMBINED_Current_Students_All_Years.csv')
-    enrolments_df = pd.read_csv('COMBINED_Course_Enrolments_All_Years.csv')
+    students_df = load_dataset('currentStudents')
+    enrolments_df = load_dataset('enrollments')
     
     # Sample random students for verification
     sample_size = 20
@@ -105,6 +133,109 @@ def run_verification():
     
     return passed == sample_size
 
+def group_enrolments(enrolments_df):
+    """
+    Group enrolled course codes by (Student_ID, Academic_Year) in one pass
+
+    Returns:
+        dict: (student_id, academic_year) -> set of course codes
+    """
+    groups = defaultdict(set)
+    for key in zip(enrolments_df['Student_ID'].tolist(),
+                   enrolments_df['Academic_Year'].astype(str).tolist(),
+                   enrolments_df['Course_Code'].astype(str).tolist()):
+        groups[key[:2]].add(key[2])
+    return groups
+
+
+def verify_all_students(students_df, enrolments_df):
+    """
+    Check every student-year against its programme's course list
+
+    Returns:
+        dict: summary counts and a list of violations
+    """
+    groups = group_enrolments(enrolments_df)
+
+    summary = {'checked': 0, 'passed': 0, 'failed': 0,
+               'not_in_verification_list': 0, 'no_enrolments': 0}
+    unmapped = defaultdict(int)
+    violations = []
+
+    for student_id, academic_year, programme, prog_yr in zip(
+            students_df['Student_ID'].tolist(),
+            students_df['Academic_Year'].astype(str).tolist(),
+            students_df['Programme_Name'].astype(str).tolist(),
+            students_df['Prog_Yr'].tolist()):
+        valid_courses = VALID_COURSES.get((programme, prog_yr))
+        if valid_courses is None:
+            summary['not_in_verification_list'] += 1
+            unmapped[programme] += 1
+            continue
+
+        enrolled = groups.get((student_id, academic_year))
+        if not enrolled:
+            summary['no_enrolments'] += 1
+            continue
+
+        summary['checked'] += 1
+        invalid_courses = enrolled - valid_courses
+        if invalid_courses:
+            summary['failed'] += 1
+            violations.append({
+                'Student_ID': student_id,
+                'Academic_Year': academic_year,
+                'Programme': programme,
+                'Prog_Yr': prog_yr,
+                'Invalid_Courses': sorted(invalid_courses),
+            })
+        else:
+            summary['passed'] += 1
+
+    return {
+        'summary': summary,
+        'unmapped_programmes': dict(unmapped),
+        'violations': violations,
+    }
+
+
+def run_full_verification(report_path=None):
+    """Verify every student-year and write a JSON violations report"""
+    start = time.perf_counter()
+    report = verify_all_students(load_dataset('currentStudents'), load_dataset('enrollments'))
+    report['summary']['seconds'] = round(time.perf_counter() - start, 3)
+
+    if report_path == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return not report['violations']
+
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    summary = report['summary']
+    print("="*80)
+    print("Programme Course Verification (full population)")
+    print("="*80)
+    for key, value in summary.items():
+        print(f"{key:<26} {value}")
+    for programme, count in report['unmapped_programmes'].items():
+        print(f"  skipped: {programme} ({count} student-years)")
+    if report_path:
+        print(f"Violations report: {report_path}")
+    print("="*80)
+
+    return not report['violations']
+
+
 if __name__ == '__main__':
-    success = run_verification()
+    parser = argparse.ArgumentParser(description='Verify programme course enrolments')
+    parser.add_argument('--all', action='store_true',
+                        help='Verify every student-year instead of a 20-student sample')
+    parser.add_argument('--report', metavar='PATH',
+                        help="With --all, write the JSON violations report to PATH ('-' for stdout)")
+    args = parser.parse_args()
+
+    success = run_full_verification(args.report) if args.all else run_verification()
     exit(0 if success else 1)